@@ -0,0 +1,50 @@
+"""
+Memory and lookup cost of BindingTable compared to the plain ``{name: Binding}`` map and ``KEYBINDS`` list scans.
+
+Usage::
+
+    python benchmarks/bench_binding_table.py
+"""
+import itertools
+import timeit
+import tracemalloc
+
+from voice_commander_elite.keybinds import AHK_KEY_MAPPING, KEYBINDS, Binding, BindingDevice
+from voice_commander_elite.table import BindingTable
+
+
+def _full_bindings() -> dict[str, Binding]:
+    # every keybind bound to some keyboard key that has an AHK equivalent
+    keys = [k for k, v in AHK_KEY_MAPPING[BindingDevice.KEYBOARD].items() if v]
+    return {name: Binding(name=name, device=BindingDevice.KEYBOARD, key=key) for name, key in zip(KEYBINDS, itertools.cycle(keys))}
+
+
+def _allocated(factory) -> tuple[object, int]:
+    tracemalloc.start()
+    try:
+        obj = factory()
+        size, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return obj, size
+
+
+def main() -> None:
+    bindings, dict_bytes = _allocated(_full_bindings)
+    table, table_bytes = _allocated(lambda: BindingTable.from_bindings(bindings))
+    print(f'{len(bindings)} bindings')
+    print(f'memory: dict of Binding {dict_bytes} B, BindingTable {table_bytes} B (incl. name index)')
+
+    names = list(KEYBINDS)
+    number = 200
+    list_scan = timeit.timeit(lambda: [name in KEYBINDS for name in names], number=number)
+    table_lookup = timeit.timeit(lambda: [name in table for name in names], number=number)
+    nested = timeit.timeit(lambda: [AHK_KEY_MAPPING[b.device][b.key] for b in bindings.values()], number=number)
+    resolved = timeit.timeit(lambda: [table.ahk_key(name) for name in names], number=number)
+    per = 1e9 / (number * len(names))
+    print(f'known-name check: KEYBINDS list scan {list_scan * per:.0f} ns, BindingTable {table_lookup * per:.0f} ns')
+    print(f'AHK key lookup: nested AHK_KEY_MAPPING {nested * per:.0f} ns, BindingTable {resolved * per:.0f} ns')
+
+
+if __name__ == '__main__':
+    main()
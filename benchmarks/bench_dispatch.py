@@ -0,0 +1,61 @@
+"""
+Throughput and latency of the dispatch path (condition check, then key press) against the recording fake AHK backend,
+so it runs without the game or AutoHotkey.
+
+Usage::
+
+    python benchmarks/bench_dispatch.py [--commands N] [--latency SECONDS]
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+from voice_commander_elite import actions
+from voice_commander_elite.conditions import EliteDangerousIsActive, LandingGearDown
+from voice_commander_elite.fake_ahk import RecordingAHK
+
+
+def run(commands: int, latency: float, tracker_ttl: float) -> None:
+    ahk = RecordingAHK(latency={'key_press': latency})
+    names = list(actions._available_bindings)
+    if not names:
+        raise SystemExit('no bound actions; point VOICE_COMMANDER_ELITE_BINDINGS_FILE at a bindings file')
+    instances = [getattr(actions, name)() for name in names]
+    is_active = EliteDangerousIsActive()
+    gear_down = LandingGearDown(negate=True)
+    timings = []
+    with ahk.installed(tracker_ttl=tracker_ttl):
+        ahk.focus()
+        start = time.perf_counter()
+        for i in range(commands):
+            action = instances[i % len(instances)]
+            t0 = time.perf_counter()
+            if is_active.check() and gear_down.check():
+                action.perform()
+            timings.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - start
+    ordered = sorted(timings)
+    print(f'{commands} commands over {len(instances)} actions, tracker ttl {tracker_ttl}s, injected press latency {latency * 1e3:.1f}ms')
+    print(f'throughput: {commands / elapsed:,.0f} commands/s')
+    print(
+        f'latency: p50 {statistics.median(ordered) * 1e6:.1f}us'
+        f' p95 {ordered[int(len(ordered) * 0.95)] * 1e6:.1f}us'
+        f' p99 {ordered[int(len(ordered) * 0.99)] * 1e6:.1f}us'
+        f' max {ordered[-1] * 1e6:.1f}us'
+    )
+    print(f'recorded {len(ahk.calls_to("key_press"))} key presses, {len(ahk.calls_to("get_active_window"))} window queries')
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--commands', type=int, default=20000)
+    parser.add_argument('--latency', type=float, default=0.0, help='simulated seconds per key press')
+    args = parser.parse_args(argv)
+    for ttl in (0.0, 0.25):
+        run(args.commands, args.latency, ttl)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Match latency of PhraseIndex over every keybind, compared to a linear difflib scan of all phrases.
+
+Usage::
+
+    python benchmarks/bench_phrase_match.py
+"""
+import difflib
+import random
+import statistics
+import time
+
+from voice_commander_elite.keybinds import KEYBINDS
+from voice_commander_elite.phrases import PhraseIndex
+from voice_commander_elite.profiles import binding_phrase
+
+
+def _utterances(rng: random.Random) -> dict[str, list[str]]:
+    phrases = [binding_phrase(name) for name in KEYBINDS]
+    exact = rng.sample(phrases, 200)
+    dropped, misheard = [], []
+    for phrase in rng.sample(phrases, 200):
+        words = phrase.split()
+        if len(words) > 2:
+            del words[rng.randrange(len(words))]
+        dropped.append(' '.join(words))
+    for phrase in rng.sample(phrases, 200):
+        words = phrase.split()
+        i = rng.randrange(len(words))
+        if len(words[i]) > 3:
+            j = rng.randrange(len(words[i]))
+            words[i] = words[i][:j] + words[i][j + 1:]
+        misheard.append(' '.join(words))
+    unknown = ['what is the weather like', 'open the pod bay doors', 'hello', 'play some music'] * 50
+    return {'exact': exact, 'dropped word': dropped, 'misheard word': misheard, 'no match': unknown}
+
+
+def _latencies(match, utterances: list[str]) -> list[float]:
+    timings = []
+    for utterance in utterances:
+        start = time.perf_counter()
+        match(utterance)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _linear_scan(phrases: list[str]):
+    def match(utterance: str) -> str | None:
+        best, best_ratio = None, 0.0
+        for phrase in phrases:
+            ratio = difflib.SequenceMatcher(None, utterance, phrase).ratio()
+            if ratio > best_ratio:
+                best, best_ratio = phrase, ratio
+        return best
+    return match
+
+
+def main() -> None:
+    start = time.perf_counter()
+    index = PhraseIndex.from_binding_names(KEYBINDS)
+    print(f'built index of {len(index)} phrases in {(time.perf_counter() - start) * 1e3:.2f}ms')
+    scan = _linear_scan(index.phrases())
+    print(f'{"utterances":<15} {"index p50":>10} {"index p99":>10} {"scan p50":>10} {"matched":>8}')
+    for kind, utterances in _utterances(random.Random(0)).items():
+        index_timings = _latencies(index.match, utterances)
+        scan_timings = _latencies(scan, utterances[:50])
+        matched = sum(index.match(u) is not None for u in utterances)
+        print(
+            f'{kind:<15} {statistics.median(index_timings) * 1e6:>8.1f}us'
+            f' {statistics.quantiles(index_timings, n=100)[98] * 1e6:>8.1f}us'
+            f' {statistics.median(scan_timings) * 1e6:>8.1f}us'
+            f' {matched / len(utterances):>8.0%}'
+        )
+
+
+if __name__ == '__main__':
+    main()
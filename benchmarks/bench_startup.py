@@ -0,0 +1,187 @@
+"""
+Benchmarks for the import-time bindings pipeline: file discovery, parsing, class generation, full import and serialization.
+
+Generate fixtures, point ``VOICE_COMMANDER_ELITE_BINDINGS_FILE`` at one of them, and run::
+
+    python benchmarks/synthetic.py /tmp/vce-fixtures
+    VOICE_COMMANDER_ELITE_BINDINGS_FILE=/tmp/vce-fixtures/large/Custom.4.0.binds \\
+        python benchmarks/bench_startup.py --fixtures /tmp/vce-fixtures --output results.json
+
+Results are written as JSON. Pass ``--compare old-results.json`` to print the change against an earlier run
+(e.g. from another commit).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from voice_commander_elite import keybinds
+from voice_commander_elite.keybinds import (
+    binding_to_press_action,
+    extract_binding,
+    find_bindings_file,
+    read_bound_actions,
+    resolve_ahk_key,
+)
+
+
+def measure(name: str, fixture: str | None, fn: Callable[[], Any], *, repeat: int = 7, number: int = 1) -> dict[str, Any]:
+    fn()  # warm up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        'name': name,
+        'fixture': fixture,
+        'repeat': repeat,
+        'number': number,
+        'min_s': min(timings),
+        'median_s': statistics.median(timings),
+        'mean_s': statistics.fmean(timings),
+        'stdev_s': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+def _bench_find_bindings_file(fixtures: dict[str, Path]) -> list[dict[str, Any]]:
+    results = [measure('find_bindings_file[env]', None, find_bindings_file, number=1000)]
+    # directory scan, as when the environment variable is not set
+    with tempfile.TemporaryDirectory() as directory:
+        for major in range(1, 5):
+            for minor in range(10):
+                Path(directory, f'Custom.{major}.{minor}.binds').touch()
+        for i in range(50):
+            Path(directory, f'Preset{i}.binds').touch()
+        env_value = os.environ.pop('VOICE_COMMANDER_ELITE_BINDINGS_FILE', None)
+        saved_dir = keybinds.APPDATA_BINDING_OPTIONS_DIR
+        keybinds.APPDATA_BINDING_OPTIONS_DIR = directory
+        try:
+            results.append(measure('find_bindings_file[scan]', None, find_bindings_file, number=100))
+        finally:
+            keybinds.APPDATA_BINDING_OPTIONS_DIR = saved_dir
+            if env_value is not None:
+                os.environ['VOICE_COMMANDER_ELITE_BINDINGS_FILE'] = env_value
+    return results
+
+
+def _bench_parse(name: str, path: Path) -> list[dict[str, Any]]:
+    results = [measure('read_bound_actions', name, lambda: read_bound_actions(path))]
+    try:
+        from bs4 import BeautifulSoup
+    except ImportError:
+        return results
+    results.append(measure('read_bound_actions[bs4]', name, lambda: keybinds._read_bound_actions_bs4(path)))
+    root = BeautifulSoup(path.read_text(), features='xml').find('Root')
+    tags = root.find_all(keybinds._bindings_with_mouse_or_keyboard)
+    results.append(measure('extract_binding', name, lambda: [extract_binding(tag) for tag in tags], number=10))
+    return results
+
+
+def _bench_classes(name: str, path: Path) -> list[dict[str, Any]]:
+    bindings = []
+    for binding in read_bound_actions(path).values():
+        try:
+            resolve_ahk_key(binding)
+        except Exception:
+            continue
+        bindings.append(binding)
+    results = [measure('binding_to_press_action', name, lambda: [binding_to_press_action(b) for b in bindings], number=10)]
+    classes = [binding_to_press_action(b) for b in bindings]
+    try:
+        instances = [cls() for cls in classes]
+        simplified = [cls.wss() for cls in classes]
+    except Exception as e:
+        print(f'skipping to_dict benchmarks: could not create actions ({e})', file=sys.stderr)
+        return results
+    results.append(measure('to_dict', name, lambda: [a.to_dict() for a in instances], number=10))
+    results.append(measure('to_dict[wss]', name, lambda: [a.to_dict() for a in simplified], number=10))
+    return results
+
+
+def _bench_import(name: str, path: Path, repeat: int) -> list[dict[str, Any]]:
+    results = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, VOICE_COMMANDER_ELITE_BINDINGS_FILE=str(path), VOICE_COMMANDER_ELITE_CACHE_DIR=cache_dir)
+
+        def run(code: str, **extra_env: str) -> None:
+            subprocess.run([sys.executable, '-c', code], env=dict(env, **extra_env), check=True)
+
+        results.append(measure('interpreter startup', name, lambda: run('pass'), repeat=repeat))
+        results.append(measure('import voice_commander_elite[no cache]', name, lambda: run('import voice_commander_elite', VOICE_COMMANDER_ELITE_NO_CACHE='1'), repeat=repeat))
+        results.append(measure('import voice_commander_elite[cached]', name, lambda: run('import voice_commander_elite'), repeat=repeat))
+    return results
+
+
+def run_benchmarks(fixtures: dict[str, Path], *, import_repeat: int = 5) -> dict[str, Any]:
+    results = _bench_find_bindings_file(fixtures)
+    for name, path in fixtures.items():
+        results.extend(_bench_parse(name, path))
+        results.extend(_bench_classes(name, path))
+        results.extend(_bench_import(name, path, import_repeat))
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'commit': _git_commit(),
+        'results': results,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True, cwd=Path(__file__).parent)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def compare(old: dict[str, Any], new: dict[str, Any]) -> None:
+    old_results = {(r['name'], r['fixture']): r for r in old['results']}
+    print(f'{"benchmark":<45} {"fixture":<8} {"old":>12} {"new":>12} {"change":>8}')
+    for r in new['results']:
+        before = old_results.get((r['name'], r['fixture']))
+        if before is None:
+            continue
+        change = r['median_s'] / before['median_s'] - 1 if before['median_s'] else float('nan')
+        print(f'{r["name"]:<45} {r["fixture"] or "-":<8} {before["median_s"] * 1e3:>10.3f}ms {r["median_s"] * 1e3:>10.3f}ms {change:>+8.1%}')
+
+
+def _find_fixtures(directory: Path) -> dict[str, Path]:
+    return {path.parent.name: path for path in sorted(directory.glob('*/Custom.*.binds'))}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fixtures', type=Path, help='directory written by benchmarks/synthetic.py (defaults to the bindings file from the environment)')
+    parser.add_argument('--output', type=Path, help='write the JSON results to this file instead of stdout')
+    parser.add_argument('--compare', type=Path, help='earlier JSON results to compare against')
+    parser.add_argument('--import-repeat', type=int, default=5, help='number of subprocess imports per measurement')
+    args = parser.parse_args(argv)
+
+    if args.fixtures is not None:
+        fixtures = _find_fixtures(args.fixtures)
+    else:
+        fixtures = {'env': find_bindings_file()}
+    report = run_benchmarks(fixtures, import_repeat=args.import_repeat)
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2))
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.compare is not None:
+        compare(json.loads(args.compare.read_text()), report)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,318 @@
+"""
+Soak test: a long run of Elite actions and ``EliteDangerousIsActive`` checks against the recording fake AHK backend,
+reporting sustained throughput, tail latency and memory growth over time.
+
+Every command checks whether the game window is active, then runs one operation, picked at random according to ``--mix``:
+
+- ``press``: press a long-lived action instance
+- ``new``: create a new action instance, serialize it and press it
+- ``wss``: create ``.wss()`` instances of an action and of ``EliteDangerousIsActive``, serialize and use them
+- ``generate``: generate a new action class for a binding (as at import time), then create, serialize and press an instance
+- ``reload``: apply a slightly changed set of bindings, as when the bindings file is edited during a session
+- ``condition``: only the condition check
+
+Memory is measured with ``tracemalloc`` after a garbage collection at the end of every interval and compared with the
+first interval after warm-up. The run fails (exit status 1) when memory grows by more than ``--max-growth-kb`` or the
+p99 latency of any interval exceeds ``--max-p99-ms``.
+
+Usage::
+
+    VOICE_COMMANDER_ELITE_BINDINGS_FILE=/tmp/vce-fixtures/large/Custom.4.0.binds \\
+        python benchmarks/soak.py --duration 600 --rate 200 --mix press=6,new=2,wss=1,generate=1,reload=0.01
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, NamedTuple
+
+from voice_commander_elite import actions
+from voice_commander_elite.conditions import EliteDangerousIsActive
+from voice_commander_elite.fake_ahk import RecordingAHK
+from voice_commander_elite.keybinds import Binding, binding_to_press_action
+from voice_commander_elite.reload import apply_bindings
+
+DEFAULT_MIX = 'press=6,new=2,wss=1,generate=1,reload=0.01,condition=1'
+
+
+class Interval(NamedTuple):
+    #: seconds since the start of the run, at the end of the interval
+    elapsed: float
+    commands: int
+    throughput: float
+    p50_ms: float
+    p99_ms: float
+    max_ms: float
+    #: memory traced after garbage collection, and its growth since the first interval after warm-up
+    traced_kb: float
+    growth_kb: float
+    live_objects: int
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in _OPERATIONS:
+            raise ValueError(f'unknown operation {name!r} (expected one of {", ".join(_OPERATIONS)})')
+        weights[name] = float(weight) if weight else 1.0
+    if not any(weights.values()):
+        raise ValueError('the mix needs at least one operation with a positive weight')
+    return weights
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class Workload:
+    def __init__(self, seed: int):
+        self.random = random.Random(seed)
+        self.names = list(actions._available_bindings)
+        if not self.names:
+            raise SystemExit('no bound actions; point VOICE_COMMANDER_ELITE_BINDINGS_FILE at a bindings file')
+        self.instances = [getattr(actions, name)() for name in self.names]
+        self.is_active = EliteDangerousIsActive()
+        self.original_bindings = dict(actions._found_bindings)
+        self.changed_bindings = self._swap_two_keys(self.original_bindings)
+        self.reloaded = False
+        # create every action class up front, so that creating them is not mistaken for growth
+        for name in self.names:
+            getattr(actions, name)().to_dict()
+            getattr(actions, name).wss().to_dict()
+
+    @staticmethod
+    def _swap_two_keys(bindings: dict[str, Binding]) -> dict[str, Binding]:
+        first, second = list(bindings)[:2]
+        changed = dict(bindings)
+        changed[first] = Binding(first, bindings[second].device, bindings[second].key)
+        changed[second] = Binding(second, bindings[first].device, bindings[first].key)
+        return changed
+
+    def _action_class(self) -> Any:
+        return getattr(actions, self.random.choice(self.names))
+
+    def press(self) -> None:
+        self.random.choice(self.instances).perform()
+
+    def new(self) -> None:
+        action = self._action_class()()
+        action.to_dict()
+        action.perform()
+
+    def wss(self) -> None:
+        action = self._action_class().wss()
+        action.to_dict()
+        condition = EliteDangerousIsActive.wss()
+        condition.to_dict()
+        if condition.check():
+            action.perform()
+
+    def generate(self) -> None:
+        binding = actions._available_bindings[self.random.choice(self.names)]
+        action = binding_to_press_action(binding)()
+        action.to_dict()
+        action.perform()
+
+    def reload(self) -> None:
+        apply_bindings(self.original_bindings if self.reloaded else self.changed_bindings)
+        self.reloaded = not self.reloaded
+
+    def condition(self) -> None:
+        pass
+
+    def restore(self) -> None:
+        if self.reloaded:
+            apply_bindings(self.original_bindings)
+
+
+_OPERATIONS = ('press', 'new', 'wss', 'generate', 'reload', 'condition')
+
+
+def _measure_memory(filters: list[tracemalloc.Filter]) -> tuple[tracemalloc.Snapshot, float, int]:
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot().filter_traces(filters)
+    traced = sum(stat.size for stat in snapshot.statistics('filename'))
+    return snapshot, traced / 1024, len(gc.get_objects())
+
+
+def soak(
+    *,
+    duration: float,
+    rate: float,
+    mix: dict[str, float],
+    interval: float,
+    warmup: float,
+    seed: int = 0,
+    report: Callable[[Interval], None] = lambda interval: None,
+) -> tuple[list[Interval], list[str]]:
+    """
+    Run the soak test. Returns the measurements of each interval after warm-up and the code locations whose memory grew
+    the most between the first and the last of them.
+    """
+    workload = Workload(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    operations = [getattr(workload, name) for name in names]
+    choose = workload.random.choices
+    is_active = workload.is_active
+    # the recorder keeps only recent calls, so it does not show up as growth itself
+    ahk = RecordingAHK(max_calls=1000)
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    ]
+
+    intervals: list[Interval] = []
+    baseline: tracemalloc.Snapshot | None = None
+    baseline_kb = 0.0
+    last_snapshot: tracemalloc.Snapshot | None = None
+    timings: list[float] = []
+    tracemalloc.start()
+    try:
+        with ahk.installed():
+            ahk.focus()
+            start = time.perf_counter()
+            end = start + warmup + duration
+            interval_start = schedule = start
+            next_boundary = start + (warmup or interval)
+            commands = 0
+            while True:
+                now = time.perf_counter()
+                if now >= next_boundary:
+                    elapsed = now - interval_start
+                    snapshot, traced_kb, live_objects = _measure_memory(filters)
+                    if now - start >= warmup and timings:
+                        if baseline is None:
+                            baseline, baseline_kb = snapshot, traced_kb
+                        last_snapshot = snapshot
+                        ordered = sorted(timings)
+                        measured = Interval(
+                            elapsed=now - start,
+                            commands=len(timings),
+                            throughput=len(timings) / elapsed,
+                            p50_ms=statistics.median(ordered) * 1e3,
+                            p99_ms=_percentile(ordered, 0.99) * 1e3,
+                            max_ms=ordered[-1] * 1e3,
+                            traced_kb=traced_kb,
+                            growth_kb=traced_kb - baseline_kb,
+                            live_objects=live_objects,
+                        )
+                        intervals.append(measured)
+                        report(measured)
+                    timings = []
+                    ahk.clear()
+                    if now >= end:
+                        break
+                    # don't count the time spent measuring memory against the next interval
+                    interval_start = time.perf_counter()
+                    next_boundary = interval_start + interval
+                    schedule += interval_start - now
+                    continue
+                if rate:
+                    due = schedule + commands / rate
+                    if due > now:
+                        time.sleep(min(due - now, next_boundary - now))
+                        continue
+                operation = choose(operations, weights)[0]
+                t0 = time.perf_counter()
+                if is_active.check():
+                    operation()
+                timings.append(time.perf_counter() - t0)
+                commands += 1
+    finally:
+        workload.restore()
+        tracemalloc.stop()
+
+    growth_sites = []
+    if baseline is not None and last_snapshot is not None and last_snapshot is not baseline:
+        for stat in last_snapshot.compare_to(baseline, 'lineno')[:10]:
+            if stat.size_diff > 0:
+                growth_sites.append(str(stat))
+    return intervals, growth_sites
+
+
+def _print_interval(interval: Interval) -> None:
+    print(
+        f'{interval.elapsed:8.1f}s {interval.commands:8d} commands {interval.throughput:10,.0f}/s'
+        f'  p50 {interval.p50_ms:7.3f}ms p99 {interval.p99_ms:7.3f}ms max {interval.max_ms:8.3f}ms'
+        f'  traced {interval.traced_kb:9.1f}KiB ({interval.growth_kb:+.1f}) objects {interval.live_objects}',
+        flush=True,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--duration', type=float, default=60.0, help='seconds to run after warm-up')
+    parser.add_argument('--rate', type=float, default=500.0, help='target commands per second (0: as fast as possible)')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'relative weights of the operations (default: {DEFAULT_MIX})')
+    parser.add_argument('--interval', type=float, default=5.0, help='seconds between measurements')
+    parser.add_argument('--warmup', type=float, default=5.0, help='seconds to run before the memory baseline is taken')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-growth-kb', type=float, default=256.0, help='fail if traced memory grows by more than this')
+    parser.add_argument('--max-p99-ms', type=float, default=5.0, help='fail if the p99 latency of any interval exceeds this')
+    parser.add_argument('--output', default=None, help='also write the results to this JSON file')
+    args = parser.parse_args(argv)
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f'soak: {args.duration}s after {args.warmup}s warm-up, rate {args.rate or "unlimited"}, mix {args.mix}', flush=True)
+    intervals, growth_sites = soak(
+        duration=args.duration,
+        rate=args.rate,
+        mix=mix,
+        interval=args.interval,
+        warmup=args.warmup,
+        seed=args.seed,
+        report=_print_interval,
+    )
+    if not intervals:
+        print('no measurements; increase --duration', file=sys.stderr)
+        return 1
+
+    failures = []
+    growth = intervals[-1].growth_kb
+    worst_p99 = max(interval.p99_ms for interval in intervals)
+    if growth > args.max_growth_kb:
+        failures.append(f'memory grew by {growth:.1f}KiB (threshold {args.max_growth_kb}KiB)')
+    if worst_p99 > args.max_p99_ms:
+        failures.append(f'p99 latency reached {worst_p99:.3f}ms (threshold {args.max_p99_ms}ms)')
+
+    total = sum(interval.commands for interval in intervals)
+    print(f'sustained throughput: {total / sum(i.commands / i.throughput for i in intervals):,.0f} commands/s over {total} commands')
+    print(f'memory growth: {growth:+.1f}KiB, worst p99: {worst_p99:.3f}ms')
+    if growth_sites:
+        print('largest growth since the baseline:')
+        for site in growth_sites:
+            print(f'  {site}')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(
+                {
+                    'arguments': vars(args),
+                    'intervals': [interval._asdict() for interval in intervals],
+                    'growth_sites': growth_sites,
+                    'failures': failures,
+                },
+                f,
+                indent=2,
+            )
+
+    for failure in failures:
+        print(f'FAIL: {failure}', file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
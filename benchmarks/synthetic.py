@@ -0,0 +1,106 @@
+"""
+Synthetic Elite Dangerous ``.binds`` files for benchmarks.
+
+Usage::
+
+    python benchmarks/synthetic.py OUTPUT_DIR
+"""
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+from voice_commander_elite.keybinds import AHK_KEY_MAPPING, KEYBINDS, BindingDevice
+
+
+class BindsProfile(NamedTuple):
+    name: str
+    #: number of KEYBINDS entries that are written at all
+    keybinds: int
+    #: fraction of written entries bound to a keyboard key or mouse button
+    bound: float
+    #: fraction of written entries bound to a joystick only
+    joystick: float
+    #: number of extra axis/settings elements (never bound to a key)
+    extra_elements: int
+
+
+PROFILES = [
+    BindsProfile('small', keybinds=40, bound=0.5, joystick=0.1, extra_elements=10),
+    BindsProfile('medium', keybinds=len(KEYBINDS), bound=0.3, joystick=0.2, extra_elements=100),
+    BindsProfile('large', keybinds=len(KEYBINDS), bound=1.0, joystick=0.0, extra_elements=2000),
+]
+
+_KEYBOARD_KEYS = [k for k, v in AHK_KEY_MAPPING[BindingDevice.KEYBOARD].items() if v]
+_MOUSE_KEYS = list(AHK_KEY_MAPPING[BindingDevice.MOUSE])
+
+
+def _key_binding(tag: str, rng: random.Random) -> str:
+    if rng.random() < 0.1:
+        return f'\t\t<{tag} Device="Mouse" Key="{rng.choice(_MOUSE_KEYS)}" />'
+    if rng.random() < 0.2:
+        return (
+            f'\t\t<{tag} Device="Keyboard" Key="{rng.choice(_KEYBOARD_KEYS)}">\n'
+            f'\t\t\t<Modifier Device="Keyboard" Key="Key_LeftShift" />\n'
+            f'\t\t</{tag}>'
+        )
+    return f'\t\t<{tag} Device="Keyboard" Key="{rng.choice(_KEYBOARD_KEYS)}" />'
+
+
+def _joystick_binding(tag: str, rng: random.Random) -> str:
+    return f'\t\t<{tag} Device="231D0200" Key="Joy_{rng.randint(1, 32)}" />'
+
+
+def _unbound(tag: str) -> str:
+    return f'\t\t<{tag} Device="{{NoDevice}}" Key="" />'
+
+
+def render_binds(profile: BindsProfile, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8" ?>',
+        '<Root PresetName="Custom" MajorVersion="4" MinorVersion="0">',
+        '\t<KeyboardLayout>en-US</KeyboardLayout>',
+        '\t<MouseXMode Value="" />',
+    ]
+    for i in range(profile.extra_elements):
+        lines.extend([
+            f'\t<SyntheticAxis{i}>',
+            '\t\t<Binding Device="231D0200" Key="Joy_XAxis" />',
+            '\t\t<Inverted Value="0" />',
+            '\t\t<Deadzone Value="0.00000000" />',
+            f'\t</SyntheticAxis{i}>',
+        ])
+    for name in KEYBINDS[:profile.keybinds]:
+        roll = rng.random()
+        if roll < profile.bound:
+            primary, secondary = _key_binding('Primary', rng), _unbound('Secondary')
+            if rng.random() < 0.3:
+                # bound on the secondary slot only
+                primary, secondary = _unbound('Primary'), _key_binding('Secondary', rng)
+        elif roll < profile.bound + profile.joystick:
+            primary, secondary = _joystick_binding('Primary', rng), _unbound('Secondary')
+        else:
+            primary, secondary = _unbound('Primary'), _unbound('Secondary')
+        lines.extend([f'\t<{name}>', primary, secondary, f'\t</{name}>'])
+    lines.append('</Root>')
+    return '\n'.join(lines) + '\n'
+
+
+def write_fixtures(output_dir: str | Path, seed: int = 0) -> dict[str, Path]:
+    """Write one ``Custom.4.0.binds`` per profile, each in its own subdirectory of ``output_dir``."""
+    fixtures = {}
+    for profile in PROFILES:
+        directory = Path(output_dir) / profile.name
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / 'Custom.4.0.binds'
+        path.write_text(render_binds(profile, seed=seed), encoding='utf-8')
+        fixtures[profile.name] = path
+    return fixtures
+
+
+if __name__ == '__main__':
+    for name, path in write_fixtures(sys.argv[1]).items():
+        print(name, path)
@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# the benchmarks directory (and its synthetic .binds generator) is not part of the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class FakeClock:
+    """A monotonic clock that only moves when told to: by assigning ``now`` or through :meth:`sleep`."""
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture(scope='session')
+def synthetic_binds(tmp_path_factory):
+    """The synthetic ``Custom.4.0.binds`` files of :mod:`benchmarks.synthetic`, by profile name."""
+    from benchmarks.synthetic import write_fixtures
+
+    return write_fixtures(tmp_path_factory.mktemp('synthetic'))
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path_factory, monkeypatch):
+    """Keep the parsed bindings cache of every test out of the user's cache directory."""
+    monkeypatch.setenv('VOICE_COMMANDER_ELITE_CACHE_DIR', str(tmp_path_factory.mktemp('cache')))
@@ -0,0 +1,158 @@
+import json
+import os
+
+import pytest
+
+from voice_commander_elite.companion import CompanionFiles, CurrentSystemFollower, set_companion_files
+from voice_commander_elite.conditions import CargoEmpty, HasJumpsRemaining
+
+ROUTE = ['Sol', 'Alpha Centauri', "Barnard's Star", 'Wolf 359']
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data), encoding='utf-8')
+    # the readers compare mtime and size; make sure a rewrite within the same tick is still seen
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def write_cargo(directory, inventory):
+    write_json(directory / 'Cargo.json', {
+        'event': 'Cargo',
+        'Vessel': 'Ship',
+        'Count': sum(inventory.values()),
+        'Inventory': [{'Name': name, 'Count': count} for name, count in inventory.items()],
+    })
+
+
+@pytest.fixture
+def journal_dir(tmp_path):
+    write_json(tmp_path / 'NavRoute.json', {
+        'timestamp': '2026-10-17T10:00:00Z',
+        'event': 'NavRoute',
+        'Route': [{'StarSystem': system, 'SystemAddress': i} for i, system in enumerate(ROUTE)],
+    })
+    write_cargo(tmp_path, {'gold': 4})
+    write_json(tmp_path / 'ModulesInfo.json', {'event': 'ModuleInfo', 'Modules': [{'Slot': 'FrameShiftDrive', 'Item': 'int_hyperdrive_size5_class5'}]})
+    write_json(tmp_path / 'Backpack.json', {'event': 'Backpack', 'Items': [], 'Components': [], 'Consumables': [{'Name': 'healthpack', 'Count': 2}], 'Data': []})
+    return tmp_path
+
+
+@pytest.fixture
+def files(journal_dir, clock):
+    files = CompanionFiles(journal_dir, clock=clock, sleep=clock.sleep)
+    yield files
+    files.close()
+
+
+@pytest.fixture
+def shared_files(files):
+    set_companion_files(files)
+    yield files
+    set_companion_files(None)
+
+
+def test_snapshots(files):
+    assert files.nav_route().route == tuple(ROUTE)
+    assert files.nav_route().jumps_remaining() == 3
+    assert files.cargo().inventory == {'gold': 4}
+    assert not files.cargo().is_empty
+    assert files.modules_info().module_in('FrameShiftDrive')['Item'] == 'int_hyperdrive_size5_class5'
+    assert files.backpack().count('healthpack') == 2
+    with pytest.raises(ValueError):
+        files.snapshot('Status')
+
+
+def test_snapshots_are_read_only(files):
+    cargo = files.cargo()
+    with pytest.raises(TypeError):
+        cargo.data['Count'] = 0
+    assert isinstance(cargo.get('Inventory'), tuple)
+
+
+def test_change_detection(files, journal_dir):
+    first = files.cargo()
+    assert files.cargo() is first
+    write_cargo(journal_dir, {})
+    second = files.cargo()
+    assert second is not first
+    assert second.is_empty and second.count == 0
+
+
+def test_missing_or_partial_file_keeps_the_last_snapshot(files, journal_dir):
+    first = files.cargo()
+    (journal_dir / 'Cargo.json').write_text('{"event": "Car', encoding='utf-8')
+    assert files.cargo() is first
+    (journal_dir / 'Cargo.json').unlink()
+    assert files.cargo() is first
+
+
+def test_wait_for_change_times_out(files, clock):
+    assert files.wait_for_change('Cargo', timeout=1.0, poll_interval=0.25) is None
+    assert clock.now >= 1.0
+    assert clock.sleeps == [0.25] * 4
+
+
+def test_wait_for_change_of_a_field(files, journal_dir, clock):
+    def sleep(seconds):
+        clock.sleep(seconds)
+        if len(clock.sleeps) == 2:
+            # a new version of the file that does not change the field
+            write_cargo(journal_dir, {'silver': 4})
+        elif len(clock.sleeps) == 4:
+            write_cargo(journal_dir, {'silver': 4, 'gold': 1})
+
+    files._sleep = sleep
+    snapshot = files.wait_for_change('Cargo', lambda cargo: cargo.count, timeout=10.0, poll_interval=0.5)
+    assert snapshot is not None and snapshot.count == 5
+    assert clock.now == 2.0
+
+
+def write_journal(path, *events, mode='w'):
+    with open(path, mode, encoding='utf-8') as f:
+        for event in events:
+            f.write(json.dumps(event) + '\n')
+
+
+def test_current_system_is_seeded_from_the_journal_index(journal_dir):
+    write_journal(journal_dir / 'Journal.2026-10-16T090000.01.log', {'event': 'Location', 'StarSystem': 'Sol'}, {'event': 'FSDJump', 'StarSystem': 'Alpha Centauri'})
+    write_journal(journal_dir / 'Journal.2026-10-17T100000.01.log', {'event': 'LoadGame', 'Commander': 'Jameson'})
+    follower = CurrentSystemFollower(journal_dir)
+    assert follower.system is None
+    assert follower.poll() == 'Alpha Centauri'
+
+
+def test_current_system_follows_the_journal(files, journal_dir):
+    journal = journal_dir / 'Journal.2026-10-17T100000.01.log'
+    assert files.location.poll() is None
+    write_journal(journal, {'event': 'Location', 'StarSystem': 'Sol'}, {'event': 'FSDJump', 'StarSystem': 'Alpha Centauri'})
+    assert files.location.poll() == 'Alpha Centauri'
+    write_journal(journal, {'event': 'Docked', 'StationName': 'Somewhere'}, mode='a')
+    assert files.location.poll() == 'Alpha Centauri'
+    assert files.current_system() == 'Alpha Centauri'
+    assert files.nav_route().jumps_remaining(files.current_system()) == 2
+
+
+def test_current_system_only_reads_the_published_value(shared_files, monkeypatch):
+    def fail():
+        raise AssertionError('the journal was read on the caller\'s thread')
+
+    monkeypatch.setattr(shared_files.location, 'start', lambda: None)
+    monkeypatch.setattr(shared_files.location, 'poll', fail)
+    shared_files.location.system = 'Alpha Centauri'
+    assert shared_files.current_system() == 'Alpha Centauri'
+    assert HasJumpsRemaining(2).check()
+    assert not HasJumpsRemaining(3).check()
+
+
+def test_conditions(shared_files, journal_dir):
+    assert HasJumpsRemaining(3).check()
+    write_journal(journal_dir / 'Journal.2026-10-17T100000.01.log', {'event': 'FSDJump', 'StarSystem': "Barnard's Star"})
+    shared_files.location.poll()
+    assert not HasJumpsRemaining(3).check()
+    assert HasJumpsRemaining().check()
+    assert HasJumpsRemaining(2, negate=True).check()
+    assert not CargoEmpty().check()
+    write_cargo(journal_dir, {})
+    assert CargoEmpty().check()
+    assert HasJumpsRemaining(2, negate=True).to_dict()['condition_config'] == {'negate': True, 'minimum': 2}
@@ -0,0 +1,17 @@
+from voice_commander.conditions import AHKWindowIsActive
+
+from voice_commander_elite.conditions import EliteDangerousIsActive, LandingGearDown
+
+
+def test_elite_is_active_serializes_per_instance():
+    first, second = EliteDangerousIsActive(), EliteDangerousIsActive()
+    assert first.to_dict() == {'condition_type': 'voice_commander_elite.conditions.EliteDangerousIsActive', 'condition_config': {}}
+    first.add_condition(LandingGearDown())
+    assert first.to_dict()['conditions'] == [LandingGearDown().to_dict()]
+    assert not second.to_dict().get('conditions')
+
+
+def test_elite_is_active_simplified_serialization():
+    d = EliteDangerousIsActive.wss().to_dict()
+    assert d['condition_type'] == AHKWindowIsActive.fqn()
+    assert d['condition_config']['title']
@@ -0,0 +1,184 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from voice_commander_elite.journal import (
+    JournalEventRouter,
+    JournalEventTrigger,
+    JournalTailer,
+    find_latest_journal,
+)
+
+OLD_NAME = 'Journal.221231235959.01.log'
+NEW_NAME = 'Journal.2023-01-01T000000.01.log'
+
+
+def line(event, **fields):
+    return json.dumps({'timestamp': '2023-01-01T00:00:00Z', 'event': event, **fields}) + '\n'
+
+
+def append(path, text):
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(text)
+
+
+def names(events):
+    return [event['event'] for event in events]
+
+
+@pytest.fixture
+def tailer(tmp_path):
+    return JournalTailer(tmp_path, rotation_check_interval=0.0, from_start=True)
+
+
+def test_reads_only_appended_lines(tmp_path, tailer):
+    journal = tmp_path / NEW_NAME
+    append(journal, line('Fileheader') + line('LoadGame'))
+    assert names(tailer.read_new()) == ['Fileheader', 'LoadGame']
+    assert tailer.read_new() == []
+    append(journal, line('FSDJump', StarSystem='Sol'))
+    assert names(tailer.read_new()) == ['FSDJump']
+    assert tailer.offset == os.path.getsize(journal)
+
+
+def test_starts_at_the_end_unless_from_start(tmp_path):
+    journal = tmp_path / NEW_NAME
+    append(journal, line('Fileheader'))
+    tailer = JournalTailer(tmp_path)
+    assert tailer.read_new() == []
+    append(journal, line('Docked'))
+    assert names(tailer.read_new()) == ['Docked']
+
+
+def test_partial_lines_wait_for_their_end(tmp_path, tailer):
+    journal = tmp_path / NEW_NAME
+    text = line('FSDJump', StarSystem='Sol')
+    append(journal, line('Fileheader') + text[:10])
+    assert names(tailer.read_new()) == ['Fileheader']
+    append(journal, text[10:-1])
+    assert tailer.read_new() == []
+    append(journal, '\n')
+    assert tailer.read_new() == [json.loads(text)]
+
+
+def test_invalid_lines_are_skipped(tmp_path, tailer):
+    append(tmp_path / NEW_NAME, line('Fileheader') + '{not json\n' + '[1, 2]\n' + line('Docked'))
+    assert names(tailer.read_new()) == ['Fileheader', 'Docked']
+
+
+def test_truncated_file_is_read_again_from_the_start(tmp_path, tailer):
+    journal = tmp_path / NEW_NAME
+    append(journal, line('Fileheader') + line('LoadGame') + line('Location'))
+    assert len(tailer.read_new()) == 3
+    journal.write_text(line('Shutdown'), encoding='utf-8')
+    assert names(tailer.read_new()) == ['Shutdown']
+
+
+def test_follows_rotation_across_naming_schemes(tmp_path, tailer):
+    # a pre-2022 name sorts after the new format as a string, but was written first
+    old = tmp_path / OLD_NAME
+    append(old, line('Fileheader') + line('Location', StarSystem='Sol'))
+    assert names(tailer.read_new()) == ['Fileheader', 'Location']
+    assert tailer.path == old
+
+    new = tmp_path / NEW_NAME
+    append(new, line('Fileheader') + line('LoadGame'))
+    # the old journal is idle, so the tailer looks for a newer one and reads it from its beginning
+    assert tailer.read_new() == []
+    assert tailer.path == new
+    assert names(tailer.read_new()) == ['Fileheader', 'LoadGame']
+    assert find_latest_journal(tmp_path) == new
+
+
+def test_router_dispatch_order():
+    router = JournalEventRouter()
+    calls = []
+
+    async def coroutine_handler(event):
+        calls.append(('coroutine', event['event']))
+
+    def failing_handler(event):
+        raise RuntimeError('ignored')
+
+    router.on('*', lambda event: calls.append(('any', event['event'])))
+    router.on('FSDJump', lambda event: calls.append(('first', event['event'])))
+    router.on('FSDJump', failing_handler)
+    router.on('FSDJump', coroutine_handler)
+    router.on('Docked', lambda event: calls.append(('docked', event['event'])))
+
+    async def dispatch_all():
+        await router.dispatch({'event': 'FSDJump'})
+        await router.dispatch({'event': 'Docked'})
+        await router.dispatch({'event': 'Undocked'})
+
+    asyncio.run(dispatch_all())
+    assert calls == [
+        ('first', 'FSDJump'), ('coroutine', 'FSDJump'), ('any', 'FSDJump'),
+        ('docked', 'Docked'), ('any', 'Docked'),
+        ('any', 'Undocked'),
+    ]
+
+
+class RecordingAction:
+    def __init__(self, name, performed):
+        self.name = name
+        self.performed = performed
+
+    def perform(self, *args, **kwargs):
+        self.performed.append(self.name)
+
+
+class FixedCondition:
+    def __init__(self, result):
+        self.result = result
+
+    def check(self, *args, **kwargs):
+        return self.result
+
+
+def test_trigger_performs_its_actions_when_conditions_pass():
+    performed = []
+    router = JournalEventRouter()
+    router.add_trigger(
+        JournalEventTrigger('Docked', where=lambda event: event.get('StationType') != 'FleetCarrier')
+        .add_action(RecordingAction('first', performed))
+        .add_action(RecordingAction('second', performed))
+    )
+    router.add_trigger(JournalEventTrigger('Docked').add_condition(FixedCondition(False)).add_action(RecordingAction('blocked', performed)))
+
+    async def dispatch_all():
+        await router.dispatch({'event': 'Docked', 'StationType': 'Coriolis'})
+        await router.dispatch({'event': 'Docked', 'StationType': 'FleetCarrier'})
+        await router.dispatch({'event': 'Undocked'})
+
+    asyncio.run(dispatch_all())
+    assert performed == ['first', 'second']
+
+
+def test_run_routes_appended_events(tmp_path):
+    journal = tmp_path / NEW_NAME
+    append(journal, line('Fileheader'))
+    tailer = JournalTailer(tmp_path, poll_interval=0.01)
+    router = JournalEventRouter()
+    seen = []
+
+    def on_event(event):
+        seen.append(event['event'])
+        if event['event'] == 'Shutdown':
+            tailer.stop()
+
+    router.on('*', on_event)
+
+    # open the journal at its current end, so only what is appended below is routed
+    assert tailer.read_new() == []
+
+    async def main():
+        task = asyncio.create_task(tailer.run(router))
+        await asyncio.sleep(0.02)
+        append(journal, line('Docked') + line('Shutdown'))
+        await asyncio.wait_for(task, timeout=5)
+
+    asyncio.run(main())
+    assert seen == ['Docked', 'Shutdown']
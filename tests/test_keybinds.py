@@ -0,0 +1,104 @@
+import pytest
+
+from voice_commander_elite.keybinds import (
+    BindingDevice,
+    _read_bound_actions_bs4,
+    iter_bound_actions,
+    read_bound_actions,
+)
+
+HEADER = '<?xml version="1.0" encoding="UTF-8" ?>\n<Root PresetName="Custom" MajorVersion="4" MinorVersion="0">\n'
+
+
+def write_binds(tmp_path, body):
+    path = tmp_path / 'Custom.4.0.binds'
+    path.write_text(HEADER + body + '</Root>\n', encoding='utf-8')
+    return path
+
+
+def as_tuples(bindings):
+    return {binding.name: (binding.device, binding.key) for binding in bindings}
+
+
+@pytest.mark.parametrize('profile', ['small', 'medium', 'large'])
+def test_streaming_parser_matches_bs4(synthetic_binds, profile):
+    pytest.importorskip('bs4')
+    streamed = as_tuples(iter_bound_actions(synthetic_binds[profile]))
+    assert streamed
+    assert streamed == as_tuples(_read_bound_actions_bs4(synthetic_binds[profile]).values())
+
+
+def test_secondary_only_binding(tmp_path):
+    path = write_binds(tmp_path, (
+        '\t<LandingGearToggle>\n'
+        '\t\t<Primary Device="{NoDevice}" Key="" />\n'
+        '\t\t<Secondary Device="Mouse" Key="Mouse_4" />\n'
+        '\t</LandingGearToggle>\n'
+    ))
+    assert as_tuples(iter_bound_actions(path)) == {'LandingGearToggle': (BindingDevice.MOUSE, 'Mouse_4')}
+
+
+def test_modifier_children_do_not_replace_the_key(tmp_path):
+    path = write_binds(tmp_path, (
+        '\t<Supercruise>\n'
+        '\t\t<Primary Device="Keyboard" Key="Key_J">\n'
+        '\t\t\t<Modifier Device="Keyboard" Key="Key_LeftShift" />\n'
+        '\t\t</Primary>\n'
+        '\t\t<Secondary Device="{NoDevice}" Key="" />\n'
+        '\t</Supercruise>\n'
+    ))
+    assert as_tuples(iter_bound_actions(path)) == {'Supercruise': (BindingDevice.KEYBOARD, 'Key_J')}
+
+
+def test_joystick_only_bindings_are_skipped(tmp_path):
+    path = write_binds(tmp_path, (
+        '\t<HyperSuperCombination>\n'
+        '\t\t<Primary Device="231D0200" Key="Joy_3" />\n'
+        '\t\t<Secondary Device="{NoDevice}" Key="" />\n'
+        '\t</HyperSuperCombination>\n'
+        '\t<UseBoostJuice>\n'
+        '\t\t<Primary Device="{NoDevice}" Key="" />\n'
+        '\t\t<Secondary Device="{NoDevice}" Key="" />\n'
+        '\t</UseBoostJuice>\n'
+        '\t<Supercruise>\n'
+        '\t\t<Primary Device="Keyboard" Key="Key_J" />\n'
+        '\t\t<Secondary Device="231D0200" Key="Joy_4" />\n'
+        '\t</Supercruise>\n'
+    ))
+    skipped = {}
+    assert list(as_tuples(iter_bound_actions(path, skipped))) == ['Supercruise']
+    # unbound keybinds are not reported as skipped, only those bound to a joystick
+    assert skipped == {'joystick_device': ['HyperSuperCombination']}
+
+
+def test_malformed_file_falls_back_to_bs4(tmp_path):
+    pytest.importorskip('bs4')
+    path = write_binds(tmp_path, (
+        '\t<KeyboardLayout>en-US & more</KeyboardLayout>\n'
+        '\t<LandingGearToggle>\n'
+        '\t\t<Primary Device="Keyboard" Key="Key_L" />\n'
+        '\t\t<Secondary Device="{NoDevice}" Key="" />\n'
+        '\t</LandingGearToggle>\n'
+    ))
+    skipped = {'joystick_device': ['stale']}
+    assert as_tuples(read_bound_actions(path, skipped).values()) == {'LandingGearToggle': (BindingDevice.KEYBOARD, 'Key_L')}
+    # the lenient parser cannot tell what it skipped
+    assert skipped == {}
+
+
+def test_instances_of_one_class_serialize_their_own_conditions():
+    from voice_commander_elite.conditions import EliteDangerousIsActive, LandingGearDown
+    from voice_commander_elite.keybinds import Binding, binding_to_press_action
+
+    action_class = binding_to_press_action(Binding('LandingGearToggle', BindingDevice.KEYBOARD, 'Key_L'))
+    first, second, third = action_class(), action_class(), action_class()
+    before = third.to_dict()
+    first.add_condition(EliteDangerousIsActive())
+    third.add_condition(LandingGearDown(negate=True))
+    assert [c['condition_type'] for c in first.to_dict()['conditions']] == ['voice_commander_elite.conditions.EliteDangerousIsActive']
+    assert not second.to_dict().get('conditions')
+    assert not before.get('conditions')
+    assert [c['condition_type'] for c in third.to_dict()['conditions']] == ['voice_commander_elite.conditions.LandingGearDown']
+    assert first.to_dict()['action_type'] == 'voice_commander_elite.actions.LandingGearToggleAction'
+    assert first.to_dict()['action_config'] == {}
+    assert action_class.wss().to_dict()['action_config'] == {'key': 'l'}
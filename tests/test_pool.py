@@ -0,0 +1,62 @@
+from voice_commander_elite.fake_ahk import RecordingAHK
+from voice_commander_elite.keybinds import Binding, BindingDevice, binding_to_press_action
+from voice_commander_elite.pool import AHKPool, ordering_key
+
+LATENCY = 0.2
+
+
+def make_pool():
+    backends = []
+
+    def factory():
+        backend = RecordingAHK(latency=LATENCY)
+        backends.append(backend)
+        return backend
+
+    return AHKPool(workers=2, factory=factory), backends
+
+
+def key_presses(backends):
+    """(start, key) of every key press, across all workers, in order of start."""
+    return sorted((call.timestamp, call.args[0]) for backend in backends for call in backend.calls if call.method == 'key_press')
+
+
+def press_actions():
+    gear = binding_to_press_action(Binding('LandingGearToggle', BindingDevice.KEYBOARD, 'Key_L'))
+    lights = binding_to_press_action(Binding('ShipSpotLightToggle', BindingDevice.KEYBOARD, 'Key_F'))
+    return gear(), lights()
+
+
+def test_different_actions_from_one_thread_overlap():
+    pool, backends = make_pool()
+    gear, lights = press_actions()
+    with pool.installed():
+        gear.perform()
+        lights.perform()
+        pool.drain()
+    (first_start, _), (second_start, _) = key_presses(backends)
+    assert second_start - first_start < LATENCY / 2
+
+
+def test_sends_of_one_action_stay_in_order():
+    pool, backends = make_pool()
+    gear, _ = press_actions()
+    with pool.installed():
+        gear.perform()
+        gear.perform()
+        pool.drain()
+    (first_start, _), (second_start, _) = key_presses(backends)
+    assert second_start - first_start >= LATENCY * 0.9
+
+
+def test_ordering_key_block_keeps_actions_in_order():
+    pool, backends = make_pool()
+    gear, lights = press_actions()
+    with pool.installed():
+        with ordering_key('trigger'):
+            gear.perform()
+            lights.perform()
+        pool.drain()
+    presses = key_presses(backends)
+    assert [key for _, key in presses] == ['l', 'f']
+    assert presses[1][0] - presses[0][0] >= LATENCY * 0.9
@@ -0,0 +1,44 @@
+import pytest
+
+from voice_commander_elite import actions
+from voice_commander_elite.conditions import EliteDangerousIsActive
+from voice_commander_elite.keybinds import Binding, BindingDevice, binding_to_press_action
+from voice_commander_elite.reload import BindingsWatcher, apply_bindings
+
+BINDS = '''<?xml version="1.0" encoding="UTF-8" ?>
+<Root PresetName="Custom" MajorVersion="4" MinorVersion="0">
+\t<LandingGearToggle>
+\t\t<Primary Device="Keyboard" Key="{key}" />
+\t\t<Secondary Device="{{NoDevice}}" Key="" />
+\t</LandingGearToggle>
+</Root>
+'''
+
+
+@pytest.fixture
+def restore_bindings():
+    original = dict(actions._found_bindings)
+    yield
+    apply_bindings(original)
+
+
+def test_rebind_keeps_instance_state(tmp_path, restore_bindings):
+    bindings_file = tmp_path / 'Custom.4.0.binds'
+    bindings_file.write_text(BINDS.format(key='Key_L'), encoding='utf-8')
+    action_class = binding_to_press_action(Binding('LandingGearToggle', BindingDevice.KEYBOARD, 'Key_L'))
+    action = action_class()
+    condition = EliteDangerousIsActive()
+    action.add_condition(condition)
+    action.note = 'kept'
+    serialized = action.to_dict()
+
+    watcher = BindingsWatcher(bindings_file)
+    assert watcher.reload()
+    bindings_file.write_text(BINDS.format(key='Key_G'), encoding='utf-8')
+    diff = watcher.reload()
+    assert diff and list(diff.changed) == ['LandingGearToggle']
+
+    assert action.key == action._bound_key == 'g'
+    assert action.note == 'kept'
+    assert action.to_dict() == serialized
+    assert [c['condition_type'] for c in action.to_dict()['conditions']] == [condition.fqn()]
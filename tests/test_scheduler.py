@@ -0,0 +1,100 @@
+import pytest
+
+from voice_commander_elite.scheduler import KeyScheduler
+
+
+class RecordingBackend:
+    def __init__(self, clock):
+        self.clock = clock
+        self.events = []
+
+    def key_down(self, key):
+        self.events.append((self.clock(), 'down', key))
+
+    def key_up(self, key):
+        self.events.append((self.clock(), 'up', key))
+
+    def key_press(self, key):
+        self.events.append((self.clock(), 'press', key))
+
+
+@pytest.fixture
+def backend(clock):
+    return RecordingBackend(clock)
+
+
+@pytest.fixture
+def scheduler(clock, backend):
+    return KeyScheduler(backend, clock=clock, threaded=False)
+
+
+def advance(scheduler, clock, until):
+    """Step the fake clock from one due event to the next, running them, up to ``until``."""
+    while True:
+        due = scheduler.next_due()
+        if due is None or due > until:
+            break
+        clock.now = max(clock.now, due)
+        scheduler.run_due()
+    clock.now = until
+
+
+def test_hold(scheduler, clock, backend):
+    job = scheduler.hold('w', 2.0)
+    assert backend.events == []
+    advance(scheduler, clock, 1.9)
+    assert backend.events == [(0.0, 'down', 'w')]
+    assert not job.done()
+    advance(scheduler, clock, 2.0)
+    assert backend.events == [(0.0, 'down', 'w'), (2.0, 'up', 'w')]
+    assert job.done() and not job.cancelled
+    assert scheduler.next_due() is None
+
+
+def test_repeat(scheduler, clock, backend):
+    job = scheduler.repeat('Numpad5', 3, 0.5)
+    advance(scheduler, clock, 10.0)
+    assert backend.events == [(0.0, 'press', 'Numpad5'), (0.5, 'press', 'Numpad5'), (1.0, 'press', 'Numpad5')]
+    assert job.done()
+
+
+def test_new_job_cancels_the_channel_and_releases_the_key(scheduler, clock, backend):
+    first = scheduler.hold('w', 5.0, channel='throttle')
+    advance(scheduler, clock, 1.0)
+    second = scheduler.hold('s', 1.0, channel='throttle')
+    assert first.cancelled
+    assert backend.events == [(0.0, 'down', 'w'), (1.0, 'up', 'w')]
+    advance(scheduler, clock, 10.0)
+    assert backend.events[2:] == [(1.0, 'down', 's'), (2.0, 'up', 's')]
+    assert second.done() and not second.cancelled
+
+
+def test_other_channels_are_independent(scheduler, clock, backend):
+    scheduler.hold('w', 2.0)
+    scheduler.repeat('e', 2, 1.0)
+    advance(scheduler, clock, 3.0)
+    assert sorted(backend.events) == [(0.0, 'down', 'w'), (0.0, 'press', 'e'), (1.0, 'press', 'e'), (2.0, 'up', 'w')]
+
+
+def test_cancel_channel(scheduler, clock, backend):
+    job = scheduler.repeat('e', 5, 1.0, channel='fire')
+    advance(scheduler, clock, 1.5)
+    assert scheduler.cancel('fire')
+    assert not scheduler.cancel('fire')
+    advance(scheduler, clock, 10.0)
+    assert backend.events == [(0.0, 'press', 'e'), (1.0, 'press', 'e')]
+    assert job.cancelled and job.done()
+    assert scheduler.pending() == []
+
+
+def test_cancel_before_the_key_is_down_sends_nothing(scheduler, clock, backend):
+    job = scheduler.hold('w', 1.0)
+    assert job.cancel()
+    advance(scheduler, clock, 2.0)
+    assert backend.events == []
+
+
+@pytest.mark.parametrize('method, args', [('hold', ('w', -1.0)), ('repeat', ('w', 0, 1.0)), ('repeat', ('w', 2, -1.0))])
+def test_invalid_arguments(scheduler, method, args):
+    with pytest.raises(ValueError):
+        getattr(scheduler, method)(*args)
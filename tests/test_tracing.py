@@ -0,0 +1,30 @@
+import pytest
+
+from voice_commander_elite.tracing import LatencyTracer, _percentile
+
+
+@pytest.mark.parametrize('n, fraction, expected', [
+    (100, 0.50, 50),
+    (100, 0.95, 95),
+    (100, 0.99, 99),
+    (20, 0.50, 10),
+    (20, 0.95, 19),
+    (20, 0.99, 20),
+    (1, 0.99, 1),
+    (3, 0.50, 2),
+])
+def test_nearest_rank_percentile(n, fraction, expected):
+    assert _percentile([float(i) for i in range(1, n + 1)], fraction) == expected
+
+
+def test_stats_percentiles():
+    tracer = LatencyTracer()
+    # durations of 1ms to 100ms, recorded out of order
+    for ms in reversed(range(1, 101)):
+        tracer.record('send', 'Supercruise', 0.0, ms / 1e3)
+    stats = tracer.stats()['send']['Supercruise']
+    assert stats['count'] == 100
+    assert stats['p50_ms'] == pytest.approx(50)
+    assert stats['p95_ms'] == pytest.approx(95)
+    assert stats['p99_ms'] == pytest.approx(99)
+    assert stats['max_ms'] == pytest.approx(100)
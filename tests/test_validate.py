@@ -0,0 +1,19 @@
+from voice_commander_elite.validate import iter_validate, validate_bindings_file
+
+
+def test_spawned_workers_do_not_load_the_bindings(synthetic_binds, tmp_path, monkeypatch, capfd):
+    # if a worker loaded the package's bindings, this missing file would make it print "Failed to read bindings!"
+    monkeypatch.setenv('VOICE_COMMANDER_ELITE_BINDINGS_FILE', str(tmp_path / 'missing.binds'))
+    paths = [str(path) for path in synthetic_binds.values()]
+    reports = {report.path: report for report in iter_validate(paths, jobs=2, start_method='spawn', timeout=60)}
+    assert sorted(reports) == sorted(paths)
+    for path, report in reports.items():
+        assert report.ok, report.error
+        assert report.resolved == validate_bindings_file(path).resolved
+    assert 'Failed to read bindings' not in capfd.readouterr().err
+
+
+def test_missing_file_is_reported(tmp_path):
+    [report] = iter_validate([tmp_path / 'missing.binds'], jobs=1)
+    assert not report.ok
+    assert 'FileNotFoundError' in report.error
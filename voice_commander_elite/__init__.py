@@ -1,4 +1,20 @@
+import sys
+
+# name prefix of the worker processes of voice_commander_elite.validate
+_VALIDATION_WORKER_PREFIX = 'voice-commander-elite-validate-'
+
+
+def _is_validation_worker():
+    # a spawned worker imports this package afresh; multiprocessing is always loaded by then, so don't import it here
+    multiprocessing = sys.modules.get('multiprocessing')
+    return multiprocessing is not None and multiprocessing.current_process().name.startswith(_VALIDATION_WORKER_PREFIX)
+
+
 def _initialize():
+    if _is_validation_worker():
+        # validation workers only parse the .binds files they are given; loading the user's bindings would be wasted
+        # (and report errors on machines without the game)
+        return
     import voice_commander_elite.actions
     import voice_commander.conditions
 
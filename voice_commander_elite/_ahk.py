@@ -0,0 +1,42 @@
+import functools
+import threading
+from concurrent.futures import Future
+from typing import Any
+
+_override: Any = None
+_override_lock = threading.Lock()
+
+
+@functools.cache
+def _default_ahk() -> Any:
+    from ahk import AHK
+    return AHK()
+
+
+def get_ahk() -> Any:
+    """The AHK instance shared by everything in this package that talks to AutoHotkey directly."""
+    override = _override
+    if override is not None:
+        return override
+    return _default_ahk()
+
+
+def completed(result: Any) -> Any:
+    """
+    The result of an AHK call, waiting for it first if the AHK instance returned a :class:`~concurrent.futures.Future`
+    (as :class:`~voice_commander_elite.pool.AHKPool` does for key sends). Re-raises the call's error.
+    """
+    if isinstance(result, Future):
+        return result.result()
+    return result
+
+
+def set_ahk(ahk: Any) -> None:
+    """
+    Send everything this package would send to AutoHotkey to ``ahk`` instead (e.g. a
+    :class:`~voice_commander_elite.fake_ahk.RecordingAHK`), including the presses of the Elite action classes.
+    ``None`` restores the real AutoHotkey.
+    """
+    global _override
+    with _override_lock:
+        _override = ahk
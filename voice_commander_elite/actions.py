@@ -1,37 +1,118 @@
 import sys
+from types import ModuleType
 from typing import Type, Any
 
 from voice_commander.actions import ActionBase
 
-from .keybinds import find_bindings_file, read_bound_actions, KEYBINDS, Binding, binding_to_press_action
+from .cache import load_bound_actions, fingerprint_bindings_file, BindingsFingerprint
+from . import instrumentation
+from .keybinds import find_bindings_file, Binding, binding_to_press_action, missing_binding_error, unresolved_reason
+from .table import BindingTable
 
 _found_bindings: dict[str, Binding] = {}
 
+# action name -> binding, for every binding an action class can be created for
+_available_bindings: dict[str, Binding] = {}
+
+# index of every known keybind name, bound or not
+_table = BindingTable(())
+
+# action classes are only created the first time they are accessed
 _all_actions: dict[str, Type[ActionBase]] = {}
 
+
+def _load_generated_module(fingerprint: BindingsFingerprint) -> ModuleType | None:
+    try:
+        from . import _generated_actions
+    except ImportError:
+        return None
+    except Exception as e:
+        print('Ignoring broken generated actions module', e, file=sys.stderr)
+        return None
+    generated = BindingsFingerprint(*_generated_actions.BINDINGS_FINGERPRINT)
+    # only the contents matter; touching or re-saving an identical file does not invalidate the generated module
+    if (generated.path, generated.size, generated.digest) != (fingerprint.path, fingerprint.size, fingerprint.digest):
+        return None
+    return _generated_actions
+
+
+def _record_skips(skipped: dict[str, list[str]]) -> None:
+    for reason, names in skipped.items():
+        for name in names:
+            instrumentation.record_skip(reason, name)
+
+
+def _load() -> None:
+    global _table
+    with instrumentation.span('discovery'):
+        bindings_file = find_bindings_file()
+    with instrumentation.span('read', path=str(bindings_file)):
+        fingerprint = fingerprint_bindings_file(bindings_file)
+    with instrumentation.span('load_generated_module'):
+        generated = _load_generated_module(fingerprint)
+    if generated is not None:
+        # classes pre-generated by ``python -m voice_commander_elite.codegen`` for this exact bindings file
+        _found_bindings.update({binding.name: binding for binding in generated.BINDINGS})
+        _table = BindingTable.from_bindings(_found_bindings)
+        _all_actions.update(generated.ACTIONS)
+        globals().update(generated.ACTIONS)
+        for name, action in generated.ACTIONS.items():
+            _available_bindings[name] = _found_bindings[action.binding_name]
+        _record_skips(getattr(generated, 'SKIPPED', {}))
+        for bindname, binding in _found_bindings.items():
+            if f'{bindname}Action' not in generated.ACTIONS:
+                instrumentation.record_skip(unresolved_reason(binding) or 'unresolved', bindname)
+        return
+    skipped: dict[str, list[str]] = {}
+    # a 'cache_load' span, or a 'parse' span if the bindings file had to be parsed
+    _found_bindings.update(load_bound_actions(bindings_file, fingerprint=fingerprint, skipped=skipped))
+    _record_skips(skipped)
+    with instrumentation.span('build_table'):
+        _table = BindingTable.from_bindings(_found_bindings)
+    for bindname, binding in _found_bindings.items():
+        if _table.ahk_key(bindname) is None:
+            reason = unresolved_reason(binding)
+            instrumentation.record_skip(reason or 'unresolved', bindname)
+            print(f'Error ignored: Failed to register binding for {bindname}', f'no AHK key for {binding.key!r} ({reason})', file=sys.stderr)
+            continue
+        _available_bindings[f'{bindname}Action'] = binding
+
+
 try:
-    _found_bindings.update(read_bound_actions(find_bindings_file()))
-    for _bindname, _binding in _found_bindings.items():
-        try:
-            _action = binding_to_press_action(_binding)
-        except Exception as exc:
-            print(f'Error ignored: Failed to register binding for {_bindname}', exc, file=sys.stderr)
-        name = f'{_bindname}Action'
-        _all_actions[name] = _action
+    with instrumentation.span('load_bindings'):
+        _load()
 except Exception as e:
+    instrumentation.record_error('Failed to read bindings!', e)
     print('Failed to read bindings!', e, file=sys.stderr)
 
+instrumentation.dump_if_requested()
+
+
+# For typing/intellisense support, generate static classes with ``python -m voice_commander_elite.codegen``
+__all__ = list(_available_bindings)
+
+
+def _create_action(name: str) -> Type[ActionBase]:
+    with instrumentation.span('class_generation', action=name):
+        action = binding_to_press_action(_available_bindings[name])
+    # setdefault so concurrent first accesses still agree on a single class
+    action = _all_actions.setdefault(name, action)
+    globals()[name] = action
+    return action
 
-# TODO: don't do this dynamically so users can take advantage of typing/intellisense. Maybe codegen all classes?
-globals().update(_all_actions)
-__all__ = list(_all_actions)
 
 def __getattr__(name: str) -> Any:
-    if name in _all_actions:
-        return _all_actions[name]
+    if name in _available_bindings:
+        if name in _all_actions:
+            return _all_actions[name]
+        return _create_action(name)
     if not name.endswith('Action'):
         raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
     bindname = name.removesuffix('Action')
-    if bindname in KEYBINDS:
-        raise RuntimeError(f'Did not find valid mouse button or keyboard key binding for {bindname!r} in your Elite Dangerous custom keybinds. Please make sure either the primary or secondary binding is set to a mouse button or keyboard key in your Elite Dangerous controls settings')
+    if bindname in _table:
+        raise missing_binding_error(bindname)
     raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
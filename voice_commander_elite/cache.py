@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import NamedTuple, Any
+
+from . import instrumentation
+from .keybinds import Binding, BindingDevice, read_bound_actions
+
+CACHE_DIR_ENV = 'VOICE_COMMANDER_ELITE_CACHE_DIR'
+NO_CACHE_ENV = 'VOICE_COMMANDER_ELITE_NO_CACHE'
+
+_CACHE_FORMAT_VERSION = 2
+
+
+class BindingsFingerprint(NamedTuple):
+    path: str
+    mtime_ns: int
+    size: int
+    digest: str
+
+
+def fingerprint_bindings_file(bindings_file: str | Path) -> BindingsFingerprint:
+    fp = Path(bindings_file).absolute()
+    st = os.stat(fp)
+    with open(fp, 'rb') as f:
+        digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    return BindingsFingerprint(path=str(fp), mtime_ns=st.st_mtime_ns, size=st.st_size, digest=digest)
+
+
+def default_cache_dir() -> Path:
+    if CACHE_DIR_ENV in os.environ:
+        return Path(os.environ[CACHE_DIR_ENV])
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA', os.path.expanduser('~/AppData/Local'))
+        return Path(base) / 'voice-commander-elite' / 'Cache'
+    base = os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache'))
+    return Path(base) / 'voice-commander-elite'
+
+
+def cache_enabled() -> bool:
+    return os.environ.get(NO_CACHE_ENV, '') in ('', '0')
+
+
+def _cache_file_for(bindings_path: str, cache_dir: Path) -> Path:
+    name = hashlib.sha1(bindings_path.encode('utf-8')).hexdigest()[:16]
+    return cache_dir / f'bindings-{name}.json'
+
+
+def _load_entry(
+    cache_file: Path,
+    fingerprint: BindingsFingerprint,
+    skipped: dict[str, list[str]] | None = None,
+) -> dict[str, Binding] | None:
+    try:
+        with open(cache_file, 'rb') as f:
+            entry = json.load(f)
+        if entry['version'] != _CACHE_FORMAT_VERSION:
+            return None
+        if BindingsFingerprint(*entry['fingerprint']) != fingerprint:
+            return None
+        bindings = {name: Binding(name=name, device=BindingDevice(device), key=key) for name, device, key in entry['bindings']}
+        if skipped is not None:
+            for reason, names in entry['skipped'].items():
+                skipped.setdefault(reason, []).extend(names)
+        return bindings
+    except (OSError, ValueError, KeyError, TypeError):
+        # missing, stale or corrupt entry: the caller falls back to a full parse
+        return None
+
+
+def _store_entry(
+    cache_file: Path,
+    fingerprint: BindingsFingerprint,
+    bindings: dict[str, Binding],
+    skipped: dict[str, list[str]],
+) -> None:
+    entry: dict[str, Any] = {
+        'version': _CACHE_FORMAT_VERSION,
+        'fingerprint': list(fingerprint),
+        'bindings': [[b.name, int(b.device), b.key] for b in bindings.values()],
+        'skipped': skipped,
+    }
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=cache_file.parent, prefix=cache_file.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, separators=(',', ':'))
+        os.replace(tmp, cache_file)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load_bound_actions(
+    bindings_file: str | Path,
+    *,
+    use_cache: bool | None = None,
+    cache_dir: str | Path | None = None,
+    fingerprint: BindingsFingerprint | None = None,
+    skipped: dict[str, list[str]] | None = None,
+) -> dict[str, Binding]:
+    """
+    Like :func:`~voice_commander_elite.keybinds.read_bound_actions`, but served from the on-disk cache when the
+    bindings file is unchanged since it was last parsed. The reasons bindings were ``skipped`` are cached too.
+
+    The cache is bypassed when ``use_cache`` is False or, if ``use_cache`` is not given,
+    when the ``VOICE_COMMANDER_ELITE_NO_CACHE`` environment variable is set.
+    A ``fingerprint`` of the bindings file that the caller already computed may be passed to avoid hashing it twice.
+    """
+    if use_cache is None:
+        use_cache = cache_enabled()
+    if not use_cache:
+        with instrumentation.span('parse'):
+            return read_bound_actions(bindings_file, skipped)
+    if fingerprint is None:
+        fingerprint = fingerprint_bindings_file(bindings_file)
+    cache_file = _cache_file_for(fingerprint.path, Path(cache_dir) if cache_dir is not None else default_cache_dir())
+    with instrumentation.span('cache_load'):
+        bindings = _load_entry(cache_file, fingerprint, skipped)
+    if bindings is not None:
+        return bindings
+    parse_skipped: dict[str, list[str]] = {}
+    with instrumentation.span('parse'):
+        bindings = read_bound_actions(bindings_file, parse_skipped)
+    if skipped is not None:
+        for reason, names in parse_skipped.items():
+            skipped.setdefault(reason, []).extend(names)
+    try:
+        _store_entry(cache_file, fingerprint, bindings, parse_skipped)
+    except OSError as e:
+        print('Failed to write bindings cache', e, file=sys.stderr)
+    return bindings
+
+
+def clear_cache(cache_dir: str | Path | None = None) -> None:
+    cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    for cache_file in cache_dir.glob('bindings-*.json'):
+        try:
+            cache_file.unlink()
+        except FileNotFoundError:
+            pass
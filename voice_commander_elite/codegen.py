@@ -0,0 +1,143 @@
+"""
+Generate a static actions module from an Elite Dangerous bindings file.
+
+The generated module contains one concrete class per bound keybind with its AHK key baked in, along with the
+fingerprint of the bindings file it was generated from. When the fingerprint still matches the bindings file,
+:mod:`voice_commander_elite.actions` imports the generated classes instead of parsing the bindings file.
+
+Usage::
+
+    python -m voice_commander_elite.codegen [--bindings-file PATH] [--output-dir DIR]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+from .cache import BindingsFingerprint, fingerprint_bindings_file, load_bound_actions
+from .keybinds import Binding, find_bindings_file, resolve_ahk_key
+
+GENERATED_MODULE_NAME = '_generated_actions'
+
+_PACKAGE_DIR = Path(__file__).parent
+
+_HEADER = '# This file was generated by voice_commander_elite.codegen -- do not edit.\n'
+
+
+def _resolvable(bindings: dict[str, Binding]) -> dict[str, tuple[Binding, str]]:
+    resolved = {}
+    for name, binding in bindings.items():
+        try:
+            ahk_key = resolve_ahk_key(binding)
+        except Exception:
+            continue
+        resolved[name] = (binding, ahk_key)
+    return resolved
+
+
+def render_module(fingerprint: BindingsFingerprint, bindings: dict[str, Binding], skipped: dict[str, list[str]] | None = None) -> str:
+    resolved = _resolvable(bindings)
+    lines = [
+        _HEADER,
+        'from .keybinds import Binding, BindingDevice, ElitePressAction',
+        '',
+        f'BINDINGS_FINGERPRINT = {tuple(fingerprint)!r}',
+        '',
+        '# bindings that were skipped while parsing, by reason (e.g. only bound to a joystick)',
+        f'SKIPPED = {skipped or {}!r}',
+        '',
+        'BINDINGS = [',
+    ]
+    for binding in bindings.values():
+        lines.append(f'    Binding(name={binding.name!r}, device=BindingDevice.{binding.device.name}, key={binding.key!r}),')
+    lines.append(']')
+    for name, (binding, ahk_key) in resolved.items():
+        lines.extend([
+            '',
+            '',
+            f'class {name}Action(ElitePressAction):',
+            f'    binding_name = {name!r}',
+            f'    ahk_key = {ahk_key!r}',
+        ])
+    lines.extend(['', '', 'ACTIONS = {'])
+    for name in resolved:
+        lines.append(f'    {name + "Action"!r}: {name}Action,')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def render_stub(bindings: dict[str, Binding]) -> str:
+    resolved = _resolvable(bindings)
+    lines = [
+        _HEADER,
+        'from .keybinds import Binding, ElitePressAction',
+        '',
+        'BINDINGS_FINGERPRINT: tuple[str, int, int, str]',
+        'SKIPPED: dict[str, list[str]]',
+        'BINDINGS: list[Binding]',
+        '',
+    ]
+    for name in resolved:
+        lines.append(f'class {name}Action(ElitePressAction): ...')
+    lines.extend(['', 'ACTIONS: dict[str, type[ElitePressAction]]'])
+    return '\n'.join(lines) + '\n'
+
+
+def render_actions_stub() -> str:
+    return '\n'.join([
+        _HEADER,
+        'from typing import Any',
+        '',
+        f'from .{GENERATED_MODULE_NAME} import *',
+        '',
+        'def __getattr__(name: str) -> Any: ...',
+    ]) + '\n'
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def generate_actions_module(bindings_file: str | Path | None = None, output_dir: str | Path | None = None) -> Path:
+    """
+    Write the generated actions module (and its ``.pyi`` stubs) for ``bindings_file``.
+
+    :param bindings_file: the bindings file to generate from. Defaults to :func:`~voice_commander_elite.keybinds.find_bindings_file`
+    :param output_dir: where to write the module. Defaults to the ``voice_commander_elite`` package directory, where it is picked up by :mod:`voice_commander_elite.actions`
+    :return: the path of the generated module
+    """
+    if bindings_file is None:
+        bindings_file = find_bindings_file()
+    out = Path(output_dir) if output_dir is not None else _PACKAGE_DIR
+    fingerprint = fingerprint_bindings_file(bindings_file)
+    skipped: dict[str, list[str]] = {}
+    bindings = load_bound_actions(bindings_file, fingerprint=fingerprint, skipped=skipped)
+    module_path = out / f'{GENERATED_MODULE_NAME}.py'
+    _write_atomic(module_path, render_module(fingerprint, bindings, skipped))
+    _write_atomic(out / f'{GENERATED_MODULE_NAME}.pyi', render_stub(bindings))
+    if out.resolve() == _PACKAGE_DIR.resolve():
+        _write_atomic(out / 'actions.pyi', render_actions_stub())
+    return module_path
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m voice_commander_elite.codegen', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-b', '--bindings-file', default=None, help='Elite Dangerous .binds file (defaults to your latest custom bindings file)')
+    parser.add_argument('-o', '--output-dir', default=None, help='directory to write the generated module to (defaults to the package directory)')
+    args = parser.parse_args(argv)
+    module_path = generate_actions_module(args.bindings_file, args.output_dir)
+    print(f'Wrote {module_path}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
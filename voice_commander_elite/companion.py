@@ -0,0 +1,379 @@
+"""
+Reading the companion JSON files Elite Dangerous writes next to ``Status.json``: ``NavRoute.json``, ``Cargo.json``,
+``ModulesInfo.json`` and ``Backpack.json``.
+
+Like :class:`~voice_commander_elite.status.StatusReader`, each file is only re-read and decoded when its mtime or size
+has changed. Snapshots are immutable (mappings are read-only, lists become tuples), so conditions can query them freely::
+
+    files = get_companion_files()
+    if files.nav_route().jumps_remaining(files.current_system()) > 0 and not files.cargo().is_empty:
+        ...
+
+The game does not rewrite ``NavRoute.json`` as you travel. A :class:`CurrentSystemFollower` follows the journal in the
+same directory on a background thread and publishes the system the ship is in; :meth:`CompanionFiles.current_system`
+only reads the published value, so conditions never touch the journal.
+
+:meth:`CompanionFiles.wait_for_change` waits until a file (or one field of it) changes. Point a :class:`CompanionFiles`
+at any directory to use fixture files instead of the game's.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
+
+from .journal import JournalTailer
+from .journal_index import JournalIndex
+from .status import CachedJsonFile, find_journal_dir
+
+NAV_ROUTE = 'NavRoute'
+CARGO = 'Cargo'
+MODULES_INFO = 'ModulesInfo'
+BACKPACK = 'Backpack'
+
+# journal events that tell which star system the ship is in
+_LOCATION_EVENTS = frozenset({'Location', 'FSDJump', 'CarrierJump'})
+
+
+def freeze(value: Any) -> Any:
+    """A read-only copy of decoded JSON: dicts become read-only mappings and lists become tuples."""
+    if type(value) is dict:
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if type(value) is list:
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+class CompanionSnapshot:
+    """Immutable, decoded contents of one version of a companion file. ``data`` is empty until the file was first read."""
+    __slots__ = ('data', 'timestamp')
+
+    def __init__(self, data: Mapping[str, Any]):
+        self.data: Mapping[str, Any] = freeze(dict(data))
+        self.timestamp: str | None = data.get('timestamp')
+
+    def get(self, *path: str | int, default: Any = None) -> Any:
+        """The value at ``path`` (keys and list indexes), e.g. ``snapshot.get('Inventory', 0, 'Name')``, or ``default``."""
+        value: Any = self.data
+        for part in path:
+            try:
+                value = value[part]
+            except (KeyError, IndexError, TypeError):
+                return default
+        return value
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(timestamp={self.timestamp!r})'
+
+
+class NavRouteSnapshot(CompanionSnapshot):
+    """``NavRoute.json``: the route plotted in the galaxy map, starting with the system it was plotted from."""
+    __slots__ = ()
+
+    @property
+    def route(self) -> tuple[str, ...]:
+        """The star systems of the route, in order."""
+        return tuple(hop.get('StarSystem', '') for hop in self.get('Route', default=()))
+
+    def jumps_remaining(self, current_system: str | None = None) -> int:
+        """
+        Jumps left on the route. The game does not rewrite the file as you travel, so pass ``current_system`` to count
+        from there; otherwise this counts from the start of the route. ``0`` when no route is plotted.
+        """
+        route = self.route
+        if not route:
+            return 0
+        if current_system is None or current_system not in route:
+            return len(route) - 1
+        return len(route) - 1 - route.index(current_system)
+
+
+class CargoSnapshot(CompanionSnapshot):
+    """``Cargo.json``: the cargo of the ship (or SRV, see ``vessel``)."""
+    __slots__ = ()
+
+    @property
+    def vessel(self) -> str | None:
+        return self.get('Vessel')
+
+    @property
+    def count(self) -> int:
+        """Total number of units of cargo."""
+        count = self.get('Count')
+        if count is None:
+            return sum(self.inventory.values())
+        return count
+
+    @property
+    def is_empty(self) -> bool:
+        return self.count == 0
+
+    @property
+    def inventory(self) -> dict[str, int]:
+        """Commodity name -> number of units."""
+        inventory: dict[str, int] = {}
+        for item in self.get('Inventory', default=()):
+            name = item.get('Name', '')
+            inventory[name] = inventory.get(name, 0) + item.get('Count', 0)
+        return inventory
+
+
+class ModulesInfoSnapshot(CompanionSnapshot):
+    """``ModulesInfo.json``: the ship's modules, with their power draw and priority."""
+    __slots__ = ()
+
+    @property
+    def modules(self) -> tuple[Mapping[str, Any], ...]:
+        return self.get('Modules', default=())
+
+    def module_in(self, slot: str) -> Mapping[str, Any] | None:
+        """The module fitted in ``slot`` (e.g. ``'FrameShiftDrive'``), or ``None``."""
+        for module in self.modules:
+            if module.get('Slot') == slot:
+                return module
+        return None
+
+
+class BackpackSnapshot(CompanionSnapshot):
+    """``Backpack.json``: what the commander carries on foot."""
+    __slots__ = ()
+
+    #: the item categories of the backpack
+    CATEGORIES = ('Items', 'Components', 'Consumables', 'Data')
+
+    def count(self, name: str) -> int:
+        """Number of ``name`` (e.g. ``'healthpack'``) carried, in any category."""
+        return sum(
+            item.get('Count', 0)
+            for category in self.CATEGORIES
+            for item in self.get(category, default=())
+            if item.get('Name') == name
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return not any(self.get(category) for category in self.CATEGORIES)
+
+
+SNAPSHOT_TYPES: dict[str, type[CompanionSnapshot]] = {
+    NAV_ROUTE: NavRouteSnapshot,
+    CARGO: CargoSnapshot,
+    MODULES_INFO: ModulesInfoSnapshot,
+    BACKPACK: BackpackSnapshot,
+}
+
+
+class CompanionFileReader(CachedJsonFile[CompanionSnapshot]):
+    """
+    Cached reader of one companion file.
+
+    :param name: which file, e.g. ``'Cargo'`` (see :data:`SNAPSHOT_TYPES`)
+    :param path: the file. Defaults to ``<name>.json`` in :func:`~voice_commander_elite.status.find_journal_dir`
+    """
+    def __init__(self, name: str, path: str | Path | None = None, *, min_interval: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        if name not in SNAPSHOT_TYPES:
+            raise ValueError(f'unknown companion file {name!r} (expected one of {", ".join(SNAPSHOT_TYPES)})')
+        self.name = name
+        self._snapshot_type = SNAPSHOT_TYPES[name]
+        self.empty = self._snapshot_type({})
+        super().__init__(path if path is not None else find_journal_dir() / f'{name}.json', min_interval=min_interval, clock=clock)
+
+    def _decode(self, data: dict[str, Any]) -> CompanionSnapshot:
+        return self._snapshot_type(data)
+
+
+class CurrentSystemFollower:
+    """
+    Publishes the star system the ship is in, as :attr:`system`, from the latest ``Location``, ``FSDJump`` or
+    ``CarrierJump`` event of the journal.
+
+    :meth:`start` runs it on a background thread: the value is seeded from the
+    :class:`~voice_commander_elite.journal_index.JournalIndex` of the directory (rather than by replaying the current
+    journal), then kept up to date by tailing the newest journal. Reading :attr:`system` never does any I/O.
+
+    :param journal_dir: the journal directory
+    :param poll_interval: seconds between checks of the journal for new lines
+    :param index_dir: where the journal index is stored. Defaults to :func:`~voice_commander_elite.journal_index.default_index_dir`
+    """
+    def __init__(self, journal_dir: str | Path, *, poll_interval: float = 0.5, index_dir: str | Path | None = None):
+        self.journal_dir = Path(journal_dir)
+        self.poll_interval = poll_interval
+        self.index_dir = index_dir
+        #: the current star system, or ``None`` until it is known
+        self.system: str | None = None
+        self._tailer = JournalTailer(self.journal_dir, from_start=False)
+        self._seeded = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def seed(self) -> None:
+        """Take the system from the journal index, and start tailing the newest journal from its current end."""
+        with self._lock:
+            if self._seeded:
+                return
+            self._seeded = True
+            # open the newest journal at its end first: whatever is written while the index updates is then read by poll()
+            self._tailer.read_new()
+            try:
+                index = JournalIndex(self.journal_dir, index_dir=self.index_dir)
+                index.update()
+                location = index.latest(*_LOCATION_EVENTS)
+            except Exception as e:
+                print('Error ignored: could not recover the current system from the journal index', e, file=sys.stderr)
+                return
+            if location is not None and self.system is None:
+                self.system = location.get('StarSystem')
+
+    def poll(self) -> str | None:
+        """Read the journal lines written since the last poll and return the (possibly updated) system."""
+        self.seed()
+        with self._lock:
+            for event in self._tailer.read_new():
+                if event.get('event') in _LOCATION_EVENTS and 'StarSystem' in event:
+                    self.system = event['StarSystem']
+            return self.system
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='voice-commander-elite-current-system', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        self._stop.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                print('Error ignored: failed to follow the journal', e, file=sys.stderr)
+            self._stop.wait(self.poll_interval)
+
+
+class CompanionFiles:
+    """
+    Cached readers of all companion files in one directory.
+
+    :param directory: where the files are. Defaults to :func:`~voice_commander_elite.status.find_journal_dir`
+    :param min_interval: seconds during which a snapshot is reused without even checking the file's mtime
+    :param clock: monotonic clock, in seconds
+    :param sleep: how :meth:`wait_for_change` waits between checks; replace it together with ``clock``
+    """
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        *,
+        min_interval: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Any] = time.sleep,
+    ):
+        self.directory = Path(directory) if directory is not None else find_journal_dir()
+        self._clock = clock
+        self._sleep = sleep
+        self.location = CurrentSystemFollower(self.directory)
+        self._readers = {
+            name: CompanionFileReader(name, self.directory / f'{name}.json', min_interval=min_interval, clock=clock)
+            for name in SNAPSHOT_TYPES
+        }
+
+    def snapshot(self, name: str) -> CompanionSnapshot:
+        """The current contents of the companion file ``name``. Only reads the file if it changed since the last call."""
+        try:
+            reader = self._readers[name]
+        except KeyError:
+            raise ValueError(f'unknown companion file {name!r} (expected one of {", ".join(SNAPSHOT_TYPES)})') from None
+        return reader.snapshot()
+
+    def nav_route(self) -> NavRouteSnapshot:
+        return self._readers[NAV_ROUTE].snapshot()  # type: ignore[return-value]
+
+    def cargo(self) -> CargoSnapshot:
+        return self._readers[CARGO].snapshot()  # type: ignore[return-value]
+
+    def modules_info(self) -> ModulesInfoSnapshot:
+        return self._readers[MODULES_INFO].snapshot()  # type: ignore[return-value]
+
+    def backpack(self) -> BackpackSnapshot:
+        return self._readers[BACKPACK].snapshot()  # type: ignore[return-value]
+
+    def current_system(self) -> str | None:
+        """
+        The star system the ship is in, as last published by :attr:`location` (see :class:`CurrentSystemFollower`), or
+        ``None`` if it is not known yet. The follower is started on first use; this never reads the journal itself.
+        """
+        location = self.location
+        if location._thread is None:
+            location.start()
+        return location.system
+
+    def close(self) -> None:
+        """Stop following the journal."""
+        self.location.stop()
+
+    def wait_for_change(
+        self,
+        name: str,
+        field: Callable[[Any], Any] | tuple[str | int, ...] | str | None = None,
+        *,
+        timeout: float | None = None,
+        poll_interval: float = 0.1,
+    ) -> CompanionSnapshot | None:
+        """
+        Wait until the companion file ``name`` changes and return the new snapshot, or ``None`` on timeout.
+
+        :param field: only return once this changes: a key, a path for :meth:`CompanionSnapshot.get`, or a function of the
+            snapshot (e.g. ``lambda cargo: cargo.count``). By default any new version of the file counts.
+        :param poll_interval: seconds between checks. The file is only re-read when it has changed.
+        """
+        if field is None:
+            def value(snapshot: CompanionSnapshot) -> Any:
+                return snapshot
+        elif callable(field):
+            value = field
+        else:
+            path = (field,) if isinstance(field, str) else tuple(field)
+
+            def value(snapshot: CompanionSnapshot) -> Any:
+                return snapshot.get(*path)
+
+        deadline = None if timeout is None else self._clock() + timeout
+        initial = value(self.snapshot(name))
+        while True:
+            snapshot = self.snapshot(name)
+            current = value(snapshot)
+            if current != initial:
+                return snapshot
+            if deadline is not None and self._clock() >= deadline:
+                return None
+            self._sleep(poll_interval)
+
+
+_files: CompanionFiles | None = None
+_files_lock = threading.Lock()
+
+
+def get_companion_files() -> CompanionFiles:
+    global _files
+    if _files is None:
+        with _files_lock:
+            if _files is None:
+                _files = CompanionFiles()
+    return _files
+
+
+def set_companion_files(files: CompanionFiles | None) -> None:
+    """Replace the shared readers (e.g. with ones for a fixture directory). ``None`` restores the default."""
+    global _files
+    with _files_lock:
+        _files = files
@@ -0,0 +1,209 @@
+"""
+Compiled profiles: a profile JSON with the AHK keys of its Elite actions baked in.
+
+Your ``.vcp.json`` profile stays the source of truth. Compiling it replaces every keybind action
+(``voice_commander_elite.actions.<Name>Action``) and ``EliteDangerousIsActive`` condition with the plain
+``voice-commander`` action/condition it stands for (like ``.wss()`` does), and records fingerprints of the profile and
+of the bindings file it was compiled against. :func:`ensure_compiled_profile` checks those fingerprints (without parsing
+the bindings file) and only recompiles when either file has changed::
+
+    from voice_commander.profile import load_profile
+    from voice_commander_elite.compiled_profiles import ensure_compiled_profile
+
+    profile = load_profile(ensure_compiled_profile('elite.vcp.json'))
+
+Other Elite types (macros, holds, status conditions, ...) have no plain equivalent and are kept as they are.
+
+Usage::
+
+    python -m voice_commander_elite.compiled_profiles PROFILE [--output PATH] [--force]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from voice_commander.actions import AHKPressAction
+
+from .cache import BindingsFingerprint, default_cache_dir, fingerprint_bindings_file, load_bound_actions
+from .keybinds import find_bindings_file
+from .table import BindingTable
+
+_COMPILED_FORMAT_VERSION = 1
+
+#: top-level key of a compiled profile holding what it was compiled from
+COMPILED_FROM_KEY = 'compiled_from'
+
+_ACTIONS_PREFIX = 'voice_commander_elite.actions.'
+_IS_ACTIVE_TYPE = 'voice_commander_elite.conditions.EliteDangerousIsActive'
+
+
+def _fingerprint_file(path: str | Path) -> BindingsFingerprint:
+    # same shape (and hash) as the bindings fingerprint, used for the profile too
+    return fingerprint_bindings_file(path)
+
+
+def _is_current(recorded: list[Any] | None, path: str | Path) -> bool:
+    """Whether ``path`` still has the contents ``recorded``. Only hashes the file if its mtime or size changed."""
+    if not recorded:
+        return False
+    recorded_fingerprint = BindingsFingerprint(*recorded)
+    path = str(Path(path).absolute())
+    if recorded_fingerprint.path != path:
+        return False
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    if (st.st_mtime_ns, st.st_size) == (recorded_fingerprint.mtime_ns, recorded_fingerprint.size):
+        return True
+    if st.st_size != recorded_fingerprint.size:
+        return False
+    return _fingerprint_file(path).digest == recorded_fingerprint.digest
+
+
+def default_output_path(profile_path: str | Path) -> Path:
+    """Where the compiled form of ``profile_path`` is kept by default: in the bindings cache directory."""
+    profile_path = Path(profile_path).absolute()
+    name = hashlib.sha1(str(profile_path).encode('utf-8')).hexdigest()[:16]
+    stem = profile_path.name.removesuffix('.json').removesuffix('.vcp')
+    return default_cache_dir() / 'profiles' / f'{stem}-{name}.vcp.json'
+
+
+def _compile_action(action: dict[str, Any], table: BindingTable) -> dict[str, Any]:
+    action_type = action.get('action_type', '')
+    if action_type.startswith(_ACTIONS_PREFIX) and action_type.endswith('Action') and not action.get('action_config'):
+        binding_name = action_type.removeprefix(_ACTIONS_PREFIX).removesuffix('Action')
+        ahk_key = table.ahk_key(binding_name)
+        if ahk_key is None:
+            raise ValueError(f'{binding_name!r} has no mouse button or keyboard key binding in the bindings file')
+        compiled = AHKPressAction(key=ahk_key).to_dict()
+    else:
+        compiled = dict(action)
+    if action.get('conditions'):
+        compiled['conditions'] = [_compile_condition(condition) for condition in action['conditions']]
+    return compiled
+
+
+def _compile_condition(condition: dict[str, Any]) -> dict[str, Any]:
+    from .conditions import EliteDangerousIsActive
+
+    if condition.get('condition_type') == _IS_ACTIVE_TYPE and not condition.get('condition_config'):
+        return EliteDangerousIsActive.wss().to_dict()
+    return dict(condition)
+
+
+def load_binding_table(bindings_file: str | Path, *, fingerprint: BindingsFingerprint | None = None) -> BindingTable:
+    """A table of the bindings in ``bindings_file``, independent of the bindings the running process uses."""
+    return BindingTable.from_bindings(load_bound_actions(bindings_file, fingerprint=fingerprint))
+
+
+def compile_profile(profile: dict[str, Any], table: BindingTable | None = None) -> dict[str, Any]:
+    """
+    Bake the AHK keys of ``table`` (by default: of your latest custom bindings file) into a serialized profile.
+    Neither the input nor the bindings of the running process are modified.
+    """
+    if table is None:
+        table = load_binding_table(find_bindings_file())
+    compiled = dict(profile)
+    configuration = dict(profile['configuration'])
+    configuration['triggers'] = [
+        dict(
+            trigger,
+            actions=[_compile_action(action, table) for action in trigger.get('actions', [])],
+            conditions=[_compile_condition(condition) for condition in trigger.get('conditions', [])],
+        )
+        for trigger in configuration.get('triggers', [])
+    ]
+    compiled['configuration'] = configuration
+    return compiled
+
+
+def build_compiled_profile(
+    profile_path: str | Path,
+    output: str | Path | None = None,
+    *,
+    bindings_file: str | Path | None = None,
+) -> Path:
+    """Compile the profile at ``profile_path`` and write the result to ``output`` (see :func:`default_output_path`)."""
+    profile_path = Path(profile_path)
+    output = Path(output) if output is not None else default_output_path(profile_path)
+    bindings_file = Path(bindings_file) if bindings_file is not None else find_bindings_file()
+    bindings_fingerprint = fingerprint_bindings_file(bindings_file)
+    profile_fingerprint = _fingerprint_file(profile_path)
+    with open(profile_path, encoding='utf-8') as f:
+        profile = json.load(f)
+    compiled = compile_profile(profile, load_binding_table(bindings_file, fingerprint=bindings_fingerprint))
+    compiled[COMPILED_FROM_KEY] = {
+        'version': _COMPILED_FORMAT_VERSION,
+        'profile': list(profile_fingerprint),
+        'bindings': list(bindings_fingerprint),
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=output.parent, prefix=output.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(compiled, f, indent=2)
+        os.replace(tmp, output)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return output
+
+
+def is_compiled_profile_current(
+    profile_path: str | Path,
+    output: str | Path | None = None,
+    *,
+    bindings_file: str | Path | None = None,
+) -> bool:
+    """Whether the compiled profile exists and was compiled from the current profile and bindings file."""
+    output = Path(output) if output is not None else default_output_path(profile_path)
+    try:
+        with open(output, 'rb') as f:
+            compiled_from = json.load(f)[COMPILED_FROM_KEY]
+        if compiled_from['version'] != _COMPILED_FORMAT_VERSION:
+            return False
+        bindings_file = bindings_file if bindings_file is not None else find_bindings_file()
+        return _is_current(compiled_from['profile'], profile_path) and _is_current(compiled_from['bindings'], bindings_file)
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+
+
+def ensure_compiled_profile(
+    profile_path: str | Path,
+    output: str | Path | None = None,
+    *,
+    bindings_file: str | Path | None = None,
+) -> Path:
+    """The path of an up-to-date compiled form of ``profile_path``, (re)compiling it first if needed."""
+    output = Path(output) if output is not None else default_output_path(profile_path)
+    if is_compiled_profile_current(profile_path, output, bindings_file=bindings_file):
+        return output
+    return build_compiled_profile(profile_path, output, bindings_file=bindings_file)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m voice_commander_elite.compiled_profiles', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('profile', help='profile JSON file')
+    parser.add_argument('-o', '--output', default=None, help='where to write the compiled profile (defaults to the cache directory)')
+    parser.add_argument('-b', '--bindings-file', default=None, help='Elite Dangerous .binds file (defaults to your latest custom bindings file)')
+    parser.add_argument('-f', '--force', action='store_true', help='compile even if the compiled profile is up to date')
+    args = parser.parse_args(argv)
+
+    if args.force:
+        output = build_compiled_profile(args.profile, args.output, bindings_file=args.bindings_file)
+    else:
+        output = ensure_compiled_profile(args.profile, args.output, bindings_file=args.bindings_file)
+    print(output, file=sys.stdout)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,14 +1,30 @@
+import time
 from typing import Any, Self
 
 from voice_commander.conditions import ConditionBase, AHKWindowIsActive
 
+from . import tracing as _tracing
+from .companion import get_companion_files
+from .status import StatusFlags, get_status_reader
+from .window import ELITE_WINDOW_TITLE, get_foreground_tracker
+
 class EliteDangerousIsActive(AHKWindowIsActive):
     def __init__(self, **kwargs):
         simplified_serialization = kwargs.pop('_simplified_serialization', False)
         self._simplified_serialization = simplified_serialization
-        super().__init__(title='Elite - Dangerous (CLIENT)', **kwargs)
+        super().__init__(title=ELITE_WINDOW_TITLE, **kwargs)
+
+    def check(self, *args: Any, **kwargs: Any) -> bool:
+        # answered by the tracker shared by all instances, instead of a window query per check
+        if not _tracing._enabled:
+            return get_foreground_tracker().is_elite_active()
+        start = time.perf_counter()
+        result = get_foreground_tracker().is_elite_active()
+        _tracing._tracer.record_condition(type(self).__name__, start, time.perf_counter(), result)
+        return result
 
     def to_dict(self) -> dict[str, Any]:
+        # built from the instance on every call, since conditions can be added to an instance after it was created
         d = super().to_dict()
         if self._simplified_serialization:
             d['condition_type'] = AHKWindowIsActive.fqn()
@@ -21,3 +37,137 @@ class EliteDangerousIsActive(AHKWindowIsActive):
         return cls(_simplified_serialization=True, **kwargs)
 
     wss = with_simplified_serialization
+
+
+class StatusFlagIsSet(ConditionBase):
+    """
+    True when a flag in Elite's ``Status.json`` is set, e.g. ``StatusFlagIsSet('LANDING_GEAR_DOWN')``.
+
+    Pass ``negate=True`` to check that the flag is *not* set.
+    """
+    def __init__(self, flag: StatusFlags | str, *, negate: bool = False, **kwargs):
+        self.flag = flag if isinstance(flag, StatusFlags) else StatusFlags[flag]
+        self.negate = negate
+        super().__init__(**kwargs)
+
+    def check(self, *args: Any, **kwargs: Any) -> bool:
+        if not _tracing._enabled:
+            return (self.flag in get_status_reader().snapshot().flags) != self.negate
+        start = time.perf_counter()
+        result = (self.flag in get_status_reader().snapshot().flags) != self.negate
+        _tracing._tracer.record_condition(f'{type(self).__name__}[{self.flag.name}]', start, time.perf_counter(), result)
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        config: dict[str, Any] = {'flag': self.flag.name}
+        if self.negate:
+            config['negate'] = True
+        return {'condition_type': self.fqn(), 'condition_config': config}
+
+
+class _FixedStatusFlag(StatusFlagIsSet):
+    flag_name: str
+
+    def __init__(self, *, negate: bool = False, **kwargs):
+        super().__init__(self.flag_name, negate=negate, **kwargs)
+
+    def to_dict(self) -> dict[str, Any]:
+        d = super().to_dict()
+        del d['condition_config']['flag']
+        return d
+
+
+class Docked(_FixedStatusFlag):
+    flag_name = 'DOCKED'
+
+
+class Landed(_FixedStatusFlag):
+    flag_name = 'LANDED'
+
+
+class LandingGearDown(_FixedStatusFlag):
+    flag_name = 'LANDING_GEAR_DOWN'
+
+
+class InSupercruise(_FixedStatusFlag):
+    flag_name = 'SUPERCRUISE'
+
+
+class HardpointsDeployed(_FixedStatusFlag):
+    flag_name = 'HARDPOINTS_DEPLOYED'
+
+
+class CargoScoopDeployed(_FixedStatusFlag):
+    flag_name = 'CARGO_SCOOP_DEPLOYED'
+
+
+class LightsOn(_FixedStatusFlag):
+    flag_name = 'LIGHTS_ON'
+
+
+class FlightAssistOff(_FixedStatusFlag):
+    flag_name = 'FLIGHT_ASSIST_OFF'
+
+
+class SilentRunning(_FixedStatusFlag):
+    flag_name = 'SILENT_RUNNING'
+
+
+class FsdMassLocked(_FixedStatusFlag):
+    flag_name = 'FSD_MASS_LOCKED'
+
+
+class InMainShip(_FixedStatusFlag):
+    flag_name = 'IN_MAIN_SHIP'
+
+
+class _CompanionFileCondition(ConditionBase):
+    """A condition answered from the shared, cached companion file snapshots (see :mod:`voice_commander_elite.companion`)."""
+    def __init__(self, *, negate: bool = False, **kwargs):
+        self.negate = negate
+        super().__init__(**kwargs)
+
+    def _evaluate(self) -> bool:
+        raise NotImplementedError
+
+    def check(self, *args: Any, **kwargs: Any) -> bool:
+        if not _tracing._enabled:
+            return self._evaluate() != self.negate
+        start = time.perf_counter()
+        result = self._evaluate() != self.negate
+        _tracing._tracer.record_condition(type(self).__name__, start, time.perf_counter(), result)
+        return result
+
+    def _config(self) -> dict[str, Any]:
+        return {'negate': True} if self.negate else {}
+
+    def to_dict(self) -> dict[str, Any]:
+        return {'condition_type': self.fqn(), 'condition_config': self._config()}
+
+
+class HasJumpsRemaining(_CompanionFileCondition):
+    """
+    True when the route plotted in ``NavRoute.json`` has at least ``minimum`` jumps left, e.g. before jumping with
+    ``HyperSuperCombinationAction``. Jumps are counted from the current system, as published by a background follower
+    of the journal (see :class:`~voice_commander_elite.companion.CurrentSystemFollower`), or from the start of the
+    route while the current system is unknown or not on it.
+    """
+    def __init__(self, minimum: int = 1, *, negate: bool = False, **kwargs):
+        self.minimum = minimum
+        super().__init__(negate=negate, **kwargs)
+
+    def _evaluate(self) -> bool:
+        files = get_companion_files()
+        return files.nav_route().jumps_remaining(files.current_system()) >= self.minimum
+
+    def _config(self) -> dict[str, Any]:
+        config = super()._config()
+        if self.minimum != 1:
+            config['minimum'] = self.minimum
+        return config
+
+
+class CargoEmpty(_CompanionFileCondition):
+    """True when ``Cargo.json`` reports no cargo. Pass ``negate=True`` to check that there is some, e.g. before ``EjectAllCargoAction``."""
+    def _evaluate(self) -> bool:
+        return get_companion_files().cargo().is_empty
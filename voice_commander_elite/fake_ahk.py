@@ -0,0 +1,191 @@
+"""
+A stand-in for AutoHotkey that records what the package sends to it, for exercising actions and conditions off Windows.
+
+::
+
+    from voice_commander_elite.fake_ahk import RecordingAHK
+
+    ahk = RecordingAHK()
+    with ahk.installed():
+        ahk.focus(ELITE_WINDOW_TITLE)
+        if EliteDangerousIsActive().check():
+            SupercruiseAction().perform()
+    assert ahk.pressed_keys() == [SupercruiseAction.ahk_key]
+
+Only the part of the ``ahk`` API this package uses is implemented.
+"""
+from __future__ import annotations
+
+import contextlib
+import itertools
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
+
+from . import _ahk, window
+from .window import ELITE_WINDOW_TITLE, ForegroundWindowTracker
+
+_AHK_ID_PATTERN = re.compile(r'^ahk_id (\S+)$')
+
+
+class RecordedCall(NamedTuple):
+    #: clock time at which the call was made, before any injected latency
+    timestamp: float
+    method: str
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    result: Any
+
+
+class FakeWindow(NamedTuple):
+    id: int
+    title: str
+
+
+class RecordingAHK:
+    """
+    Records every key send and window query made through it, with timestamps.
+
+    :param latency: seconds each call takes, either for every method or per method name (e.g. ``{'key_press': 0.01}``)
+    :param clock: clock used for the timestamps
+    :param sleep: called with the latency of a call. Pass a function that advances a fake clock to simulate latency without waiting.
+    :param max_calls: only keep this many of the most recent calls (e.g. for long-running benchmarks). Default: keep all
+    """
+    def __init__(
+        self,
+        *,
+        latency: float | dict[str, float] = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Any] = time.sleep,
+        max_calls: int | None = None,
+    ):
+        self.latency = latency
+        self.calls: list[RecordedCall] | deque[RecordedCall] = [] if max_calls is None else deque(maxlen=max_calls)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._windows: dict[int, str] = {}
+        self._active: int | None = None
+        self._focus_script: deque[str | None] = deque()
+
+    # --- scripting window focus
+
+    def open_window(self, title: str) -> int:
+        """The id of the (fake) window with ``title``, creating it if needed."""
+        with self._lock:
+            for window_id, window_title in self._windows.items():
+                if window_title == title:
+                    return window_id
+            window_id = next(self._ids)
+            self._windows[window_id] = title
+            return window_id
+
+    def close_window(self, title: str) -> None:
+        with self._lock:
+            for window_id, window_title in list(self._windows.items()):
+                if window_title == title:
+                    del self._windows[window_id]
+                    if self._active == window_id:
+                        self._active = None
+
+    def focus(self, title: str | None = ELITE_WINDOW_TITLE) -> None:
+        """Bring the window with ``title`` to the foreground (``None``: no foreground window). Clears any focus script."""
+        window_id = None if title is None else self.open_window(title)
+        with self._lock:
+            self._focus_script.clear()
+            self._active = window_id
+
+    def script_focus(self, titles: Iterable[str | None]) -> None:
+        """Foreground window titles for the next active-window queries, one per query. The last one stays in the foreground."""
+        with self._lock:
+            self._focus_script.extend(titles)
+
+    # --- inspection
+
+    def pressed_keys(self) -> list[str]:
+        """The keys sent, in order, from ``key_press`` and ``key_down`` calls and ``send`` strings."""
+        keys = []
+        for call in self.calls:
+            if call.method in ('key_press', 'key_down', 'send'):
+                keys.append(call.args[0])
+        return keys
+
+    def calls_to(self, method: str) -> list[RecordedCall]:
+        return [call for call in self.calls if call.method == method]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.calls.clear()
+
+    @contextlib.contextmanager
+    def installed(self, *, tracker_ttl: float = 0.0) -> Iterator[RecordingAHK]:
+        """
+        Use this instance in place of AutoHotkey (see :func:`~voice_commander_elite._ahk.set_ahk`) for the duration of the block,
+        along with a fresh foreground window tracker that caches for ``tracker_ttl`` seconds, so focus changes are seen immediately.
+        """
+        previous_ahk, previous_tracker = _ahk._override, window._tracker
+        _ahk.set_ahk(self)
+        window.set_foreground_tracker(ForegroundWindowTracker(ttl=tracker_ttl, clock=self._clock))
+        try:
+            yield self
+        finally:
+            _ahk.set_ahk(previous_ahk)
+            window.set_foreground_tracker(previous_tracker)
+
+    # --- the ahk API
+
+    def _call(self, method: str, args: tuple[Any, ...], kwargs: dict[str, Any], result: Callable[[], Any] | None = None) -> Any:
+        timestamp = self._clock()
+        latency = self.latency.get(method, 0.0) if isinstance(self.latency, dict) else self.latency
+        if latency:
+            self._sleep(latency)
+        value = result() if result is not None else None
+        with self._lock:
+            self.calls.append(RecordedCall(timestamp, method, args, kwargs, value))
+        return value
+
+    def send(self, keys: str, **kwargs: Any) -> None:
+        self._call('send', (keys,), kwargs)
+
+    def key_press(self, key: str, **kwargs: Any) -> None:
+        self._call('key_press', (key,), kwargs)
+
+    def key_down(self, key: str, **kwargs: Any) -> None:
+        self._call('key_down', (key,), kwargs)
+
+    def key_up(self, key: str, **kwargs: Any) -> None:
+        self._call('key_up', (key,), kwargs)
+
+    def _active_window(self) -> FakeWindow | None:
+        with self._lock:
+            if self._focus_script:
+                title = self._focus_script.popleft() if len(self._focus_script) > 1 else self._focus_script[0]
+                self._active = None
+                if title is not None:
+                    for window_id, window_title in self._windows.items():
+                        if window_title == title:
+                            self._active = window_id
+                            break
+                    else:
+                        self._active = next(self._ids)
+                        self._windows[self._active] = title
+            if self._active is None or self._active not in self._windows:
+                return None
+            return FakeWindow(self._active, self._windows[self._active])
+
+    def get_active_window(self, **kwargs: Any) -> FakeWindow | None:
+        return self._call('get_active_window', (), kwargs, self._active_window)
+
+    def _find_window(self, title: str) -> FakeWindow | None:
+        with self._lock:
+            match = _AHK_ID_PATTERN.match(title)
+            for window_id, window_title in self._windows.items():
+                if (match is not None and str(window_id) == match.group(1)) or window_title == title:
+                    return FakeWindow(window_id, window_title)
+        return None
+
+    def win_get(self, title: str = '', **kwargs: Any) -> FakeWindow | None:
+        return self._call('win_get', (), dict(kwargs, title=title), lambda: self._find_window(title))
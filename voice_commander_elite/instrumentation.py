@@ -0,0 +1,144 @@
+"""
+Opt-in timing and diagnostics for the bindings pipeline that runs when the package is imported.
+
+Set ``VOICE_COMMANDER_ELITE_INSTRUMENT=1`` before importing ``voice_commander_elite`` (or call :func:`enable` and
+import it afterwards), then inspect :func:`get_report`. Setting ``VOICE_COMMANDER_ELITE_INSTRUMENT_OUTPUT`` to a
+file path also writes the report there as JSON once the actions module has loaded.
+
+When disabled, :func:`span` returns a shared no-op context manager and the ``record_*`` functions return immediately.
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, ContextManager, NamedTuple
+
+INSTRUMENT_ENV = 'VOICE_COMMANDER_ELITE_INSTRUMENT'
+INSTRUMENT_OUTPUT_ENV = 'VOICE_COMMANDER_ELITE_INSTRUMENT_OUTPUT'
+
+_enabled = os.environ.get(INSTRUMENT_ENV, '') not in ('', '0') or bool(os.environ.get(INSTRUMENT_OUTPUT_ENV))
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class Span(NamedTuple):
+    name: str
+    #: seconds since the report was started
+    start: float
+    duration: float
+    attrs: dict[str, Any]
+
+
+class StartupReport:
+    def __init__(self) -> None:
+        self.origin = time.perf_counter()
+        self.spans: list[Span] = []
+        self.skipped: Counter[str] = Counter()
+        self.skipped_names: defaultdict[str, list[str]] = defaultdict(list)
+        self.errors: list[dict[str, str]] = []
+        self._lock = threading.Lock()
+
+    def add_span(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def totals(self) -> dict[str, dict[str, float]]:
+        """Total duration and count per span name."""
+        totals: dict[str, dict[str, float]] = {}
+        for span in self.spans:
+            total = totals.setdefault(span.name, {'count': 0, 'total_s': 0.0})
+            total['count'] += 1
+            total['total_s'] += span.duration
+        return totals
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'spans': [span._asdict() for span in self.spans],
+            'totals': self.totals(),
+            'skipped': {reason: {'count': count, 'names': self.skipped_names[reason]} for reason, count in self.skipped.items()},
+            'errors': list(self.errors),
+        }
+
+    def to_json(self, **kwargs: Any) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def dump_json(self, path: str | Path) -> None:
+        Path(path).write_text(self.to_json(indent=2), encoding='utf-8')
+
+
+_report = StartupReport()
+
+
+class _SpanContext:
+    __slots__ = ('name', 'attrs', '_start')
+
+    def __init__(self, name: str, attrs: dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self) -> _SpanContext:
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.attrs['error'] = repr(exc)
+        _report.add_span(Span(self.name, self._start - _report.origin, end - self._start, self.attrs))
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def span(name: str, **attrs: Any) -> ContextManager[Any]:
+    """Time the enclosed block as a span called ``name``."""
+    if not _enabled:
+        return _NULL_CONTEXT
+    return _SpanContext(name, attrs)
+
+
+def record_skip(reason: str, binding_name: str) -> None:
+    """Count a binding that did not produce an action, e.g. because it is only bound to a joystick."""
+    if not _enabled:
+        return
+    with _report._lock:
+        _report.skipped[reason] += 1
+        _report.skipped_names[reason].append(binding_name)
+
+
+def record_error(message: str, exc: BaseException | None = None) -> None:
+    if not _enabled:
+        return
+    with _report._lock:
+        _report.errors.append({'message': message, 'error': repr(exc) if exc is not None else ''})
+
+
+def get_report() -> StartupReport:
+    return _report
+
+
+def reset_report() -> None:
+    global _report
+    _report = StartupReport()
+
+
+def dump_if_requested() -> None:
+    path = os.environ.get(INSTRUMENT_OUTPUT_ENV)
+    if _enabled and path:
+        _report.dump_json(path)
@@ -0,0 +1,246 @@
+"""
+Following Elite Dangerous' journal as the game writes it.
+
+:class:`JournalTailer` tails the newest ``Journal.*.log`` in the journal directory, reading only the bytes appended
+since the last poll, and follows the game on to the next journal file. :class:`JournalEventRouter` hands each
+event to the handlers registered for its event name::
+
+    router = JournalEventRouter()
+    router.on('FSDJump', lambda event: print('Jumped to', event['StarSystem']))
+    asyncio.run(JournalTailer().run(router))
+
+A :class:`JournalEventTrigger` performs voice-commander actions when an event is written, like a voice trigger does
+when its phrase is spoken::
+
+    router.add_trigger(JournalEventTrigger('Docked').add_action(actions.LandingGearToggleAction()))
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Self, Union
+
+from .status import find_journal_dir
+
+JOURNAL_FILE_PATTERN = re.compile(r'^Journal\..+\.log$')
+
+JournalEvent = dict[str, Any]
+JournalHandler = Callable[[JournalEvent], Union[None, Awaitable[None]]]
+
+
+# Journal.YYMMDDHHMMSS.NN.log before Elite's 2022 update, Journal.YYYY-MM-DDTHHMMSS.NN.log since
+_OLD_JOURNAL_NAME = re.compile(r'^Journal\.(\d{12})\.(\d+)\.log$')
+_NEW_JOURNAL_NAME = re.compile(r'^Journal\.(\d{4})-(\d{2})-(\d{2})T(\d{6})\.(\d+)\.log$')
+
+
+def journal_order_key(name: str) -> tuple[str, int, str]:
+    """
+    Sort key that orders journal file names by the time they were created, across both of the game's naming schemes
+    (plain string order puts every pre-2022 name after the newer ones). Names in neither format sort first.
+    """
+    match = _NEW_JOURNAL_NAME.match(name)
+    if match is not None:
+        year, month, day, time_of_day, part = match.groups()
+        return f'{year}{month}{day}{time_of_day}', int(part), name
+    match = _OLD_JOURNAL_NAME.match(name)
+    if match is not None:
+        timestamp, part = match.groups()
+        return f'20{timestamp}', int(part), name
+    return '', 0, name
+
+
+def find_latest_journal(journal_dir: str | Path | None = None) -> Path | None:
+    journal_dir = Path(journal_dir) if journal_dir is not None else find_journal_dir()
+    try:
+        names = [name for name in os.listdir(journal_dir) if JOURNAL_FILE_PATTERN.match(name)]
+    except OSError:
+        return None
+    if not names:
+        return None
+    return journal_dir / max(names, key=journal_order_key)
+
+
+class JournalEventRouter:
+    """Dispatches journal events to the handlers registered for their ``event`` name."""
+    def __init__(self) -> None:
+        self._handlers: defaultdict[str, list[JournalHandler]] = defaultdict(list)
+
+    def on(self, event_name: str, handler: JournalHandler) -> JournalHandler:
+        """Call ``handler`` for every event named ``event_name`` (``'*'`` for every event). Handlers may be coroutines."""
+        self._handlers[event_name].append(handler)
+        return handler
+
+    def off(self, event_name: str, handler: JournalHandler) -> None:
+        self._handlers[event_name].remove(handler)
+
+    def add_trigger(self, trigger: JournalEventTrigger) -> JournalEventTrigger:
+        """Fire ``trigger`` for every event named ``trigger.event_name``."""
+        return self.on(trigger.event_name, trigger)  # type: ignore[return-value]
+
+    async def dispatch(self, event: JournalEvent) -> None:
+        handlers = self._handlers.get(event.get('event'), ())
+        catch_all = self._handlers.get('*', ())
+        for handler in (*handlers, *catch_all):
+            try:
+                result = handler(event)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f'Error ignored: journal handler for {event.get("event")!r} failed', e, file=sys.stderr)
+
+
+class JournalEventTrigger:
+    """
+    Performs actions when the journal reports an event, e.g.::
+
+        JournalEventTrigger('FSDJump').add_condition(HasJumpsRemaining()).add_action(actions.HyperSuperCombinationAction())
+
+    Register it with :meth:`JournalEventRouter.add_trigger`. When a matching event is dispatched and every condition's
+    ``check()`` passes, the actions are performed in the order they were added. Conditions and actions block (they
+    talk to AutoHotkey, and macros sleep), so they run on a worker thread rather than in the event loop.
+
+    :param event_name: the journal event to react to, e.g. ``'Docked'``
+    :param where: only fire for events this returns true for, e.g. ``lambda event: event['StationType'] == 'FleetCarrier'``
+    """
+    def __init__(self, event_name: str, *, where: Callable[[JournalEvent], bool] | None = None):
+        self.event_name = event_name
+        self.where = where
+        self.actions: list[Any] = []
+        self.conditions: list[Any] = []
+
+    def add_action(self, action: Any) -> Self:
+        self.actions.append(action)
+        return self
+
+    def add_condition(self, condition: Any) -> Self:
+        self.conditions.append(condition)
+        return self
+
+    def fire(self, event: JournalEvent) -> bool:
+        """Check the conditions and perform the actions for ``event``, on the calling thread. Returns whether it fired."""
+        if self.where is not None and not self.where(event):
+            return False
+        if not all(condition.check() for condition in self.conditions):
+            return False
+        for action in self.actions:
+            action.perform()
+        return True
+
+    async def __call__(self, event: JournalEvent) -> None:
+        await asyncio.to_thread(self.fire, event)
+
+
+class JournalTailer:
+    """
+    Async tail of the Elite Dangerous journal.
+
+    :param journal_dir: the directory to watch. Defaults to :func:`~voice_commander_elite.status.find_journal_dir`
+    :param poll_interval: seconds to sleep between checks when nothing new has been written
+    :param rotation_check_interval: how often (in seconds) to look for a newer journal file while the current one is idle
+    :param from_start: whether to replay the current journal file from its beginning rather than only new events
+    """
+    def __init__(
+        self,
+        journal_dir: str | Path | None = None,
+        *,
+        poll_interval: float = 0.25,
+        rotation_check_interval: float = 2.0,
+        from_start: bool = False,
+    ):
+        self.journal_dir = Path(journal_dir) if journal_dir is not None else find_journal_dir()
+        self.poll_interval = poll_interval
+        self.rotation_check_interval = rotation_check_interval
+        self.path: Path | None = None
+        self.offset = 0
+        self._from_start = from_start
+        self._partial = b''
+        self._rotation_checked_at = 0.0
+        self._stopped = False
+
+    def _open_latest(self, from_start: bool) -> None:
+        latest = find_latest_journal(self.journal_dir)
+        if latest is None or latest == self.path:
+            return
+        self.path = latest
+        self._partial = b''
+        if from_start:
+            self.offset = 0
+        else:
+            try:
+                self.offset = os.stat(latest).st_size
+            except OSError:
+                self.offset = 0
+
+    def _parse(self, data: bytes) -> list[JournalEvent]:
+        lines = (self._partial + data).split(b'\n')
+        # the last element is an incomplete line (or empty); keep it for the next read
+        self._partial = lines.pop()
+        events = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(event, dict):
+                events.append(event)
+        return events
+
+    def read_new(self) -> list[JournalEvent]:
+        """Read and parse whatever has been appended since the last call, following rotation to a newer journal."""
+        if self.path is None:
+            self._open_latest(self._from_start)
+            # any journal that shows up later is new, so it is read from its beginning
+            self._from_start = True
+            if self.path is None:
+                return []
+        try:
+            size = os.stat(self.path).st_size
+        except OSError:
+            size = None
+        events: list[JournalEvent] = []
+        if size is not None:
+            if size < self.offset:
+                # truncated or replaced: start over
+                self.offset = 0
+                self._partial = b''
+            if size > self.offset:
+                with open(self.path, 'rb') as f:
+                    f.seek(self.offset)
+                    data = f.read(size - self.offset)
+                self.offset += len(data)
+                events = self._parse(data)
+        if not events:
+            now = time.monotonic()
+            if size is None or now - self._rotation_checked_at >= self.rotation_check_interval:
+                self._rotation_checked_at = now
+                # the current file has been read to the end, so a newer one is read from its beginning
+                self._open_latest(from_start=True)
+        return events
+
+    async def events(self) -> AsyncIterator[JournalEvent]:
+        while not self._stopped:
+            # file I/O, so it runs on a worker thread instead of blocking the event loop
+            events = await asyncio.to_thread(self.read_new)
+            if not events:
+                await asyncio.sleep(self.poll_interval)
+                continue
+            for event in events:
+                yield event
+
+    async def run(self, router: JournalEventRouter) -> None:
+        """Dispatch every new journal event to ``router`` until :meth:`stop` is called."""
+        async for event in self.events():
+            await router.dispatch(event)
+
+    def stop(self) -> None:
+        self._stopped = True
@@ -0,0 +1,406 @@
+"""
+A persistent index of Elite Dangerous' journal files, for recovering the game state when starting mid-session.
+
+For every ``Journal.*.log`` file, :class:`JournalIndex` records the byte offset of every event by event name, and
+the latest occurrence of each of the :data:`KEY_EVENTS` (location, docking, ship, loadout, ...) with its contents.
+The index is kept in the cache directory and updated incrementally: only the bytes appended to a journal since the
+last update are scanned. Events are then read back by seeking to their offsets in a memory-mapped file, instead of
+reading whole journals::
+
+    index = JournalIndex()
+    index.update()
+    state = index.recover_state()
+    print(state.system, state.station, state.ship)
+
+Usage::
+
+    python -m voice_commander_elite.journal_index [--journal-dir DIR] [--event NAME]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping, NamedTuple
+
+from .cache import default_cache_dir
+from .journal import JOURNAL_FILE_PATTERN, JournalEvent, journal_order_key
+from .status import find_journal_dir
+
+_INDEX_FORMAT_VERSION = 1
+
+#: events whose latest occurrence in each file is stored in the index itself, so recovering them needs no file access
+KEY_EVENTS = frozenset({
+    'Commander',
+    'LoadGame',
+    'Location',
+    'FSDJump',
+    'CarrierJump',
+    'Docked',
+    'Undocked',
+    'Loadout',
+    'ShipyardSwap',
+    'ShipyardNew',
+    'Embark',
+    'Disembark',
+})
+
+# the journal writes every event as a single line starting with { "timestamp":"...", "event":"<name>", ...
+_EVENT_NAME = re.compile(rb'"event"\s*:\s*"([^"]+)"')
+
+#: position of an event across a journal directory: (journal file name, byte offset)
+EventPosition = tuple[str, int]
+
+
+class GameState(NamedTuple):
+    """The game state as of the latest indexed events. Fields are ``None`` when the journals do not tell."""
+    commander: str | None
+    system: str | None
+    docked: bool | None
+    #: the station docked at, if docked
+    station: str | None
+    ship: str | None
+    ship_id: int | None
+    ship_name: str | None
+    #: the latest ``Loadout`` event
+    loadout: JournalEvent | None
+
+
+def default_index_dir(journal_dir: str | Path) -> Path:
+    """Where the index of ``journal_dir`` is kept by default: in the bindings cache directory."""
+    name = hashlib.sha1(str(Path(journal_dir).absolute()).encode('utf-8')).hexdigest()[:16]
+    return default_cache_dir() / 'journal-index' / name
+
+
+def _first_line_digest(mapped: mmap.mmap | bytes, end: int) -> str | None:
+    newline = mapped.find(b'\n', 0, end)
+    if newline == -1:
+        return None
+    return hashlib.sha1(mapped[:newline + 1]).hexdigest()
+
+
+def _parse_line(line: bytes) -> JournalEvent | None:
+    try:
+        event = json.loads(line)
+    except ValueError:
+        return None
+    return event if isinstance(event, dict) else None
+
+
+def read_events(path: str | Path, offsets: Iterable[int]) -> Iterator[JournalEvent]:
+    """The events on the lines starting at ``offsets`` of the journal file ``path``, via a memory map of the file."""
+    try:
+        f = open(path, 'rb')
+    except OSError:
+        return
+    with f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file
+            return
+        with mapped:
+            for offset in offsets:
+                end = mapped.find(b'\n', offset)
+                event = _parse_line(mapped[offset:end if end != -1 else len(mapped)])
+                if event is not None:
+                    yield event
+
+
+class _FileIndex:
+    __slots__ = ('size', 'indexed_to', 'head', 'events', 'latest')
+
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        self.size = 0
+        #: offset just past the last complete line that was indexed
+        self.indexed_to = 0
+        #: digest of the first line, to notice a file that was replaced rather than appended to
+        self.head: str | None = None
+        self.events: dict[str, list[int]] = {}
+        #: key event name -> (offset, event) of its latest occurrence
+        self.latest: dict[str, tuple[int, JournalEvent]] = {}
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'size': self.size,
+            'indexed_to': self.indexed_to,
+            'head': self.head,
+            'events': self.events,
+            'latest': {name: [offset, event] for name, (offset, event) in self.latest.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, d: Mapping[str, Any]) -> _FileIndex:
+        file_index = cls()
+        file_index.size = d['size']
+        file_index.indexed_to = d['indexed_to']
+        file_index.head = d['head']
+        file_index.events = {name: list(offsets) for name, offsets in d['events'].items()}
+        file_index.latest = {name: (offset, event) for name, (offset, event) in d['latest'].items()}
+        return file_index
+
+    def scan(self, path: Path) -> bool:
+        """Index the complete lines appended to ``path`` since the last scan. Returns whether anything changed."""
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            return False
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if size == self.size:
+                return False
+            if not size:
+                self._reset()
+                return True
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if size < self.indexed_to or (self.head is not None and _first_line_digest(mapped, size) != self.head):
+                    # truncated or replaced: start over
+                    self._reset()
+                self.size = size
+                end = mapped.rfind(b'\n', self.indexed_to, size) + 1
+                if end <= self.indexed_to:
+                    # nothing but a partially written line
+                    return True
+                if self.head is None:
+                    self.head = _first_line_digest(mapped, end)
+                offset = self.indexed_to
+                events = self.events
+                while offset < end:
+                    line_end = mapped.find(b'\n', offset, end)
+                    match = _EVENT_NAME.search(mapped, offset, line_end)
+                    if match is not None:
+                        name = match.group(1).decode('utf-8', 'replace')
+                        offsets = events.get(name)
+                        if offsets is None:
+                            offsets = events[name] = []
+                        offsets.append(offset)
+                        if name in KEY_EVENTS:
+                            event = _parse_line(mapped[offset:line_end])
+                            if event is not None:
+                                self.latest[name] = (offset, event)
+                    offset = line_end + 1
+                self.indexed_to = end
+        return True
+
+
+class JournalIndex:
+    """
+    Sidecar index of the journal files in ``journal_dir``: one small JSON file per journal file in ``index_dir``,
+    so that an update only rewrites the index of the journals that changed.
+
+    :param journal_dir: the journal directory. Defaults to :func:`~voice_commander_elite.status.find_journal_dir`
+    :param index_dir: where the index is stored. Defaults to :func:`default_index_dir`
+    """
+    def __init__(self, journal_dir: str | Path | None = None, *, index_dir: str | Path | None = None):
+        self.journal_dir = Path(journal_dir) if journal_dir is not None else find_journal_dir()
+        self.index_dir = Path(index_dir) if index_dir is not None else default_index_dir(self.journal_dir)
+        self._lock = threading.Lock()
+        self._files: dict[str, _FileIndex] = {}
+        # journal file names whose index has to be written (or, if no longer indexed, deleted)
+        self._dirty: set[str] = set()
+        self._load()
+
+    def _sidecar(self, name: str) -> Path:
+        return self.index_dir / f'{name}.json'
+
+    def _load(self) -> None:
+        try:
+            sidecars = [name for name in os.listdir(self.index_dir) if name.endswith('.log.json')]
+        except OSError:
+            return
+        for sidecar in sidecars:
+            name = sidecar.removesuffix('.json')
+            try:
+                with open(self.index_dir / sidecar, 'rb') as f:
+                    stored = json.load(f)
+                if stored['version'] != _INDEX_FORMAT_VERSION:
+                    continue
+                self._files[name] = _FileIndex.from_dict(stored)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f'Error ignored: could not read the journal index {self.index_dir / sidecar}, rebuilding it', e, file=sys.stderr)
+
+    def save(self) -> None:
+        """Write the index of the journal files that changed since it was loaded or last saved."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            for name in sorted(self._dirty):
+                path = self._sidecar(name)
+                file_index = self._files.get(name)
+                if file_index is None:
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass
+                    continue
+                fd, tmp = tempfile.mkstemp(dir=self.index_dir, prefix=path.name, suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump(dict(file_index.to_dict(), version=_INDEX_FORMAT_VERSION), f, separators=(',', ':'))
+                    os.replace(tmp, path)
+                except BaseException:
+                    os.unlink(tmp)
+                    raise
+            self._dirty.clear()
+
+    def update(self, *, save: bool = True) -> list[str]:
+        """
+        Index whatever was appended to the journal files since the last update, and forget files that no longer exist.
+        Returns the names of the files that changed.
+        """
+        try:
+            names = sorted((name for name in os.listdir(self.journal_dir) if JOURNAL_FILE_PATTERN.match(name)), key=journal_order_key)
+        except OSError:
+            names = []
+        changed = []
+        with self._lock:
+            for name in list(self._files):
+                if name not in names:
+                    del self._files[name]
+                    changed.append(name)
+            for name in names:
+                file_index = self._files.get(name)
+                if file_index is None:
+                    file_index = self._files[name] = _FileIndex()
+                if file_index.scan(self.journal_dir / name):
+                    changed.append(name)
+            self._dirty.update(changed)
+        if save:
+            self.save()
+        return changed
+
+    def files(self) -> list[str]:
+        """The indexed journal file names, oldest first."""
+        return sorted(self._files, key=journal_order_key)
+
+    def positions(self, event_name: str) -> list[EventPosition]:
+        """Where every ``event_name`` event is, oldest first."""
+        return [
+            (name, offset)
+            for name in self.files()
+            for offset in self._files[name].events.get(event_name, ())
+        ]
+
+    def counts(self) -> dict[str, int]:
+        """Number of events by event name, over all files."""
+        counts: dict[str, int] = {}
+        for file_index in self._files.values():
+            for event_name, offsets in file_index.events.items():
+                counts[event_name] = counts.get(event_name, 0) + len(offsets)
+        return counts
+
+    def events(self, event_name: str, *, newest_first: bool = False, limit: int | None = None) -> Iterator[JournalEvent]:
+        """The ``event_name`` events, read from the journal files at their indexed offsets."""
+        names = self.files()
+        if newest_first:
+            names.reverse()
+        remaining = limit
+        for name in names:
+            if remaining is not None and remaining <= 0:
+                return
+            offsets = self._files[name].events.get(event_name)
+            if not offsets:
+                continue
+            if newest_first:
+                offsets = offsets[::-1]
+            if remaining is not None:
+                offsets = offsets[:remaining]
+                remaining -= len(offsets)
+            yield from read_events(self.journal_dir / name, offsets)
+
+    def latest_position(self, *event_names: str) -> tuple[EventPosition, str] | None:
+        """The position and name of the latest of any of ``event_names``."""
+        for name in reversed(self.files()):
+            events = self._files[name].events
+            found = [(events[event_name][-1], event_name) for event_name in event_names if events.get(event_name)]
+            if found:
+                offset, event_name = max(found)
+                return (name, offset), event_name
+        return None
+
+    def latest(self, *event_names: str) -> JournalEvent | None:
+        """The latest of any of ``event_names``. Key events come straight from the index; others are read from their journal."""
+        found = self.latest_position(*event_names)
+        if found is None:
+            return None
+        (name, offset), event_name = found
+        latest = self._files[name].latest.get(event_name)
+        if latest is not None and latest[0] == offset:
+            return latest[1]
+        return next(read_events(self.journal_dir / name, [offset]), None)
+
+    def recover_state(self) -> GameState:
+        """The game state according to the latest indexed events."""
+        commander_event = self.latest('Commander', 'LoadGame')
+        commander = None
+        if commander_event is not None:
+            commander = commander_event.get('Name') if commander_event['event'] == 'Commander' else commander_event.get('Commander')
+
+        location = self.latest('Location', 'FSDJump', 'CarrierJump')
+        system = location.get('StarSystem') if location is not None else None
+
+        docked = station = None
+        docking = self.latest('Docked', 'Undocked', 'Location', 'FSDJump', 'CarrierJump')
+        if docking is not None:
+            if docking['event'] == 'Docked':
+                docked, station = True, docking.get('StationName')
+            elif docking['event'] in ('Location', 'CarrierJump'):
+                docked = bool(docking.get('Docked'))
+                station = docking.get('StationName') if docked else None
+            else:
+                docked = False
+
+        ship = ship_id = ship_name = None
+        ship_event = self.latest('LoadGame', 'Loadout', 'ShipyardSwap', 'ShipyardNew')
+        if ship_event is not None:
+            ship = ship_event.get('Ship', ship_event.get('ShipType'))
+            ship_id = ship_event.get('ShipID', ship_event.get('NewShipID'))
+            # swapping ships does not say the ship's name (the Loadout that follows does)
+            ship_name = ship_event.get('ShipName')
+
+        return GameState(
+            commander=commander,
+            system=system,
+            docked=docked,
+            station=station,
+            ship=ship,
+            ship_id=ship_id,
+            ship_name=ship_name,
+            loadout=self.latest('Loadout'),
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m voice_commander_elite.journal_index', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--journal-dir', default=None, help='journal directory (defaults to the game\'s)')
+    parser.add_argument('--index-dir', default=None, help='where to keep the index (defaults to the cache directory)')
+    parser.add_argument('--event', default=None, help='print the latest event with this name instead of the recovered state')
+    args = parser.parse_args(argv)
+
+    index = JournalIndex(args.journal_dir, index_dir=args.index_dir)
+    changed = index.update()
+    print(f'{len(changed)} of {len(index.files())} journal files (re)indexed', file=sys.stderr)
+    if args.event:
+        result: Any = index.latest(args.event)
+    else:
+        state = index.recover_state()._asdict()
+        if state['loadout'] is not None:
+            state['loadout'] = {'Ship': state['loadout'].get('Ship'), 'Modules': len(state['loadout'].get('Modules', ()))}
+        result = state
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
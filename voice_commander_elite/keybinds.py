@@ -3,11 +3,24 @@ from __future__ import annotations
 import enum
 import os.path
 import warnings
+import weakref
+import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Literal, TypeAlias, Type, Any, Self
-from bs4 import BeautifulSoup, Tag
+from typing import Literal, TypeAlias, Type, Any, Self, Iterator, TYPE_CHECKING
 from voice_commander.actions import AHKPressAction
 import re
+import time
+
+from . import _ahk
+from . import instrumentation as _instrumentation
+from . import tracing as _tracing
+from .pool import default_ordering_key
+
+if TYPE_CHECKING:
+    from bs4 import Tag
+
+    from .scheduler import EliteHoldAction, EliteRepeatAction
+    from .toggles import EliteEnsureStateAction
 
 
 def _binding_tag(tag: Tag):
@@ -190,6 +203,8 @@ AHK_KEY_MAPPING = {
 
 
 class Binding:
+    __slots__ = ('name', 'device', 'key')
+
     def __init__(self, name: str, device: BindingDevice, key: str):
         self.name: str = name
         self.device: BindingDevice = device
@@ -198,40 +213,129 @@ class Binding:
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}(name={self.name!r}, device={self.device!r}, key={self.key!r})'
 
-def binding_to_press_action(binding: Binding) -> Type[AHKPressAction]:
+def unresolved_reason(binding: Binding) -> str | None:
+    """Why ``binding`` has no usable AHK key (``'unmapped_key'``, ``'none_mapping'`` or ``'empty_ahk_key'``), or ``None`` if it has one."""
     device_map = AHK_KEY_MAPPING[binding.device]
+    if binding.key not in device_map:
+        return 'unmapped_key'
     ahk_key = device_map[binding.key]
-    assert ahk_key is not None
-    class InitMixin:
-        def __init__(self, *, key=None, **kwargs):
-            simplified_serialization = kwargs.pop('_simplified_serialization', False)
-            self._simplified_serialization = simplified_serialization
-            if key is not None:
-                warnings.warn('parameter key was provided, but will be ignored', UserWarning, stacklevel=2)
-
-            super().__init__(key=ahk_key, **kwargs)
-        @classmethod
-        def fqn(cls) -> str:
-            return f'voice_commander_elite.actions.{binding.name}Action'
-
-        def to_dict(self) -> dict[str, Any]:
-            d = super().to_dict()
-            if self._simplified_serialization:
-                d['action_type'] = AHKPressAction.fqn()
-            else:
-                d['action_config'] = {}
-            return d
-
-        @classmethod
-        def with_simplified_serialization(cls, *args, **kwargs) -> Self:
-            return cls(*args, _simplified_serialization=True, **kwargs)
+    if ahk_key is None:
+        return 'none_mapping'
+    if not ahk_key:
+        return 'empty_ahk_key'
+    return None
 
-        wss = with_simplified_serialization
+def missing_binding_error(binding_name: str) -> RuntimeError:
+    """The error raised when an action is used whose keybind is not bound to a keyboard key or mouse button."""
+    return RuntimeError(f'Did not find valid mouse button or keyboard key binding for {binding_name!r} in your Elite Dangerous custom keybinds. Please make sure either the primary or secondary binding is set to a mouse button or keyboard key in your Elite Dangerous controls settings')
 
-    klass = type(f'{binding.name}Action', (InitMixin, AHKPressAction), {})
+def resolve_ahk_key(binding: Binding) -> str:
+    device_map = AHK_KEY_MAPPING[binding.device]
+    ahk_key = device_map[binding.key]
+    assert ahk_key is not None
+    if not ahk_key:
+        raise ValueError(f'no AHK key is known for {binding.key!r}')
+    return ahk_key
+
+class ElitePressAction(AHKPressAction):
+    """
+    Base class for the press actions of Elite Dangerous keybinds.
+
+    Concrete subclasses set ``binding_name`` (the name of the keybind, e.g. ``'Supercruise'``)
+    and ``ahk_key`` (the AHK key it is currently bound to).
+    """
+    binding_name: str
+    ahk_key: str
+
+    def __init__(self, *, key=None, **kwargs):
+        simplified_serialization = kwargs.pop('_simplified_serialization', False)
+        self._simplified_serialization = simplified_serialization
+        if key is not None:
+            warnings.warn('parameter key was provided, but will be ignored', UserWarning, stacklevel=2)
+
+        self._bound_key = self.ahk_key
+        super().__init__(key=self._bound_key, **kwargs)
+        _live_press_actions.add(self)
+
+    def _rebind(self, ahk_key: str) -> None:
+        # Only the key changes; conditions and anything else set on the instance are kept. Each press path reads a
+        # single one of these attributes (``key`` for AHK, ``_bound_key`` for an override), so it never sees a torn state.
+        self.key = ahk_key
+        self._bound_key = ahk_key
+
+    def perform(self, *args, **kwargs):
+        if not _tracing._enabled:
+            return self._press(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return self._press(*args, **kwargs)
+        finally:
+            _tracing._tracer.record_send(self.binding_name, start, time.perf_counter())
+
+    def _press(self, *args, **kwargs):
+        override = _ahk._override
+        if override is None:
+            return super().perform(*args, **kwargs)
+        # an AHK replacement installed with voice_commander_elite._ahk.set_ahk (e.g. for testing off Windows, or an
+        # AHKPool, which keeps the sends of one action in order but runs different actions concurrently)
+        with default_ordering_key(self):
+            return override.key_press(self._bound_key)
+
+    @classmethod
+    def fqn(cls) -> str:
+        return f'voice_commander_elite.actions.{cls.binding_name}Action'
+
+    def to_dict(self) -> dict[str, Any]:
+        # built from the instance on every call: conditions (and anything else ActionBase serializes) can be added to
+        # an instance at any time, so no part of the result is shared between instances
+        d = super().to_dict()
+        if self._simplified_serialization:
+            d['action_type'] = AHKPressAction.fqn()
+        else:
+            d['action_config'] = {}
+        return d
+
+    @classmethod
+    def with_simplified_serialization(cls, *args, **kwargs) -> Self:
+        return cls(*args, _simplified_serialization=True, **kwargs)
+
+    wss = with_simplified_serialization
+
+    @classmethod
+    def hold_for(cls, duration: float, **kwargs: Any) -> EliteHoldAction:
+        """An action that holds this keybind down for ``duration`` seconds without blocking. See :class:`~voice_commander_elite.scheduler.EliteHoldAction`."""
+        from .scheduler import EliteHoldAction
+        return EliteHoldAction(cls.binding_name, duration, **kwargs)
+
+    @classmethod
+    def repeat(cls, count: int, interval: float = 0.1, **kwargs: Any) -> EliteRepeatAction:
+        """An action that presses this keybind ``count`` times without blocking. See :class:`~voice_commander_elite.scheduler.EliteRepeatAction`."""
+        from .scheduler import EliteRepeatAction
+        return EliteRepeatAction(cls.binding_name, count, interval, **kwargs)
+
+    @classmethod
+    def ensure_on(cls, **kwargs: Any) -> EliteEnsureStateAction:
+        """An action that only presses this toggle keybind if its state is off. See :class:`~voice_commander_elite.toggles.EliteEnsureStateAction`."""
+        from .toggles import EliteEnsureStateAction
+        return EliteEnsureStateAction(cls.binding_name, True, **kwargs)
+
+    @classmethod
+    def ensure_off(cls, **kwargs: Any) -> EliteEnsureStateAction:
+        """An action that only presses this toggle keybind if its state is on. See :class:`~voice_commander_elite.toggles.EliteEnsureStateAction`."""
+        from .toggles import EliteEnsureStateAction
+        return EliteEnsureStateAction(cls.binding_name, False, **kwargs)
+
+
+# every ElitePressAction instance, so their keys can be updated when bindings are reloaded
+_live_press_actions: weakref.WeakSet[ElitePressAction] = weakref.WeakSet()
+
+
+def binding_to_press_action(binding: Binding) -> Type[ElitePressAction]:
+    ahk_key = resolve_ahk_key(binding)
+    klass = type(f'{binding.name}Action', (ElitePressAction,), {'binding_name': binding.name, 'ahk_key': ahk_key})
     return klass
 
-def _extract_binding(tag: Tag) -> tuple[BindingDevice, str]:
+def _extract_binding(tag: Tag | ET.Element) -> tuple[BindingDevice, str]:
     tag_device = tag.get('Device', '')
     key = tag.get('Key', None)
     assert key is not None
@@ -289,7 +393,69 @@ def find_bindings_file() -> Path:
 
 
 
-def read_bound_actions(bindings_file: str | Path) -> dict[str, Binding]:
+def _extract_streamed_binding(elem: ET.Element, skipped: dict[str, list[str]] | None = None) -> Binding | None:
+    primary = elem.find('.//Primary')
+    secondary = elem.find('.//Secondary')
+    if primary is None and secondary is None:
+        return None
+    for inner in (primary, secondary):
+        if inner is not None and inner.get('Device', '') in ('Keyboard', 'Mouse'):
+            break
+    else:
+        if any(inner is not None and inner.get('Device', '') not in ('', '{NoDevice}') for inner in (primary, secondary)):
+            if skipped is not None:
+                skipped.setdefault('joystick_device', []).append(elem.tag)
+        return None
+    try:
+        assert primary is not None
+        device, key = _extract_binding(primary)
+    except (AssertionError, ValueError):
+        try:
+            assert secondary is not None
+            device, key = _extract_binding(secondary)
+        except (AssertionError, ValueError) as exc:
+            raise ValueError('invalid tag') from exc
+    return Binding(name=elem.tag, device=device, key=key)
+
+
+def iter_bound_actions(bindings_file: str | Path, skipped: dict[str, list[str]] | None = None) -> Iterator[Binding]:
+    """
+    Yield a :class:`Binding` for each keyboard or mouse binding in the bindings file, in document order.
+
+    The file is parsed in a single streaming pass; each binding element is discarded once it has been handled,
+    so the full document tree is never held in memory.
+
+    :param skipped: if given, the names of bindings that were skipped are added to it, by reason (e.g. ``'joystick_device'``)
+    """
+    fp = Path(bindings_file).absolute()
+    depth = 0
+    root: ET.Element | None = None
+    instrumented = _instrumentation.is_enabled()
+    for event, elem in ET.iterparse(fp, events=('start', 'end')):
+        if event == 'start':
+            if depth == 0:
+                if elem.tag != 'Root':
+                    raise ValueError(f'expected Root element in {str(fp)!r}, got {elem.tag!r}')
+                root = elem
+            depth += 1
+            continue
+        depth -= 1
+        if depth != 1:
+            continue
+        if instrumented:
+            with _instrumentation.span('extract_binding', binding=elem.tag):
+                binding = _extract_streamed_binding(elem, skipped)
+        else:
+            binding = _extract_streamed_binding(elem, skipped)
+        assert root is not None
+        root.clear()
+        if binding is not None:
+            yield binding
+
+
+def _read_bound_actions_bs4(bindings_file: str | Path) -> dict[str, Binding]:
+    from bs4 import BeautifulSoup
+
     fp = Path(bindings_file).absolute()
     with open(fp) as f:
         text = f.read()
@@ -302,6 +468,21 @@ def read_bound_actions(bindings_file: str | Path) -> dict[str, Binding]:
     return bindings
 
 
+def read_bound_actions(bindings_file: str | Path, skipped: dict[str, list[str]] | None = None) -> dict[str, Binding]:
+    """:param skipped: if given, the names of bindings that were skipped are added to it, by reason"""
+    try:
+        return {binding.name: binding for binding in iter_bound_actions(bindings_file, skipped)}
+    except ET.ParseError as exc:
+        # The game (or a hand edit) can leave files that are not strictly well-formed.
+        # The lenient BeautifulSoup/lxml parser can usually still recover those, but cannot tell which bindings it skipped.
+        if skipped is not None:
+            skipped.clear()
+        try:
+            return _read_bound_actions_bs4(bindings_file)
+        except ImportError:
+            raise exc from None
+
+
 
 
 KEYBINDS = [
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, NamedTuple, Sequence, Self
+
+from voice_commander.actions import ActionBase
+
+from . import actions
+from ._ahk import completed, get_ahk
+from .keybinds import missing_binding_error
+from .pool import default_ordering_key
+from .table import BindingTable
+
+
+class MacroStep(NamedTuple):
+    binding_name: str
+    #: seconds to wait after this step before the next one
+    delay: float = 0.0
+
+
+class SendChunk(NamedTuple):
+    #: AHK send string, e.g. ``'{j}{Numpad5}'``
+    keys: str
+    #: delay between the keys of this chunk, in seconds
+    key_delay: float
+    #: seconds to wait after this chunk before the next one
+    pause_after: float
+
+
+def _to_step(step: MacroStep | str | Sequence[Any]) -> MacroStep:
+    if isinstance(step, MacroStep):
+        return step
+    if isinstance(step, str):
+        return MacroStep(step)
+    return MacroStep(*step)
+
+
+def compile_steps(steps: Sequence[MacroStep], table: BindingTable) -> list[SendChunk]:
+    """
+    Compile macro steps into the smallest number of AHK sends.
+
+    Consecutive steps separated by the same delay are sent together with that delay as the AHK key delay;
+    a new send is only started where the delay changes.
+    """
+    chunks: list[SendChunk] = []
+    keys: list[str] = []
+    key_delay: float | None = None
+    for i, step in enumerate(steps):
+        ahk_key = table.ahk_key(step.binding_name)
+        if ahk_key is None:
+            raise missing_binding_error(step.binding_name)
+        if keys:
+            gap = steps[i - 1].delay
+            if key_delay is None or key_delay == gap:
+                key_delay = gap
+            else:
+                chunks.append(SendChunk(''.join(keys), key_delay, gap))
+                keys = []
+                key_delay = None
+        keys.append(f'{{{ahk_key}}}')
+    if keys:
+        chunks.append(SendChunk(''.join(keys), key_delay or 0.0, 0.0))
+    return chunks
+
+
+class EliteMacroAction(ActionBase):
+    """
+    Press a sequence of Elite Dangerous keybinds, e.g.::
+
+        EliteMacroAction(['DeployHardpointToggle', ('IncreaseWeaponsPower', 0.05), 'IncreaseWeaponsPower', 'SelectHighestThreat'])
+
+    Each step is a keybind name, optionally with a delay (in seconds) to wait after it. The steps are compiled
+    (once per set of bindings) into as few AHK sends as the delays allow.
+
+    :param steps: the keybind names (or ``(name, delay)`` pairs) to press, in order
+    :param key_press_duration: how long to hold each key down, in seconds. Elite may not register very short presses.
+    """
+    def __init__(self, steps: Sequence[MacroStep | str | Sequence[Any]], *, key_press_duration: float | None = None, **kwargs):
+        self.steps = tuple(_to_step(step) for step in steps)
+        if not self.steps:
+            raise ValueError('a macro needs at least one step')
+        for step in self.steps:
+            if step.binding_name not in actions._table:
+                raise ValueError(f'unknown Elite Dangerous keybind {step.binding_name!r}')
+            if step.delay < 0:
+                raise ValueError(f'delay must not be negative (got {step.delay!r} for {step.binding_name!r})')
+        self.key_press_duration = key_press_duration
+        self._compiled: tuple[BindingTable, list[SendChunk]] | None = None
+        self._compile_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def compiled(self) -> list[SendChunk]:
+        table = actions._table
+        compiled = self._compiled
+        if compiled is None or compiled[0] is not table:
+            # (re)compile on first use and whenever the bindings were reloaded
+            with self._compile_lock:
+                compiled = (table, compile_steps(self.steps, table))
+                self._compiled = compiled
+        return compiled[1]
+
+    def perform(self, *args: Any, **kwargs: Any) -> None:
+        ahk = get_ahk()
+        press_duration = None if self.key_press_duration is None else int(self.key_press_duration * 1000)
+        with default_ordering_key(self):
+            for chunk in self.compiled():
+                # wait for the send itself to finish (it may be queued, e.g. on an AHKPool) so the pause starts after it
+                completed(ahk.send(chunk.keys, key_delay=int(chunk.key_delay * 1000), key_press_duration=press_duration))
+                if chunk.pause_after:
+                    time.sleep(chunk.pause_after)
+
+    def to_dict(self) -> dict[str, Any]:
+        config: dict[str, Any] = {'steps': [[step.binding_name, step.delay] for step in self.steps]}
+        if self.key_press_duration is not None:
+            config['key_press_duration'] = self.key_press_duration
+        return {'action_type': self.fqn(), 'action_config': config}
+
+    @classmethod
+    def from_steps(cls, *steps: MacroStep | str | Sequence[Any], **kwargs: Any) -> Self:
+        return cls(steps, **kwargs)
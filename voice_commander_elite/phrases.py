@@ -0,0 +1,245 @@
+"""
+Matching spoken text to Elite Dangerous actions.
+
+A :class:`PhraseIndex` holds a phrase for every bound keybind (derived from its name, e.g. ``LandingGearToggle`` ->
+"landing gear toggle", plus any aliases you give it) in an inverted token index. Matching an utterance only looks
+at phrases that share a (possibly misheard) word with it, and scores them by IDF-weighted word overlap.
+
+:class:`ElitePhraseDispatcher` is an action that uses an index to press the action that best matches a recognized
+utterance, so one voice trigger can serve every bound action.
+"""
+from __future__ import annotations
+
+import difflib
+import math
+import re
+import threading
+from collections import defaultdict
+from typing import Any, Iterable, NamedTuple
+
+from voice_commander.actions import ActionBase
+
+from . import actions
+from .profiles import binding_phrase
+
+_NUMBER_WORDS = {
+    'zero': '0', 'one': '1', 'two': '2', 'three': '3', 'four': '4', 'five': '5',
+    'six': '6', 'seven': '7', 'eight': '8', 'nine': '9', 'ten': '10',
+    'twenty five': '25', 'fifty': '50', 'seventy five': '75', 'hundred': '100', 'one hundred': '100',
+}
+_NUMBER_PATTERN = re.compile(r'\b(' + '|'.join(sorted(_NUMBER_WORDS, key=len, reverse=True)) + r')\b')
+_TOKEN_PATTERN = re.compile(r'[a-z]+|\d+')
+_CLOSEST_CACHE_SIZE = 4096
+
+
+def tokenize(text: str) -> list[str]:
+    text = _NUMBER_PATTERN.sub(lambda m: _NUMBER_WORDS[m.group(1)], text.lower())
+    return _TOKEN_PATTERN.findall(text)
+
+
+def _trigrams(token: str) -> set[str]:
+    padded = f'  {token} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PhraseMatch(NamedTuple):
+    binding_name: str
+    phrase: str
+    #: between 0 and 1; 1 is an exact match of a known phrase
+    confidence: float
+
+
+class PhraseIndex:
+    """
+    Inverted token index from phrases to keybind names.
+
+    :param phrases: ``(binding_name, phrase)`` pairs
+    :param fuzzy_cutoff: how similar (0-1) an unknown spoken word must be to a known word to count as it
+    """
+    def __init__(self, phrases: Iterable[tuple[str, str]], *, fuzzy_cutoff: float = 0.75):
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._phrases: list[tuple[str, str, frozenset[str]]] = []
+        self._exact: dict[tuple[str, ...], int] = {}
+        postings: defaultdict[str, list[int]] = defaultdict(list)
+        for binding_name, phrase in phrases:
+            tokens = tokenize(phrase)
+            if not tokens:
+                continue
+            phrase_id = len(self._phrases)
+            self._phrases.append((binding_name, phrase, frozenset(tokens)))
+            self._exact.setdefault(tuple(tokens), phrase_id)
+            for token in set(tokens):
+                postings[token].append(phrase_id)
+        self._postings: dict[str, tuple[int, ...]] = {token: tuple(ids) for token, ids in postings.items()}
+        n = len(self._phrases)
+        self._idf: dict[str, float] = {token: math.log(1 + n / len(ids)) for token, ids in self._postings.items()}
+        self._unknown_weight = max(self._idf.values(), default=1.0)
+        self._phrase_weight = [sum(self._idf[t] for t in tokens) for _, _, tokens in self._phrases]
+        trigram_index: defaultdict[str, list[str]] = defaultdict(list)
+        for token in self._postings:
+            for gram in _trigrams(token):
+                trigram_index[gram].append(token)
+        self._trigram_index = dict(trigram_index)
+        self._closest_cache: dict[str, tuple[str, float] | None] = {}
+
+    @classmethod
+    def from_binding_names(cls, binding_names: Iterable[str], aliases: dict[str, Iterable[str]] | None = None, **kwargs: Any) -> PhraseIndex:
+        aliases = aliases or {}
+        pairs = []
+        for name in binding_names:
+            pairs.append((name, binding_phrase(name)))
+            pairs.extend((name, alias) for alias in aliases.get(name, ()))
+        return cls(pairs, **kwargs)
+
+    @classmethod
+    def for_bound_actions(cls, aliases: dict[str, Iterable[str]] | None = None, **kwargs: Any) -> PhraseIndex:
+        """Index of every currently bound action. ``aliases`` maps keybind names to extra phrases."""
+        binding_names = [binding.name for binding in actions._available_bindings.values()]
+        return cls.from_binding_names(binding_names, aliases, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    def phrases(self) -> list[str]:
+        return [phrase for _, phrase, _ in self._phrases]
+
+    def _closest_token(self, token: str) -> tuple[str, float] | None:
+        try:
+            return self._closest_cache[token]
+        except KeyError:
+            pass
+        candidates: defaultdict[str, int] = defaultdict(int)
+        for gram in _trigrams(token):
+            for known in self._trigram_index.get(gram, ()):
+                candidates[known] += 1
+        best: tuple[str, float] | None = None
+        for known, _shared in sorted(candidates.items(), key=lambda item: -item[1])[:10]:
+            ratio = difflib.SequenceMatcher(None, token, known).ratio()
+            if ratio >= self.fuzzy_cutoff and (best is None or ratio > best[1]):
+                best = (known, ratio)
+        if len(self._closest_cache) >= _CLOSEST_CACHE_SIZE:
+            self._closest_cache.clear()
+        self._closest_cache[token] = best
+        return best
+
+    def match(self, utterance: str, *, min_confidence: float = 0.5) -> PhraseMatch | None:
+        """The best matching action for ``utterance``, or ``None`` if nothing reaches ``min_confidence``."""
+        tokens = tokenize(utterance)
+        if not tokens:
+            return None
+        exact = self._exact.get(tuple(tokens))
+        if exact is not None:
+            binding_name, phrase, _ = self._phrases[exact]
+            return PhraseMatch(binding_name, phrase, 1.0)
+
+        # map each spoken word to a known word (exactly, or the closest misheard match) with a similarity factor
+        query: dict[str, float] = {}
+        query_weight = 0.0
+        for token in dict.fromkeys(tokens):
+            if token in self._postings:
+                query[token] = 1.0
+                query_weight += self._idf[token]
+                continue
+            closest = self._closest_token(token)
+            if closest is None:
+                query_weight += self._unknown_weight
+            else:
+                known, ratio = closest
+                query[known] = max(query.get(known, 0.0), ratio)
+                query_weight += self._idf[known]
+
+        scores: defaultdict[int, float] = defaultdict(float)
+        for token, similarity in query.items():
+            weight = self._idf[token] * similarity
+            for phrase_id in self._postings[token]:
+                scores[phrase_id] += weight
+        best_id, best_score = None, 0.0
+        for phrase_id, overlap in scores.items():
+            # weighted Dice coefficient between the utterance and the phrase
+            score = 2 * overlap / (query_weight + self._phrase_weight[phrase_id])
+            if score > best_score:
+                best_id, best_score = phrase_id, score
+        if best_id is None or best_score < min_confidence:
+            return None
+        binding_name, phrase, _ = self._phrases[best_id]
+        return PhraseMatch(binding_name, phrase, min(best_score, 0.99))
+
+
+class ElitePhraseDispatcher(ActionBase):
+    """
+    Presses the action that best matches a recognized utterance.
+
+    Register :meth:`phrases` on a single voice trigger and perform the dispatcher with the recognized text::
+
+        dispatcher = ElitePhraseDispatcher(aliases={'LandingGearToggle': ['landing gear', 'gear']})
+        dispatcher.perform('deploy landing gear')
+
+    Unless an ``index`` is given, the phrases are indexed on first use and re-indexed whenever the bindings are reloaded.
+
+    :param index: the phrase index to use. Defaults to :meth:`PhraseIndex.for_bound_actions` with ``aliases``
+    :param aliases: keybind name -> extra phrases for it
+    :param min_confidence: utterances whose best match scores lower are ignored
+    """
+    def __init__(
+        self,
+        index: PhraseIndex | None = None,
+        *,
+        aliases: dict[str, Iterable[str]] | None = None,
+        min_confidence: float = 0.6,
+        **kwargs,
+    ):
+        self.aliases = {name: list(phrases) for name, phrases in (aliases or {}).items()}
+        self.min_confidence = min_confidence
+        self._fixed_index = index
+        # (binding table, available bindings, index) the index was built for
+        self._indexed: tuple[Any, Any, PhraseIndex] | None = None
+        self._actions: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    @property
+    def index(self) -> PhraseIndex:
+        if self._fixed_index is not None:
+            return self._fixed_index
+        table, available = actions._table, actions._available_bindings
+        indexed = self._indexed
+        if indexed is None or indexed[0] is not table or indexed[1] is not available:
+            # (re)build on first use and whenever the bindings were reloaded
+            with self._lock:
+                indexed = (table, available, PhraseIndex.for_bound_actions(self.aliases))
+                self._indexed = indexed
+                self._actions = {}
+        return indexed[2]
+
+    def phrases(self) -> list[str]:
+        return self.index.phrases()
+
+    def _action(self, binding_name: str) -> Any:
+        action = self._actions.get(binding_name)
+        if action is None:
+            with self._lock:
+                action = self._actions.get(binding_name)
+                if action is None:
+                    action = getattr(actions, f'{binding_name}Action')()
+                    self._actions[binding_name] = action
+        return action
+
+    def perform(self, utterance: str, *args: Any, **kwargs: Any) -> PhraseMatch | None:
+        """Press the best matching action for the recognized ``utterance``. Returns the match, or ``None`` if nothing was pressed."""
+        match = self.index.match(utterance, min_confidence=self.min_confidence)
+        if match is None:
+            return None
+        self._action(match.binding_name).perform(*args, **kwargs)
+        return match
+
+    __call__ = perform
+
+    def to_dict(self) -> dict[str, Any]:
+        if self._fixed_index is not None:
+            raise ValueError('a dispatcher with a custom phrase index cannot be serialized; pass aliases instead')
+        config: dict[str, Any] = {}
+        if self.aliases:
+            config['aliases'] = self.aliases
+        if self.min_confidence != 0.6:
+            config['min_confidence'] = self.min_confidence
+        return {'action_type': self.fqn(), 'action_config': config}
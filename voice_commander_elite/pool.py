@@ -0,0 +1,279 @@
+"""
+A bounded pool of AutoHotkey workers, so that triggers firing close together do not wait on each other.
+
+:class:`AHKPool` implements the part of the ``ahk`` API this package uses and can be installed in place of the shared
+AHK instance (see :meth:`AHKPool.installed`). Each worker thread has its own AHK instance. Calls are grouped by an
+*ordering key* and all calls with the same key run on the same worker, in the order they were made. Calls with
+different keys run concurrently.
+
+The actions of this package use their own instance as the key: everything one action (e.g. a macro, or a scheduled
+hold) sends stays in order, while different actions run in parallel even when they are performed from the same thread.
+Wrap several actions in :func:`ordering_key` to keep them in order with each other. Calls made outside any action and
+any :func:`ordering_key` block are keyed on the calling thread.
+
+Key sends return immediately with a :class:`~concurrent.futures.Future`, which raises the call's error from
+``.result()`` (see :func:`~voice_commander_elite._ahk.completed`); window queries wait for their answer. When
+``capacity`` calls are already waiting or running, further calls block (up to ``submit_timeout``) until a slot frees up,
+then raise :class:`PoolSaturated`.
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, Iterator, NamedTuple
+
+from . import _ahk
+
+_ordering_key: contextvars.ContextVar[Hashable | None] = contextvars.ContextVar('voice_commander_elite_ordering_key', default=None)
+
+
+@contextlib.contextmanager
+def ordering_key(key: Hashable) -> Iterator[None]:
+    """Run the AHK calls made in this block in order with every other call made with the same key."""
+    token = _ordering_key.set(key)
+    try:
+        yield
+    finally:
+        _ordering_key.reset(token)
+
+
+@contextlib.contextmanager
+def default_ordering_key(key: Hashable) -> Iterator[None]:
+    """Like :func:`ordering_key`, but a key set by an enclosing :func:`ordering_key` block takes precedence."""
+    if _ordering_key.get() is not None:
+        yield
+        return
+    token = _ordering_key.set(key)
+    try:
+        yield
+    finally:
+        _ordering_key.reset(token)
+
+
+class PoolSaturated(RuntimeError):
+    pass
+
+
+class PoolStats(NamedTuple):
+    workers: int
+    #: workers running a call right now
+    busy: int
+    #: calls submitted but not yet finished (running or waiting)
+    in_flight: int
+    capacity: int
+    peak_in_flight: int
+    submitted: int
+    completed: int
+    failed: int
+    #: submissions that gave up waiting for a free slot
+    rejected: int
+    #: average and longest time calls waited for a worker, in seconds
+    mean_wait: float
+    max_wait: float
+    #: fraction of worker time spent running calls since the pool started
+    utilization: float
+
+    @property
+    def occupancy(self) -> float:
+        """Fraction of ``capacity`` currently in use."""
+        return self.in_flight / self.capacity
+
+
+class _Worker:
+    def __init__(self, pool: AHKPool, index: int, ahk: Any):
+        self.pool = pool
+        self.ahk = ahk
+        self.queue: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self.pending = 0
+        self.busy = False
+        self.busy_seconds = 0.0
+        self.thread = threading.Thread(target=self._run, name=f'voice-commander-elite-ahk-{index}', daemon=True)
+
+    def _run(self) -> None:
+        pool = self.pool
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            future, key, method, args, kwargs, submitted_at = item
+            started = time.perf_counter()
+            self.busy = True
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(getattr(self.ahk, method)(*args, **kwargs))
+                    except BaseException as e:
+                        future.set_exception(e)
+                        pool._record_failure(method, e)
+            finally:
+                self.busy = False
+                finished = time.perf_counter()
+                self.busy_seconds += finished - started
+                pool._finished(self, key, started - submitted_at)
+
+
+class AHKPool:
+    """
+    :param workers: number of worker threads, each with its own AHK instance
+    :param capacity: how many calls may be waiting or running at once before new calls block
+    :param factory: creates the AHK instance of each worker. Defaults to ``ahk.AHK``.
+    :param submit_timeout: how long a call waits for a free slot before raising :class:`PoolSaturated` (``None``: wait indefinitely)
+    """
+    def __init__(
+        self,
+        workers: int = 4,
+        *,
+        capacity: int = 64,
+        factory: Callable[[], Any] | None = None,
+        submit_timeout: float | None = None,
+    ):
+        if workers < 1:
+            raise ValueError(f'a pool needs at least one worker (got {workers!r})')
+        if capacity < workers:
+            raise ValueError(f'capacity ({capacity!r}) must be at least the number of workers ({workers!r})')
+        if factory is None:
+            from ahk import AHK as factory
+        self.capacity = capacity
+        self.submit_timeout = submit_timeout
+        self._slots = threading.BoundedSemaphore(capacity)
+        self._lock = threading.Lock()
+        # ordering key -> (worker, number of unfinished calls with that key)
+        self._affinity: dict[Hashable, list[Any]] = {}
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._started_at = time.perf_counter()
+        self._closed = False
+        self._workers = [_Worker(self, i, factory()) for i in range(workers)]
+        for worker in self._workers:
+            worker.thread.start()
+
+    def submit(self, method: str, *args: Any, key: Hashable | None = None, **kwargs: Any) -> Future[Any]:
+        """Call ``method`` on a worker's AHK instance. ``key`` overrides the ordering key (see :func:`ordering_key`)."""
+        if key is None:
+            key = _ordering_key.get()
+            if key is None:
+                # the thread object rather than its ident, which is reused as soon as a (short-lived trigger) thread exits
+                key = threading.current_thread()
+        if not self._slots.acquire(timeout=self.submit_timeout):
+            with self._lock:
+                self._rejected += 1
+            raise PoolSaturated(f'all {self.capacity} slots of the AHK pool are in use')
+        future: Future[Any] = Future()
+        with self._lock:
+            if self._closed:
+                self._slots.release()
+                raise RuntimeError('the AHK pool is closed')
+            affinity = self._affinity.get(key)
+            if affinity is None:
+                worker = min(self._workers, key=lambda w: (w.pending, w.busy))
+                affinity = self._affinity[key] = [worker, 0]
+            affinity[1] += 1
+            worker = affinity[0]
+            worker.pending += 1
+            self._submitted += 1
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        worker.queue.put((future, key, method, args, kwargs, time.perf_counter()))
+        return future
+
+    def _finished(self, worker: _Worker, key: Hashable, wait: float) -> None:
+        with self._lock:
+            worker.pending -= 1
+            affinity = self._affinity[key]
+            affinity[1] -= 1
+            if not affinity[1]:
+                del self._affinity[key]
+            self._in_flight -= 1
+            self._completed += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+        self._slots.release()
+
+    def _record_failure(self, method: str, exc: BaseException) -> None:
+        with self._lock:
+            self._failed += 1
+        print(f'Error ignored: AHK {method} failed:', exc, file=sys.stderr)
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            elapsed = time.perf_counter() - self._started_at
+            busy_seconds = sum(worker.busy_seconds for worker in self._workers)
+            return PoolStats(
+                workers=len(self._workers),
+                busy=sum(worker.busy for worker in self._workers),
+                in_flight=self._in_flight,
+                capacity=self.capacity,
+                peak_in_flight=self._peak_in_flight,
+                submitted=self._submitted,
+                completed=self._completed,
+                failed=self._failed,
+                rejected=self._rejected,
+                mean_wait=self._total_wait / self._completed if self._completed else 0.0,
+                max_wait=self._max_wait,
+                utilization=busy_seconds / (elapsed * len(self._workers)) if elapsed else 0.0,
+            )
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Wait until every submitted call has finished. Returns ``False`` on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if not self._in_flight:
+                    return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.001)
+
+    def close(self, *, wait: bool = True) -> None:
+        """Stop the workers once they have finished the calls already submitted."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for worker in self._workers:
+            worker.queue.put(None)
+        if wait:
+            for worker in self._workers:
+                worker.thread.join()
+
+    @contextlib.contextmanager
+    def installed(self) -> Iterator[AHKPool]:
+        """Route this package's AutoHotkey calls through the pool for the duration of the block, then close it."""
+        previous = _ahk._override
+        _ahk.set_ahk(self)
+        try:
+            yield self
+        finally:
+            _ahk.set_ahk(previous)
+            self.close()
+
+    # --- the ahk API
+
+    def send(self, keys: str, **kwargs: Any) -> Future[Any]:
+        return self.submit('send', keys, **kwargs)
+
+    def key_press(self, key: str, **kwargs: Any) -> Future[Any]:
+        return self.submit('key_press', key, **kwargs)
+
+    def key_down(self, key: str, **kwargs: Any) -> Future[Any]:
+        return self.submit('key_down', key, **kwargs)
+
+    def key_up(self, key: str, **kwargs: Any) -> Future[Any]:
+        return self.submit('key_up', key, **kwargs)
+
+    def get_active_window(self, **kwargs: Any) -> Any:
+        return self.submit('get_active_window', **kwargs).result()
+
+    def win_get(self, **kwargs: Any) -> Any:
+        return self.submit('win_get', **kwargs).result()
@@ -0,0 +1,89 @@
+"""
+Bulk export of profiles covering every bound Elite Dangerous action.
+"""
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator
+
+from . import actions
+from .conditions import EliteDangerousIsActive
+
+VOICE_TRIGGER_TYPE = 'voice_commander.triggers.VoiceTrigger'
+
+_WORD_PATTERN = re.compile(r'[A-Z]+(?=[A-Z][a-z]|\d|\b|_)|[A-Z]?[a-z]+|\d+|[A-Z]+')
+
+
+def binding_phrase(binding_name: str) -> str:
+    """Spoken phrase for a keybind name, e.g. ``'LandingGearToggle'`` -> ``'landing gear toggle'``."""
+    return ' '.join(word.lower() for word in _WORD_PATTERN.findall(binding_name))
+
+
+def iter_action_triggers(
+    *,
+    phrases: dict[str, list[str]] | None = None,
+    simplified: bool = False,
+    with_condition: bool = True,
+) -> Iterator[dict[str, Any]]:
+    """
+    Serialized voice triggers, one per bound action, in the order of the bindings file.
+
+    :param phrases: trigger phrases per keybind name. Keybinds not in this mapping use :func:`binding_phrase`
+    :param simplified: serialize actions and conditions with the vanilla ``voice-commander`` types (like ``.wss()``)
+    :param with_condition: add an :class:`~voice_commander_elite.conditions.EliteDangerousIsActive` condition to each trigger
+    """
+    phrases = phrases or {}
+    conditions = []
+    if with_condition:
+        condition = EliteDangerousIsActive(_simplified_serialization=simplified)
+        conditions.append(condition.to_dict())
+    for action_name in list(actions._available_bindings):
+        action_cls = getattr(actions, action_name)
+        action = action_cls(_simplified_serialization=simplified)
+        binding_name = action_cls.binding_name
+        yield {
+            'trigger_type': VOICE_TRIGGER_TYPE,
+            'actions': [action.to_dict()],
+            'conditions': conditions,
+            'trigger_config': {'*trigger_phrases': list(phrases.get(binding_name) or [binding_phrase(binding_name)])},
+        }
+
+
+def write_profile(
+    fp: IO[str],
+    profile_name: str,
+    triggers: Iterable[dict[str, Any]] | None = None,
+    *,
+    indent: int | None = None,
+) -> int:
+    """
+    Write a profile JSON document to ``fp``, serializing one trigger at a time rather than building the whole document.
+
+    :param triggers: serialized triggers. Defaults to :func:`iter_action_triggers`
+    :return: the number of triggers written
+    """
+    if triggers is None:
+        triggers = iter_action_triggers()
+    header = {'profile_name': profile_name, 'schema_version': '0'}
+    fp.write('{"configuration": ')
+    fp.write(json.dumps(header, indent=indent)[:-1].rstrip())
+    fp.write(', "triggers": [')
+    count = 0
+    for trigger in triggers:
+        if count:
+            fp.write(', ')
+        fp.write(json.dumps(trigger, indent=indent))
+        count += 1
+    fp.write(']}}\n')
+    return count
+
+
+def export_profile(path: str | Path, profile_name: str = 'elite', *, indent: int | None = None, **kwargs: Any) -> int:
+    """
+    Write a profile with one voice trigger for every bound action to ``path``.
+    Other keyword arguments are passed to :func:`iter_action_triggers`. Returns the number of triggers written.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        return write_profile(f, profile_name, iter_action_triggers(**kwargs), indent=indent)
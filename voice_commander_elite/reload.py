@@ -0,0 +1,271 @@
+"""
+Live reloading of keybindings.
+
+A :class:`BindingsWatcher` watches your bindings file and, when the game (or you) changes it, re-reads it and swaps
+the new AHK keys into the already-created action classes and their live instances, so a running profile picks up
+rebinds without being restarted::
+
+    from voice_commander_elite.reload import BindingsWatcher
+
+    with BindingsWatcher():
+        profile.run()
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from . import actions
+from .cache import BindingsFingerprint, fingerprint_bindings_file, load_bound_actions
+from .keybinds import Binding, find_bindings_file, _live_press_actions
+from .table import BindingTable
+
+# serializes swaps with each other
+_swap_lock = threading.Lock()
+
+
+class BindingsDiff(NamedTuple):
+    added: dict[str, Binding]
+    removed: dict[str, Binding]
+    changed: dict[str, Binding]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+def diff_bindings(old: dict[str, Binding], new: dict[str, Binding]) -> BindingsDiff:
+    added = {name: b for name, b in new.items() if name not in old}
+    removed = {name: b for name, b in old.items() if name not in new}
+    changed = {
+        name: b for name, b in new.items()
+        if name in old and (old[name].device, old[name].key) != (b.device, b.key)
+    }
+    return BindingsDiff(added=added, removed=removed, changed=changed)
+
+
+def apply_bindings(new_bindings: dict[str, Binding]) -> BindingsDiff:
+    """
+    Make ``new_bindings`` the current bindings of :mod:`voice_commander_elite.actions`.
+
+    Existing action classes and their instances are updated in place with the new AHK keys. Actions whose binding
+    was removed (or can no longer be resolved to an AHK key) keep their last key but are no longer importable.
+    """
+    with _swap_lock:
+        diff = diff_bindings(actions._found_bindings, new_bindings)
+        if not diff:
+            return diff
+        table = BindingTable.from_bindings(new_bindings)
+        available: dict[str, Binding] = {}
+        new_keys: dict[str, str] = {}
+        for bindname, binding in new_bindings.items():
+            ahk_key = table.ahk_key(bindname)
+            if ahk_key is None:
+                print(f'Error ignored: Failed to register binding for {bindname}', f'no AHK key for {binding.key!r}', file=sys.stderr)
+                continue
+            available[f'{bindname}Action'] = binding
+            new_keys[bindname] = ahk_key
+
+        for action in list(actions._all_actions.values()):
+            ahk_key = new_keys.get(action.binding_name)
+            if ahk_key is not None and ahk_key != action.ahk_key:
+                action.ahk_key = ahk_key
+        for instance in list(_live_press_actions):
+            ahk_key = new_keys.get(instance.binding_name)
+            if ahk_key is not None and ahk_key != instance._bound_key:
+                instance._rebind(ahk_key)
+
+        for name in actions._all_actions:
+            if name not in available:
+                # keep the class around (in case the binding comes back), but stop exporting it
+                actions.__dict__.pop(name, None)
+        # replace (rather than mutate) so concurrent readers always see a complete mapping
+        actions._found_bindings = dict(new_bindings)
+        actions._table = table
+        actions._available_bindings = available
+        actions.__all__ = list(available)
+        return diff
+
+
+class _PollingWaiter:
+    def __init__(self, path: Path, interval: float):
+        self._path = path
+        self._interval = interval
+        self._last = self._stat()
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            st = os.stat(self._path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self._stat()
+            if current != self._last:
+                self._last = current
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self._interval, remaining))
+
+    def close(self) -> None:
+        pass
+
+
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_INOTIFY_EVENT = struct.Struct('iIII')
+
+
+class _InotifyWaiter:
+    def __init__(self, path: Path):
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or libc_name is None:
+            raise OSError('inotify is not available')
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._name = path.name.encode()
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        # watch the directory rather than the file: the game may replace the file instead of rewriting it
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        if libc.inotify_add_watch(self._fd, os.fsencode(path.parent), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, 'inotify_add_watch failed')
+
+    def wait(self, timeout: float) -> bool:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        offset = 0
+        matched = False
+        while offset < len(data):
+            _wd, _mask, _cookie, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if name == self._name:
+                matched = True
+        return matched
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class BindingsWatcher:
+    """
+    Background thread that reloads the bindings whenever the bindings file changes.
+
+    :param bindings_file: the file to watch. Defaults to :func:`~voice_commander_elite.keybinds.find_bindings_file`
+    :param debounce: seconds to wait for writes to settle before reloading
+    :param poll_interval: seconds between checks when inotify is not available
+    :param on_change: called with the :class:`BindingsDiff` after every reload that changed something
+    :param use_inotify: set to False to always use mtime polling
+    """
+    def __init__(
+        self,
+        bindings_file: str | Path | None = None,
+        *,
+        debounce: float = 0.5,
+        poll_interval: float = 1.0,
+        on_change: Callable[[BindingsDiff], None] | None = None,
+        use_inotify: bool = True,
+    ):
+        self.bindings_file = Path(bindings_file) if bindings_file is not None else find_bindings_file()
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.on_change = on_change
+        self._use_inotify = use_inotify
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._fingerprint: BindingsFingerprint | None = None
+
+    def _make_waiter(self) -> _InotifyWaiter | _PollingWaiter:
+        if self._use_inotify:
+            try:
+                return _InotifyWaiter(self.bindings_file)
+            except (OSError, AttributeError):
+                pass
+        return _PollingWaiter(self.bindings_file, self.poll_interval)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise RuntimeError('watcher already started')
+        try:
+            self._fingerprint = fingerprint_bindings_file(self.bindings_file)
+        except OSError:
+            self._fingerprint = None
+        self._stop.clear()
+        # set up the waiter before returning, so changes made right after start() are not missed
+        waiter = self._make_waiter()
+        self._thread = threading.Thread(target=self._run, args=(waiter,), name='voice-commander-elite-bindings-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> BindingsWatcher:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def reload(self) -> BindingsDiff | None:
+        """
+        Re-read the bindings file now and apply it if its contents changed. Returns the applied diff, if any.
+        """
+        try:
+            fingerprint = fingerprint_bindings_file(self.bindings_file)
+        except OSError:
+            # the file is being replaced; the next change event will pick up the new one
+            return None
+        if self._fingerprint is not None and fingerprint.digest == self._fingerprint.digest:
+            self._fingerprint = fingerprint
+            return None
+        try:
+            new_bindings = load_bound_actions(self.bindings_file, fingerprint=fingerprint)
+        except Exception as e:
+            print('Failed to reload bindings!', e, file=sys.stderr)
+            return None
+        self._fingerprint = fingerprint
+        diff = apply_bindings(new_bindings)
+        if diff and self.on_change is not None:
+            self.on_change(diff)
+        return diff
+
+    def _run(self, waiter: _InotifyWaiter | _PollingWaiter) -> None:
+        try:
+            while not self._stop.is_set():
+                if not waiter.wait(self.poll_interval):
+                    continue
+                # debounce: wait until the file has been quiet for a while
+                while not self._stop.is_set() and waiter.wait(self.debounce):
+                    pass
+                if not self._stop.is_set():
+                    self.reload()
+        finally:
+            waiter.close()
@@ -0,0 +1,336 @@
+"""
+Holding and repeating Elite Dangerous keybinds without blocking the caller.
+
+A :class:`KeyScheduler` owns the timing of key holds and repeated presses: scheduling one returns immediately and the
+key events are sent from the scheduler's own thread. Every job runs on a *channel* (by default the keybind name);
+starting a job cancels whatever is still running on the same channel, releasing a held key straight away.
+
+:class:`EliteHoldAction` and :class:`EliteRepeatAction` (also available as ``SomeAction.hold_for(...)`` and
+``SomeAction.repeat(...)`` on the generated action classes) schedule their presses on the shared scheduler.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import sys
+import threading
+import time
+from typing import Any, Callable, NamedTuple, Protocol
+
+from voice_commander.actions import ActionBase
+
+from . import actions
+from ._ahk import get_ahk
+from .keybinds import missing_binding_error
+from .pool import default_ordering_key
+
+
+class KeyBackend(Protocol):
+    def key_down(self, key: str) -> None: ...
+
+    def key_up(self, key: str) -> None: ...
+
+    def key_press(self, key: str) -> None: ...
+
+
+class AHKKeyBackend:
+    def key_down(self, key: str) -> None:
+        get_ahk().key_down(key)
+
+    def key_up(self, key: str) -> None:
+        get_ahk().key_up(key)
+
+    def key_press(self, key: str) -> None:
+        get_ahk().key_press(key)
+
+
+class _Step(NamedTuple):
+    #: seconds after the job was scheduled
+    offset: float
+    #: name of the KeyBackend method to call
+    event: str
+
+
+class ScheduledJob:
+    """Handle of a scheduled hold or repeat. :meth:`cancel` stops it and releases its key if it is held down."""
+    def __init__(self, scheduler: KeyScheduler, channel: str, key: str, steps: list[_Step]):
+        self.channel = channel
+        self.key = key
+        self._scheduler = scheduler
+        self._steps = steps
+        self._next = 0
+        self._key_is_down = False
+        self._cancelled = False
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait until the job has finished or was cancelled. Returns ``False`` on timeout."""
+        return self._done.wait(timeout)
+
+    def cancel(self) -> bool:
+        """Cancel the job. Returns ``False`` if it had already finished."""
+        with self._lock:
+            if self._done.is_set():
+                return False
+            self._cancelled = True
+            if self._key_is_down:
+                self._key_is_down = False
+                with default_ordering_key(self):
+                    self._scheduler._send('key_up', self.key)
+            self._done.set()
+        return True
+
+    def _run_step(self, index: int) -> None:
+        with self._lock:
+            if self._done.is_set():
+                return
+            event = self._steps[index].event
+            # keyed on the job, so its key down and up stay in order on an AHKPool even when cancelled from another thread
+            with default_ordering_key(self):
+                self._scheduler._send(event, self.key)
+            if event == 'key_down':
+                self._key_is_down = True
+            elif event == 'key_up':
+                self._key_is_down = False
+            if index == len(self._steps) - 1:
+                self._done.set()
+
+    def __repr__(self) -> str:
+        state = 'cancelled' if self._cancelled else 'done' if self.done() else 'pending'
+        return f'<ScheduledJob channel={self.channel!r} key={self.key!r} {state}>'
+
+
+class KeyScheduler:
+    """
+    Runs key holds and repeated presses on a background thread.
+
+    :param backend: where key events are sent. Defaults to AutoHotkey.
+    :param clock: monotonic clock, in seconds
+    :param threaded: run due key events on a background thread (started on first use). With ``threaded=False``,
+                     nothing is sent until :meth:`run_due` is called, which together with a fake ``clock`` makes the timing
+                     fully deterministic.
+    """
+    def __init__(self, backend: KeyBackend | None = None, *, clock: Callable[[], float] = time.monotonic, threaded: bool = True):
+        self.backend: KeyBackend = backend if backend is not None else AHKKeyBackend()
+        self._clock = clock
+        self._threaded = threaded
+        self._queue: list[tuple[float, int, ScheduledJob, int]] = []
+        self._counter = itertools.count()
+        self._channels: dict[str, ScheduledJob] = {}
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+
+    def hold(self, key: str, duration: float, *, channel: str | None = None) -> ScheduledJob:
+        """Hold ``key`` down for ``duration`` seconds."""
+        if duration < 0:
+            raise ValueError(f'duration must not be negative (got {duration!r})')
+        return self._schedule(key, [_Step(0.0, 'key_down'), _Step(duration, 'key_up')], channel)
+
+    def repeat(self, key: str, count: int, interval: float, *, channel: str | None = None) -> ScheduledJob:
+        """Press ``key`` ``count`` times, ``interval`` seconds apart."""
+        if count < 1:
+            raise ValueError(f'count must be at least 1 (got {count!r})')
+        if interval < 0:
+            raise ValueError(f'interval must not be negative (got {interval!r})')
+        return self._schedule(key, [_Step(i * interval, 'key_press') for i in range(count)], channel)
+
+    def _schedule(self, key: str, steps: list[_Step], channel: str | None) -> ScheduledJob:
+        channel = key if channel is None else channel
+        job = ScheduledJob(self, channel, key, steps)
+        with self._condition:
+            previous = self._channels.get(channel)
+            self._channels[channel] = job
+        if previous is not None:
+            previous.cancel()
+        now = self._clock()
+        with self._condition:
+            for index, step in enumerate(steps):
+                heapq.heappush(self._queue, (now + step.offset, next(self._counter), job, index))
+            self._condition.notify()
+        if self._threaded:
+            self.start()
+        return job
+
+    def cancel(self, channel: str) -> bool:
+        """Cancel the job running on ``channel``, if any."""
+        with self._condition:
+            job = self._channels.pop(channel, None)
+        return job is not None and job.cancel()
+
+    def cancel_all(self) -> None:
+        with self._condition:
+            jobs = list(self._channels.values())
+            self._channels.clear()
+        for job in jobs:
+            job.cancel()
+
+    def pending(self) -> list[ScheduledJob]:
+        with self._condition:
+            return [job for job in self._channels.values() if not job.done()]
+
+    def next_due(self) -> float | None:
+        """Clock time at which the next key event is due, or ``None`` if nothing is scheduled."""
+        with self._condition:
+            self._discard_finished()
+            return self._queue[0][0] if self._queue else None
+
+    def run_due(self) -> int:
+        """Send every key event that is due by now. Returns the number of events processed."""
+        processed = 0
+        while True:
+            with self._condition:
+                self._discard_finished()
+                if not self._queue or self._queue[0][0] > self._clock():
+                    return processed
+                _due, _, job, index = heapq.heappop(self._queue)
+            job._run_step(index)
+            processed += 1
+
+    def _discard_finished(self) -> None:
+        while self._queue and self._queue[0][2].done():
+            heapq.heappop(self._queue)
+
+    def _send(self, event: str, key: str) -> None:
+        try:
+            getattr(self.backend, event)(key)
+        except Exception as e:
+            print(f'Error ignored: failed to send {event} for {key!r}:', e, file=sys.stderr)
+
+    def start(self) -> None:
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name='voice-commander-elite-key-scheduler', daemon=True)
+            self._thread.start()
+
+    def stop(self, *, cancel: bool = True) -> None:
+        """Stop the background thread, by default cancelling (and releasing) everything still scheduled."""
+        if cancel:
+            self.cancel_all()
+        with self._condition:
+            thread = self._thread
+            self._stopping = True
+            self._thread = None
+            self._condition.notify()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            self.run_due()
+            with self._condition:
+                if self._stopping:
+                    return
+                self._discard_finished()
+                timeout = self._queue[0][0] - self._clock() if self._queue else None
+                if timeout is None or timeout > 0:
+                    self._condition.wait(timeout)
+
+    def __enter__(self) -> KeyScheduler:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+
+_scheduler: KeyScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> KeyScheduler:
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = KeyScheduler()
+    return _scheduler
+
+
+def set_scheduler(scheduler: KeyScheduler | None) -> None:
+    """Replace the shared scheduler (e.g. with one using a fake backend or clock). ``None`` restores the default."""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = scheduler
+
+
+class _ScheduledEliteAction(ActionBase):
+    def __init__(self, binding_name: str, *, channel: str | None = None, **kwargs: Any):
+        if binding_name not in actions._table:
+            raise ValueError(f'unknown Elite Dangerous keybind {binding_name!r}')
+        self.binding_name = binding_name
+        self.channel = channel
+        super().__init__(**kwargs)
+
+    def _ahk_key(self) -> str:
+        # looked up on every press so that reloaded bindings are picked up
+        ahk_key = actions._table.ahk_key(self.binding_name)
+        if ahk_key is None:
+            raise missing_binding_error(self.binding_name)
+        return ahk_key
+
+    @property
+    def _channel(self) -> str:
+        return self.binding_name if self.channel is None else self.channel
+
+    def _config(self) -> dict[str, Any]:
+        config: dict[str, Any] = {'binding_name': self.binding_name}
+        if self.channel is not None:
+            config['channel'] = self.channel
+        return config
+
+    def to_dict(self) -> dict[str, Any]:
+        return {'action_type': self.fqn(), 'action_config': self._config()}
+
+
+class EliteHoldAction(_ScheduledEliteAction):
+    """
+    Hold an Elite Dangerous keybind down for ``duration`` seconds, e.g. ``EliteHoldAction('UseBoostJuice', 2)``.
+
+    :param channel: jobs on the same channel cancel each other. Defaults to the keybind name, so saying the command
+                    again restarts the hold; give related keybinds (e.g. forward and reverse thrust) a common channel
+                    so that one interrupts the other.
+    """
+    def __init__(self, binding_name: str, duration: float, *, channel: str | None = None, **kwargs: Any):
+        if duration < 0:
+            raise ValueError(f'duration must not be negative (got {duration!r})')
+        self.duration = duration
+        super().__init__(binding_name, channel=channel, **kwargs)
+
+    def perform(self, *args: Any, **kwargs: Any) -> ScheduledJob:
+        return get_scheduler().hold(self._ahk_key(), self.duration, channel=self._channel)
+
+    def _config(self) -> dict[str, Any]:
+        return {**super()._config(), 'duration': self.duration}
+
+
+class EliteRepeatAction(_ScheduledEliteAction):
+    """
+    Press an Elite Dangerous keybind ``count`` times, ``interval`` seconds apart,
+    e.g. ``EliteRepeatAction('IncreaseEnginesPower', 4)``.
+
+    :param channel: see :class:`EliteHoldAction`
+    """
+    def __init__(self, binding_name: str, count: int, interval: float = 0.1, *, channel: str | None = None, **kwargs: Any):
+        if count < 1:
+            raise ValueError(f'count must be at least 1 (got {count!r})')
+        if interval < 0:
+            raise ValueError(f'interval must not be negative (got {interval!r})')
+        self.count = count
+        self.interval = interval
+        super().__init__(binding_name, channel=channel, **kwargs)
+
+    def perform(self, *args: Any, **kwargs: Any) -> ScheduledJob:
+        return get_scheduler().repeat(self._ahk_key(), self.count, self.interval, channel=self._channel)
+
+    def _config(self) -> dict[str, Any]:
+        return {**super()._config(), 'count': self.count, 'interval': self.interval}
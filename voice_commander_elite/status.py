@@ -0,0 +1,183 @@
+"""
+Reading Elite Dangerous' ``Status.json``.
+
+The game rewrites ``Status.json`` several times per second while it is running. A :class:`StatusReader` only
+re-reads and decodes the file when its mtime or size has changed, and otherwise serves the last decoded
+:class:`StatusSnapshot` from memory.
+"""
+from __future__ import annotations
+
+import enum
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Generic, Mapping, TypeVar
+
+JOURNAL_DIR_ENV = 'VOICE_COMMANDER_ELITE_JOURNAL_DIR'
+
+SAVED_GAMES_JOURNAL_DIR = os.path.expanduser('~/Saved Games/Frontier Developments/Elite Dangerous')
+
+SnapshotT = TypeVar('SnapshotT')
+
+
+def find_journal_dir() -> Path:
+    """The directory Elite writes its journal and companion files (``Status.json`` etc.) to."""
+    if JOURNAL_DIR_ENV in os.environ:
+        return Path(os.environ[JOURNAL_DIR_ENV])
+    return Path(SAVED_GAMES_JOURNAL_DIR)
+
+
+class StatusFlags(enum.IntFlag):
+    DOCKED = 1 << 0
+    LANDED = 1 << 1
+    LANDING_GEAR_DOWN = 1 << 2
+    SHIELDS_UP = 1 << 3
+    SUPERCRUISE = 1 << 4
+    FLIGHT_ASSIST_OFF = 1 << 5
+    HARDPOINTS_DEPLOYED = 1 << 6
+    IN_WING = 1 << 7
+    LIGHTS_ON = 1 << 8
+    CARGO_SCOOP_DEPLOYED = 1 << 9
+    SILENT_RUNNING = 1 << 10
+    SCOOPING_FUEL = 1 << 11
+    SRV_HANDBRAKE = 1 << 12
+    SRV_TURRET_VIEW = 1 << 13
+    SRV_TURRET_RETRACTED = 1 << 14
+    SRV_DRIVE_ASSIST = 1 << 15
+    FSD_MASS_LOCKED = 1 << 16
+    FSD_CHARGING = 1 << 17
+    FSD_COOLDOWN = 1 << 18
+    LOW_FUEL = 1 << 19
+    OVER_HEATING = 1 << 20
+    HAS_LAT_LONG = 1 << 21
+    IS_IN_DANGER = 1 << 22
+    BEING_INTERDICTED = 1 << 23
+    IN_MAIN_SHIP = 1 << 24
+    IN_FIGHTER = 1 << 25
+    IN_SRV = 1 << 26
+    HUD_IN_ANALYSIS_MODE = 1 << 27
+    NIGHT_VISION = 1 << 28
+    ALTITUDE_FROM_AVERAGE_RADIUS = 1 << 29
+    FSD_JUMP = 1 << 30
+    SRV_HIGH_BEAM = 1 << 31
+
+
+class StatusSnapshot:
+    """Immutable, decoded contents of one version of ``Status.json``."""
+    __slots__ = ('flags', 'data', 'timestamp')
+
+    def __init__(self, flags: StatusFlags, data: Mapping[str, Any]):
+        self.flags: StatusFlags = flags
+        self.data: Mapping[str, Any] = MappingProxyType(dict(data))
+        self.timestamp: str | None = data.get('timestamp')
+
+    def __contains__(self, flag: StatusFlags) -> bool:
+        return flag in self.flags
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(flags={self.flags!r}, timestamp={self.timestamp!r})'
+
+
+EMPTY_STATUS = StatusSnapshot(StatusFlags(0), {})
+
+
+class CachedJsonFile(Generic[SnapshotT]):
+    """
+    A JSON file the game rewrites in place, decoded into immutable snapshots. The file is only re-read when its mtime
+    or size has changed; otherwise the last snapshot is served from memory.
+
+    Subclasses set ``empty`` (the snapshot before the file could first be read) and implement :meth:`_decode`.
+
+    :param path: the file
+    :param min_interval: seconds during which a snapshot is reused without even checking the file's mtime
+    :param clock: monotonic clock, in seconds
+    """
+    empty: SnapshotT
+
+    def __init__(self, path: str | Path, *, min_interval: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        self.path = Path(path)
+        self.min_interval = min_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stat_key: tuple[int, int] | None = None
+        self._checked_at: float | None = None
+        self._snapshot = self.empty
+
+    def snapshot(self) -> SnapshotT:
+        """The current contents. Only reads the file if it changed since the last call."""
+        now = self._clock()
+        if self._checked_at is not None and now - self._checked_at < self.min_interval:
+            return self._snapshot
+        with self._lock:
+            self._checked_at = now
+            try:
+                st = os.stat(self.path)
+            except OSError:
+                # the game is not running (or the file is being replaced); keep the last known contents
+                return self._snapshot
+            stat_key = (st.st_mtime_ns, st.st_size)
+            if stat_key == self._stat_key:
+                return self._snapshot
+            snapshot = self._read()
+            if snapshot is not None:
+                self._snapshot = snapshot
+                self._stat_key = stat_key
+            return self._snapshot
+
+    def _read(self) -> SnapshotT | None:
+        try:
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+            data = json.loads(raw)
+        except (OSError, ValueError):
+            # partially written: try again on the next check
+            return None
+        if not isinstance(data, dict):
+            return None
+        return self._decode(data)
+
+    def _decode(self, data: dict[str, Any]) -> SnapshotT:
+        raise NotImplementedError
+
+
+class StatusReader(CachedJsonFile[StatusSnapshot]):
+    """
+    Cached reader of ``Status.json``.
+
+    :param path: the status file. Defaults to ``Status.json`` in :func:`find_journal_dir`
+    :param min_interval: seconds during which a snapshot is reused without even checking the file's mtime
+    :param clock: monotonic clock, in seconds
+    """
+    empty = EMPTY_STATUS
+
+    def __init__(self, path: str | Path | None = None, *, min_interval: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        super().__init__(path if path is not None else find_journal_dir() / 'Status.json', min_interval=min_interval, clock=clock)
+
+    def _decode(self, data: dict[str, Any]) -> StatusSnapshot:
+        return StatusSnapshot(StatusFlags(data.get('Flags', 0) & 0xFFFFFFFF), data)
+
+    def has_flag(self, flag: StatusFlags) -> bool:
+        return flag in self.snapshot().flags
+
+
+_reader: StatusReader | None = None
+_reader_lock = threading.Lock()
+
+
+def get_status_reader() -> StatusReader:
+    global _reader
+    if _reader is None:
+        with _reader_lock:
+            if _reader is None:
+                _reader = StatusReader()
+    return _reader
+
+
+def set_status_reader(reader: StatusReader | None) -> None:
+    """Replace the shared reader (e.g. with one for a fixture file). ``None`` restores the default."""
+    global _reader
+    with _reader_lock:
+        _reader = reader
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from typing import Iterable, Iterator, Sequence
+
+from .keybinds import AHK_KEY_MAPPING, KEYBINDS, Binding, BindingDevice
+
+# marks unbound/unresolved entries in the compact arrays
+_NONE = -1
+
+
+class BindingTable:
+    """
+    Frozen, index-based table of bindings.
+
+    Every keybind name (all of ``KEYBINDS``, plus any other names found in the bindings file) is interned to an
+    integer index. The device, key and resolved AHK key of each entry are kept in parallel compact arrays, so lookups
+    by name or by index are O(1) and a fully loaded table holds only a handful of objects.
+    :class:`~voice_commander_elite.keybinds.Binding` objects are only created as views, on request.
+    """
+    __slots__ = ('_names', '_index', '_devices', '_keys', '_ahk_keys', '_key_strings', '_ahk_key_strings')
+
+    def __init__(self, bindings: Iterable[Binding], names: Sequence[str] = KEYBINDS):
+        bindings = list(bindings)
+        all_names = list(dict.fromkeys([*names, *(b.name for b in bindings)]))
+        index = {sys.intern(name): i for i, name in enumerate(all_names)}
+        devices = array('b', [_NONE]) * len(all_names)
+        keys = array('h', [_NONE]) * len(all_names)
+        ahk_keys = array('h', [_NONE]) * len(all_names)
+        key_strings: dict[str, int] = {}
+        ahk_key_strings: dict[str, int] = {}
+        for binding in bindings:
+            i = index[binding.name]
+            devices[i] = binding.device
+            keys[i] = key_strings.setdefault(binding.key, len(key_strings))
+            ahk_key = AHK_KEY_MAPPING[binding.device].get(binding.key)
+            if ahk_key:
+                ahk_keys[i] = ahk_key_strings.setdefault(ahk_key, len(ahk_key_strings))
+        set_ = object.__setattr__
+        set_(self, '_names', tuple(index))
+        set_(self, '_index', index)
+        set_(self, '_devices', devices)
+        set_(self, '_keys', keys)
+        set_(self, '_ahk_keys', ahk_keys)
+        set_(self, '_key_strings', tuple(key_strings))
+        set_(self, '_ahk_key_strings', tuple(ahk_key_strings))
+
+    @classmethod
+    def from_bindings(cls, bindings: dict[str, Binding]) -> BindingTable:
+        return cls(bindings.values())
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        """Whether ``name`` is a known keybind name (bound or not)."""
+        return name in self._index
+
+    def __iter__(self) -> Iterator[Binding]:
+        """Iterate over the bound entries, as :class:`~voice_commander_elite.keybinds.Binding` views."""
+        for i, device in enumerate(self._devices):
+            if device != _NONE:
+                yield self._view(i)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} names={len(self)} bound={self.bound_count()}>'
+
+    def _view(self, i: int) -> Binding:
+        return Binding(name=self._names[i], device=BindingDevice(self._devices[i]), key=self._key_strings[self._keys[i]])
+
+    def index(self, name: str) -> int:
+        """Index of keybind ``name``. Raises ``KeyError`` for unknown names."""
+        return self._index[name]
+
+    def name(self, index: int) -> str:
+        return self._names[index]
+
+    def is_bound(self, name_or_index: str | int) -> bool:
+        i = self._resolve_index(name_or_index)
+        return i is not None and self._devices[i] != _NONE
+
+    def get(self, name_or_index: str | int) -> Binding | None:
+        """The binding for a name or index, or ``None`` if it is unknown or not bound to a keyboard key or mouse button."""
+        i = self._resolve_index(name_or_index)
+        if i is None or self._devices[i] == _NONE:
+            return None
+        return self._view(i)
+
+    def ahk_key(self, name_or_index: str | int) -> str | None:
+        """The resolved AHK key for a name or index, or ``None`` if it is unbound or has no AHK equivalent."""
+        # hot path: inlined name lookup
+        if type(name_or_index) is str:
+            i = self._index.get(name_or_index)
+        else:
+            i = self._resolve_index(name_or_index)
+        if i is None:
+            return None
+        ahk = self._ahk_keys[i]
+        if ahk == _NONE:
+            return None
+        return self._ahk_key_strings[ahk]
+
+    def bound_count(self) -> int:
+        return len(self._devices) - self._devices.count(_NONE)
+
+    def _resolve_index(self, name_or_index: str | int) -> int | None:
+        if isinstance(name_or_index, int):
+            if 0 <= name_or_index < len(self._names):
+                return name_or_index
+            return None
+        return self._index.get(name_or_index)
@@ -0,0 +1,113 @@
+"""
+"Ensure on/off" variants of Elite Dangerous toggle keybinds.
+
+A toggle keybind such as ``LandingGearToggle`` flips a state that the game reports in ``Status.json``.
+:class:`EliteEnsureStateAction` looks at that state first (through the shared, change-aware
+:class:`~voice_commander_elite.status.StatusReader`) and only presses the key when the state has to change,
+then waits for the game to confirm the change. Saying "deploy landing gear" twice therefore does not retract it again.
+"""
+from __future__ import annotations
+
+import sys
+import time
+from typing import Any
+
+from voice_commander.actions import ActionBase
+
+from . import actions
+from .status import EMPTY_STATUS, StatusFlags, get_status_reader
+
+#: toggle keybind -> the Status.json flag that is set while the toggled state is "on"
+TOGGLE_FLAGS: dict[str, StatusFlags] = {
+    'LandingGearToggle': StatusFlags.LANDING_GEAR_DOWN,
+    'DeployHardpointToggle': StatusFlags.HARDPOINTS_DEPLOYED,
+    'ToggleCargoScoop': StatusFlags.CARGO_SCOOP_DEPLOYED,
+    'ToggleCargoScoop_Buggy': StatusFlags.CARGO_SCOOP_DEPLOYED,
+    'ShipSpotLightToggle': StatusFlags.LIGHTS_ON,
+    'HeadlightsBuggyButton': StatusFlags.LIGHTS_ON,
+    'NightVisionToggle': StatusFlags.NIGHT_VISION,
+    'ToggleButtonUpInput': StatusFlags.SILENT_RUNNING,
+    'ToggleFlightAssist': StatusFlags.FLIGHT_ASSIST_OFF,
+    'ToggleDriveAssist': StatusFlags.SRV_DRIVE_ASSIST,
+}
+
+
+class EliteEnsureStateAction(ActionBase):
+    """
+    Press a toggle keybind only if ``flag`` is not already in the wanted state, e.g.
+    ``EliteEnsureStateAction('LandingGearToggle', True)`` deploys the landing gear unless it is already down.
+
+    Note that for ``ToggleFlightAssist`` the flag is ``FLIGHT_ASSIST_OFF``, so ``state=True`` turns flight assist *off*.
+
+    :param binding_name: the toggle keybind
+    :param state: whether ``flag`` should be set afterwards
+    :param flag: the ``Status.json`` flag the keybind toggles. Defaults to the one in :data:`TOGGLE_FLAGS`.
+    :param confirm_timeout: seconds to wait for the game to report the new state after pressing the key (``0``: don't wait)
+    :param poll_interval: seconds between checks while waiting. The status file is only re-read when it has changed.
+    """
+    def __init__(
+        self,
+        binding_name: str,
+        state: bool,
+        *,
+        flag: StatusFlags | str | None = None,
+        confirm_timeout: float = 1.0,
+        poll_interval: float = 0.05,
+        **kwargs: Any,
+    ):
+        if binding_name not in actions._table:
+            raise ValueError(f'unknown Elite Dangerous keybind {binding_name!r}')
+        if flag is None:
+            if binding_name not in TOGGLE_FLAGS:
+                raise ValueError(f'no status flag is known for {binding_name!r}; pass flag= explicitly')
+            self.flag = TOGGLE_FLAGS[binding_name]
+            self._explicit_flag = False
+        else:
+            self.flag = flag if isinstance(flag, StatusFlags) else StatusFlags[flag]
+            self._explicit_flag = True
+        self.binding_name = binding_name
+        self.state = state
+        self.confirm_timeout = confirm_timeout
+        self.poll_interval = poll_interval
+        self._press_action: Any = None
+        super().__init__(**kwargs)
+
+    def _is_in_state(self) -> bool | None:
+        snapshot = get_status_reader().snapshot()
+        if snapshot is EMPTY_STATUS:
+            return None
+        return (self.flag in snapshot.flags) == self.state
+
+    def perform(self, *args: Any, **kwargs: Any) -> bool:
+        """Returns ``True`` if the key was pressed."""
+        in_state = self._is_in_state()
+        if in_state is None:
+            print(f'Error ignored: not pressing {self.binding_name}, the game status is unknown (is Elite Dangerous running?)', file=sys.stderr)
+            return False
+        if in_state:
+            return False
+        if self._press_action is None:
+            self._press_action = getattr(actions, f'{self.binding_name}Action')()
+        self._press_action.perform(*args, **kwargs)
+        if self.confirm_timeout > 0 and not self.wait_for_state(self.confirm_timeout):
+            print(f'Error ignored: {self.flag.name} did not become {self.state} within {self.confirm_timeout}s after pressing {self.binding_name}', file=sys.stderr)
+        return True
+
+    def wait_for_state(self, timeout: float) -> bool:
+        """Wait until the game reports the wanted state. Returns ``False`` on timeout."""
+        deadline = time.monotonic() + timeout
+        while not self._is_in_state():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+        return True
+
+    def to_dict(self) -> dict[str, Any]:
+        config: dict[str, Any] = {'binding_name': self.binding_name, 'state': self.state}
+        if self._explicit_flag:
+            config['flag'] = self.flag.name
+        if self.confirm_timeout != 1.0:
+            config['confirm_timeout'] = self.confirm_timeout
+        if self.poll_interval != 0.05:
+            config['poll_interval'] = self.poll_interval
+        return {'action_type': self.fqn(), 'action_config': config}
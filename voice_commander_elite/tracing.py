@@ -0,0 +1,158 @@
+"""
+Opt-in latency tracing of Elite actions and conditions while a profile runs.
+
+When enabled (set ``VOICE_COMMANDER_ELITE_TRACE=1`` or call :func:`enable`), every
+:class:`~voice_commander_elite.keybinds.ElitePressAction` send and every condition check from
+:mod:`voice_commander_elite.conditions` is timed. Events are kept in a fixed-size ring buffer, and the most recent
+durations per action/condition are summarized as p50/p95/p99 in :meth:`LatencyTracer.snapshot`.
+
+A send that follows successful condition checks on the same thread is also recorded as a ``trigger`` event, spanning
+from the start of the first check to the end of the send.
+
+When disabled, the hooks cost a single global lookup.
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, NamedTuple
+
+TRACE_ENV = 'VOICE_COMMANDER_ELITE_TRACE'
+
+_enabled = os.environ.get(TRACE_ENV, '') not in ('', '0')
+
+# condition checks older than this are not attributed to the next send
+_MAX_TRIGGER_GAP = 5.0
+
+
+class TraceEvent(NamedTuple):
+    #: ``'condition'``, ``'send'`` or ``'trigger'``
+    kind: str
+    #: keybind name for sends and triggers, condition class name for conditions
+    name: str
+    #: ``time.perf_counter()`` timestamps, in seconds
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    # nearest-rank: the smallest value with at least ``fraction`` of the values at or below it
+    index = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+class LatencyTracer:
+    """
+    :param capacity: number of most recent events kept in the ring buffer
+    :param window: number of most recent durations per (kind, name) used for the percentiles
+    """
+    def __init__(self, *, capacity: int = 4096, window: int = 1024):
+        self.capacity = capacity
+        self.window = window
+        self._events: deque[TraceEvent] = deque(maxlen=capacity)
+        self._durations: dict[tuple[str, str], deque[float]] = {}
+        self._counts: dict[tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        self._pending = threading.local()
+
+    def record(self, kind: str, name: str, start: float, end: float) -> None:
+        key = (kind, name)
+        with self._lock:
+            self._events.append(TraceEvent(kind, name, start, end))
+            durations = self._durations.get(key)
+            if durations is None:
+                durations = self._durations[key] = deque(maxlen=self.window)
+            durations.append(end - start)
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def record_condition(self, name: str, start: float, end: float, result: Any) -> None:
+        self.record('condition', name, start, end)
+        if not result:
+            # the trigger will not fire, so nothing should be attributed to it
+            self._pending.start = None
+        elif getattr(self._pending, 'start', None) is None:
+            self._pending.start = start
+
+    def record_send(self, name: str, start: float, end: float) -> None:
+        self.record('send', name, start, end)
+        trigger_start = getattr(self._pending, 'start', None)
+        if trigger_start is not None:
+            self._pending.start = None
+            if start - trigger_start <= _MAX_TRIGGER_GAP:
+                self.record('trigger', name, trigger_start, end)
+
+    def events(self) -> list[TraceEvent]:
+        with self._lock:
+            return list(self._events)
+
+    def stats(self) -> dict[str, dict[str, dict[str, float]]]:
+        """``{kind: {name: {'count', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'mean_ms'}}}``, slowest p95 first."""
+        with self._lock:
+            windows = {key: sorted(durations) for key, durations in self._durations.items()}
+            counts = dict(self._counts)
+        stats: dict[str, dict[str, dict[str, float]]] = {}
+        for (kind, name), ordered in windows.items():
+            stats.setdefault(kind, {})[name] = {
+                'count': counts[(kind, name)],
+                'p50_ms': _percentile(ordered, 0.50) * 1e3,
+                'p95_ms': _percentile(ordered, 0.95) * 1e3,
+                'p99_ms': _percentile(ordered, 0.99) * 1e3,
+                'max_ms': ordered[-1] * 1e3,
+                'mean_ms': sum(ordered) / len(ordered) * 1e3,
+            }
+        return {kind: dict(sorted(names.items(), key=lambda item: -item[1]['p95_ms'])) for kind, names in stats.items()}
+
+    def snapshot(self, *, include_events: bool = False) -> dict[str, Any]:
+        snapshot: dict[str, Any] = {'taken_at': time.time(), 'stats': self.stats()}
+        if include_events:
+            snapshot['events'] = [event._asdict() for event in self.events()]
+        return snapshot
+
+    def to_json(self, *, include_events: bool = False, **kwargs: Any) -> str:
+        return json.dumps(self.snapshot(include_events=include_events), **kwargs)
+
+    def dump_json(self, path: str | Path, *, include_events: bool = False) -> None:
+        Path(path).write_text(self.to_json(include_events=include_events, indent=2), encoding='utf-8')
+
+    def reset(self) -> None:
+        with self._lock:
+            self._events.clear()
+            self._durations.clear()
+            self._counts.clear()
+            self._pending = threading.local()
+
+
+_tracer = LatencyTracer()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def get_tracer() -> LatencyTracer:
+    return _tracer
+
+
+def set_tracer(tracer: LatencyTracer | None) -> None:
+    """Replace the shared tracer (e.g. with a larger buffer). ``None`` restores a fresh default one."""
+    global _tracer
+    _tracer = tracer if tracer is not None else LatencyTracer()
@@ -0,0 +1,284 @@
+"""
+Check many Elite Dangerous bindings files at once, e.g. a squadron's shared profile library.
+
+For every file, reports which :data:`~voice_commander_elite.keybinds.KEYBINDS` resolve to an AHK key, which are bound
+to a key that has no AHK equivalent in :data:`~voice_commander_elite.keybinds.AHK_KEY_MAPPING`, and which are only
+bound to a joystick. Files are parsed on a pool of worker processes and reported as each one finishes.
+
+Usage::
+
+    python -m voice_commander_elite.validate [--jobs N] [--timeout SECONDS] [--json] PATH [PATH ...]
+
+where each ``PATH`` is a ``.binds`` file or a directory to search for them.
+"""
+from __future__ import annotations
+
+import argparse
+import collections
+import json
+import multiprocessing
+import os
+import queue
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Iterable, Iterator, NamedTuple
+
+from . import _VALIDATION_WORKER_PREFIX
+from .keybinds import KEYBINDS, _extract_streamed_binding, read_bound_actions, resolve_ahk_key, unresolved_reason
+
+_KEYBIND_NAMES = frozenset(KEYBINDS)
+
+
+class BindsReport(NamedTuple):
+    path: str
+    #: keybind name -> AHK key
+    resolved: dict[str, str]
+    #: keybind name -> why its keyboard/mouse key has no AHK key (see :func:`~voice_commander_elite.keybinds.unresolved_reason`)
+    unmapped: dict[str, str]
+    joystick_only: list[str]
+    #: keybinds that are not bound at all (or missing from the file)
+    unbound: list[str]
+    #: set when the file could not be checked; the other fields are then empty
+    error: str | None = None
+    #: seconds spent checking the file
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> dict[str, Any]:
+        return self._asdict()
+
+    @classmethod
+    def failed(cls, path: str | Path, error: str, elapsed: float = 0.0) -> BindsReport:
+        return cls(str(path), {}, {}, [], [], error, elapsed)
+
+
+def _is_joystick_only(elem: ET.Element) -> bool:
+    return any(
+        inner is not None and inner.get('Device', '') not in ('', '{NoDevice}')
+        for inner in (elem.find('.//Primary'), elem.find('.//Secondary'))
+    )
+
+
+def validate_bindings_file(bindings_file: str | Path) -> BindsReport:
+    """Check a single bindings file in this process."""
+    start = time.perf_counter()
+    resolved: dict[str, str] = {}
+    unmapped: dict[str, str] = {}
+    joystick_only: list[str] = []
+    try:
+        depth = 0
+        root: ET.Element | None = None
+        for event, elem in ET.iterparse(Path(bindings_file), events=('start', 'end')):
+            if event == 'start':
+                if depth == 0:
+                    root = elem
+                depth += 1
+                continue
+            depth -= 1
+            if depth != 1:
+                continue
+            assert root is not None
+            if elem.tag in _KEYBIND_NAMES:
+                binding = _extract_streamed_binding(elem)
+                if binding is not None:
+                    reason = unresolved_reason(binding)
+                    if reason is None:
+                        resolved[binding.name] = resolve_ahk_key(binding)
+                    else:
+                        unmapped[binding.name] = reason
+                elif _is_joystick_only(elem):
+                    joystick_only.append(elem.tag)
+            root.clear()
+    except ET.ParseError:
+        # not well-formed; the lenient parser still finds keyboard/mouse bindings, but cannot tell joystick-only ones apart
+        resolved.clear()
+        unmapped.clear()
+        joystick_only.clear()
+        try:
+            bindings = read_bound_actions(bindings_file)
+        except Exception as e:
+            return BindsReport.failed(bindings_file, repr(e), time.perf_counter() - start)
+        for name, binding in bindings.items():
+            if name not in _KEYBIND_NAMES:
+                continue
+            reason = unresolved_reason(binding)
+            if reason is None:
+                resolved[name] = resolve_ahk_key(binding)
+            else:
+                unmapped[name] = reason
+    except Exception as e:
+        return BindsReport.failed(bindings_file, repr(e), time.perf_counter() - start)
+    seen = resolved.keys() | unmapped.keys() | set(joystick_only)
+    unbound = [name for name in KEYBINDS if name not in seen]
+    return BindsReport(str(bindings_file), resolved, unmapped, joystick_only, unbound, None, time.perf_counter() - start)
+
+
+def find_binds_files(paths: Iterable[str | Path]) -> list[Path]:
+    """Expand directories (recursively) into the ``.binds`` files they contain."""
+    found = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            found.extend(sorted(path.rglob('*.binds')))
+        else:
+            found.append(path)
+    return found
+
+
+def _worker(tasks: Any, results: Any, worker_id: int) -> None:
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        index, path = task
+        results.put((worker_id, 'start', index, None))
+        try:
+            report = validate_bindings_file(path)
+        except BaseException as e:
+            report = BindsReport.failed(path, repr(e))
+        results.put((worker_id, 'done', index, report))
+
+
+def iter_validate(
+    paths: Iterable[str | Path],
+    *,
+    jobs: int | None = None,
+    timeout: float | None = None,
+    start_method: str | None = None,
+) -> Iterator[BindsReport]:
+    """
+    Check bindings files on worker processes, yielding a report for each file as soon as it is done (in completion order).
+
+    :param paths: ``.binds`` files
+    :param jobs: number of worker processes. Defaults to the number of CPUs; ``0`` checks the files in this process, one after another.
+    :param timeout: seconds a single file may take. A worker that exceeds it is terminated and replaced,
+                    and the file is reported with an error.
+    :param start_method: the :mod:`multiprocessing` start method of the workers (e.g. ``'spawn'``). Defaults to the platform's.
+                         Workers do not load your bindings when they import this package.
+    """
+    paths = [str(path) for path in paths]
+    if not paths:
+        return
+    if jobs == 0:
+        for path in paths:
+            yield validate_bindings_file(path)
+        return
+    jobs = min(jobs or os.cpu_count() or 1, len(paths))
+
+    context = multiprocessing.get_context(start_method)
+    pending = collections.deque(enumerate(paths))
+    results = context.Queue()
+    # each worker has its own task queue and is handed one file at a time, so the file a terminated worker was
+    # checking is always known and no other file is lost with it. Worker ids are never reused: messages from a
+    # worker that was already terminated (e.g. a late 'start') are dropped.
+    workers: dict[int, tuple[Any, Any]] = {}
+    # worker id -> (index of the file it was handed, when it reported starting on it)
+    running: dict[int, tuple[int, float | None]] = {}
+
+    def dispatch(worker_id: int) -> None:
+        tasks = workers[worker_id][1]
+        if pending:
+            index, path = pending.popleft()
+            running[worker_id] = (index, None)
+            tasks.put((index, path))
+        else:
+            tasks.put(None)
+
+    def spawn(worker_id: int) -> None:
+        tasks = context.Queue()
+        # the name tells the package not to load the user's bindings when a spawned worker imports it
+        process = context.Process(target=_worker, args=(tasks, results, worker_id), name=f'{_VALIDATION_WORKER_PREFIX}{worker_id}', daemon=True)
+        process.start()
+        workers[worker_id] = (process, tasks)
+        dispatch(worker_id)
+
+    for worker_id in range(jobs):
+        spawn(worker_id)
+    next_worker_id = jobs
+    remaining = len(paths)
+    try:
+        while remaining:
+            # workers found dead *before* the queue turned out to be empty cannot have a result still on the way
+            dead = {worker_id for worker_id in running if not workers[worker_id][0].is_alive()}
+            wait = 0.5
+            started_times = [started for _, started in running.values() if started is not None]
+            if timeout is not None and started_times:
+                wait = max(0.0, min(wait, min(started_times) + timeout - time.monotonic()))
+            try:
+                worker_id, event, index, report = results.get(timeout=wait)
+            except queue.Empty:
+                pass
+            else:
+                dead.clear()
+                if worker_id in running and running[worker_id][0] == index:
+                    if event == 'start':
+                        running[worker_id] = (index, time.monotonic())
+                    else:
+                        del running[worker_id]
+                        remaining -= 1
+                        yield report
+                        dispatch(worker_id)
+
+            now = time.monotonic()
+            for worker_id, (index, started) in list(running.items()):
+                process = workers[worker_id][0]
+                if timeout is not None and started is not None and now - started >= timeout:
+                    process.terminate()
+                    error = f'timed out after {timeout}s'
+                elif worker_id in dead:
+                    error = f'worker exited with code {process.exitcode}'
+                else:
+                    continue
+                process.join()
+                workers.pop(worker_id)[1].cancel_join_thread()
+                del running[worker_id]
+                remaining -= 1
+                yield BindsReport.failed(paths[index], error, now - started if started is not None else 0.0)
+                spawn(next_worker_id)
+                next_worker_id += 1
+    finally:
+        for process, tasks in workers.values():
+            if process.is_alive():
+                process.terminate()
+            process.join()
+            tasks.cancel_join_thread()
+        results.cancel_join_thread()
+
+
+def validate_bindings_files(paths: Iterable[str | Path], **kwargs: Any) -> dict[str, BindsReport]:
+    """Check bindings files (see :func:`iter_validate`) and return the reports by path, in the order given."""
+    paths = [str(path) for path in paths]
+    reports = {report.path: report for report in iter_validate(paths, **kwargs)}
+    return {path: reports[path] for path in paths}
+
+
+def _summary(report: BindsReport) -> str:
+    if report.error is not None:
+        return f'{report.path}: error: {report.error}'
+    parts = [f'{len(report.resolved)} resolve', f'{len(report.unmapped)} unmapped', f'{len(report.joystick_only)} joystick only']
+    line = f'{report.path}: ' + ', '.join(parts)
+    if report.unmapped:
+        line += '\n  unmapped: ' + ', '.join(f'{name} ({reason})' for name, reason in report.unmapped.items())
+    return line
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m voice_commander_elite.validate', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('paths', nargs='+', help='.binds files, or directories to search for them')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='number of worker processes (defaults to the number of CPUs, 0 to check files in-process)')
+    parser.add_argument('-t', '--timeout', type=float, default=None, help='seconds a single file may take before it is reported as failed')
+    parser.add_argument('--json', action='store_true', help='print one JSON report per line instead of a summary')
+    args = parser.parse_args(argv)
+
+    failed = False
+    for report in iter_validate(find_binds_files(args.paths), jobs=args.jobs, timeout=args.timeout):
+        failed = failed or not report.ok
+        print(json.dumps(report.to_dict()) if args.json else _summary(report), flush=True)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
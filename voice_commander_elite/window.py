@@ -0,0 +1,124 @@
+"""
+Process-wide tracking of whether the Elite Dangerous window is in the foreground.
+
+All :class:`~voice_commander_elite.conditions.EliteDangerousIsActive` conditions share one
+:class:`ForegroundWindowTracker`, which answers from memory for ``ttl`` seconds at a time. When it does refresh,
+it only asks for the id of the active window, and only looks up the window title when focus has moved to a
+different window since the last refresh.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Protocol
+
+from ._ahk import get_ahk
+
+ELITE_WINDOW_TITLE = 'Elite - Dangerous (CLIENT)'
+
+
+class WindowBackend(Protocol):
+    def active_window_id(self) -> Any:
+        """An identifier (e.g. the window handle) of the current foreground window, or ``None``."""
+
+    def window_title(self, window_id: Any) -> str | None:
+        """The title of the window with the given identifier, or ``None`` if it no longer exists."""
+
+
+class AHKWindowBackend:
+    def active_window_id(self) -> Any:
+        window = get_ahk().get_active_window()
+        if window is None:
+            return None
+        return window.id
+
+    def window_title(self, window_id: Any) -> str | None:
+        window = get_ahk().win_get(title=f'ahk_id {window_id}')
+        if window is None:
+            return None
+        return window.title
+
+
+class ForegroundWindowTracker:
+    """
+    Cached answer to "is the Elite Dangerous window in the foreground?".
+
+    :param backend: where window information comes from. Defaults to AutoHotkey.
+    :param ttl: how long (in seconds) an answer is reused before the backend is asked again
+    :param title: the title of the Elite Dangerous window
+    :param clock: monotonic clock, in seconds
+    """
+    def __init__(
+        self,
+        backend: WindowBackend | None = None,
+        *,
+        ttl: float = 0.25,
+        title: str = ELITE_WINDOW_TITLE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.backend: WindowBackend = backend if backend is not None else AHKWindowBackend()
+        self.ttl = ttl
+        self.title = title
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._checked_at: float | None = None
+        self._active_id: Any = None
+        self._elite_id: Any = None
+        self._elite_active = False
+
+    @property
+    def elite_window_id(self) -> Any:
+        """The identifier of the Elite Dangerous window, once it has been seen in the foreground."""
+        return self._elite_id
+
+    def invalidate(self) -> None:
+        """Forget the cached answer, e.g. on a focus-change event. The next check asks the backend again."""
+        with self._lock:
+            self._checked_at = None
+
+    def is_elite_active(self) -> bool:
+        now = self._clock()
+        checked_at = self._checked_at
+        if checked_at is not None and now - checked_at < self.ttl:
+            return self._elite_active
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.ttl:
+                # another thread refreshed while we were waiting for the lock
+                return self._elite_active
+            self._refresh(now)
+            return self._elite_active
+
+    def _refresh(self, now: float) -> None:
+        active_id = self.backend.active_window_id()
+        if active_id is None:
+            self._elite_active = False
+        elif active_id == self._elite_id:
+            self._elite_active = True
+        elif active_id != self._active_id:
+            # focus moved to a window we have not identified yet
+            is_elite = self.backend.window_title(active_id) == self.title
+            if is_elite:
+                self._elite_id = active_id
+            self._elite_active = is_elite
+        self._active_id = active_id
+        self._checked_at = now
+
+
+_tracker: ForegroundWindowTracker | None = None
+_tracker_lock = threading.Lock()
+
+
+def get_foreground_tracker() -> ForegroundWindowTracker:
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = ForegroundWindowTracker()
+    return _tracker
+
+
+def set_foreground_tracker(tracker: ForegroundWindowTracker | None) -> None:
+    """Replace the shared tracker (e.g. with one using a different backend or TTL). ``None`` restores the default."""
+    global _tracker
+    with _tracker_lock:
+        _tracker = tracker